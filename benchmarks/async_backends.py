@@ -0,0 +1,82 @@
+"""
+Compare the async transport backends of JavelinClient.
+
+Sends `aquery_route` calls at a local stand-in gateway with each backend
+(httpx, aiohttp) on each event loop (asyncio, uvloop), and reports the
+throughput together with the requests served per second of client CPU time,
+i.e. per core. Backends or loops whose package is not installed are skipped.
+
+    python -m benchmarks.async_backends --requests 5000 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.standin import start_in_subprocess
+from javelin_sdk import JavelinClient
+from javelin_sdk.batch import amap_bounded
+from javelin_sdk.transport import aiohttp
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+QUERY_BODY = {
+    "model": "gpt-3.5-turbo",
+    "messages": [{"role": "user", "content": "Translate 'hello world' to French."}],
+    "temperature": 0,
+}
+
+
+async def run(base_url: str, backend: str, requests: int, concurrency: int):
+    async with JavelinClient(
+        javelin_api_key="bench", base_url=base_url, async_backend=backend
+    ) as client:
+
+        async def query(_):
+            return await client.aquery_route("bench_route", QUERY_BODY)
+
+        # Open the connections before measuring
+        async for result in amap_bounded(query, range(concurrency), concurrency):
+            result.result()
+
+        start, cpu_start = time.perf_counter(), time.process_time()
+        async for result in amap_bounded(query, range(requests), concurrency, ordered=False):
+            result.result()
+        elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+    return requests / elapsed, requests / cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.0, help="Simulated upstream latency")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    backends = ["httpx"] + (["aiohttp"] if aiohttp is not None else [])
+    loops = {"asyncio": asyncio.run}
+    if uvloop is not None:
+        loops["uvloop"] = uvloop.run
+    if len(backends) == 1:
+        print("aiohttp is not installed, only the httpx backend is measured")
+
+    server = start_in_subprocess(delay=args.delay, port=args.port)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        print(f"{'backend':<10}{'loop':<10}{'req/s':>10}{'req/cpu-s':>12}")
+        for backend in backends:
+            for loop_name, run_loop in loops.items():
+                rps, per_core = run_loop(
+                    run(base_url, backend, args.requests, args.concurrency)
+                )
+                print(f"{backend:<10}{loop_name:<10}{rps:>10.0f}{per_core:>12.0f}")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compare HTTP/1.1 and HTTP/2 transport modes of JavelinClient.
+
+Fires 500 concurrent `aquery_route` calls at a local stand-in gateway and
+reports the number of connections the server accepted together with latency
+percentiles. Requires the `h2` package.
+
+    python -m benchmarks.http2 --concurrency 500
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.standin import start_in_subprocess
+from javelin_sdk import JavelinClient
+
+QUERY_BODY = {
+    "model": "gpt-3.5-turbo",
+    "messages": [{"role": "user", "content": "Translate 'hello world' to French."}],
+    "temperature": 0,
+}
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(base_url: str, http2: bool, concurrency: int, rounds: int):
+    # Reset the connection counter without keeping the probe connection open
+    httpx.post(f"{base_url}/__reset")
+
+    latencies = []
+    async with JavelinClient(javelin_api_key="bench", base_url=base_url, http2=http2) as client:
+
+        async def one():
+            start = time.perf_counter()
+            await client.aquery_route("bench_route", QUERY_BODY)
+            latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(one() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    connections = httpx.get(f"{base_url}/__stats").json()["connections"] - 1
+    return {
+        "mode": "HTTP/2" if http2 else "HTTP/1.1",
+        "connections": connections,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--delay", type=float, default=0.02, help="Simulated upstream latency")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = start_in_subprocess(delay=args.delay, port=args.port)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        print(f"{'mode':<10}{'connections':>12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+        for http2 in (False, True):
+            result = asyncio.run(run(base_url, http2, args.concurrency, args.rounds))
+            print(
+                f"{result['mode']:<10}{result['connections']:>12}{result['rps']:>10.0f}"
+                f"{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}"
+            )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
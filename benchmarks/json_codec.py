@@ -0,0 +1,95 @@
+"""
+Compare the JSON codecs of JavelinClient.
+
+Times the encoding of a large query body and the decoding of a long
+completion, alone, followed by QueryResponse validation, and read through a
+LazyQueryResponse, with each codec available. Requires the `orjson` package for the orjson column.
+
+    python -m benchmarks.json_codec --messages 200 --completion-kb 64
+"""
+
+import argparse
+import timeit
+
+from javelin_sdk.codec import OrjsonCodec, StdlibJSONCodec
+from javelin_sdk.lazy import LazyQueryResponse
+from javelin_sdk.models import QueryResponse
+
+
+def make_query_body(messages: int):
+    return {
+        "model": "gpt-4",
+        "temperature": 0.2,
+        "messages": [
+            {
+                "role": "user" if i % 2 == 0 else "assistant",
+                "content": f"Message {i}: " + "Lorem ipsum dolor sit amet, consectetur adipiscing. " * 20,
+            }
+            for i in range(messages)
+        ],
+    }
+
+
+def make_response(completion_kb: int, non_ascii: bool):
+    sentence = "Déjà vu, naïve café. " if non_ascii else "The quick brown fox jumps. "
+    return {
+        "id": "chatcmpl-bench",
+        "object": "chat.completion",
+        "created": 1700000000,
+        "model": "gpt-4",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": sentence * (completion_kb * 1024 // len(sentence))},
+            }
+        ],
+        "usage": {"prompt_tokens": 1000, "completion_tokens": 16000, "total_tokens": 17000},
+    }
+
+
+def bench(fn, number: int) -> float:
+    """
+    Best time of a call, in microseconds.
+    """
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200, help="Messages in the query body")
+    parser.add_argument("--completion-kb", type=int, default=64, help="Size of the completion")
+    parser.add_argument(
+        "--non-ascii", action="store_true", help="Use a completion made of non-ASCII text"
+    )
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    codecs = [StdlibJSONCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        print("orjson is not installed, only the standard library codec is measured")
+
+    body = make_query_body(args.messages)
+    response = StdlibJSONCodec().dumps(make_response(args.completion_kb, args.non_ascii))
+    body_kb = len(StdlibJSONCodec().dumps(body)) / 1024
+    print(f"query body {body_kb:.0f} KiB, response {len(response) / 1024:.0f} KiB, times in µs")
+
+    cases = {
+        "encode query": lambda codec: lambda: codec.dumps(body),
+        "decode response": lambda codec: lambda: codec.loads(response),
+        "decode + validate": lambda codec: lambda: QueryResponse(**codec.loads(response)),
+        "decode + lazy read": lambda codec: lambda: LazyQueryResponse(
+            content=response, loads=codec.loads
+        ).choices[0].message.content,
+    }
+    print(f"{'case':<20}" + "".join(f"{codec.name:>12}" for codec in codecs) + f"{'speedup':>10}")
+    for case, make in cases.items():
+        times = [bench(make(codec), args.number) for codec in codecs]
+        speedup = f"{times[0] / times[-1]:>9.1f}x" if len(times) > 1 else ""
+        print(f"{case:<20}" + "".join(f"{t:>12.1f}" for t in times) + speedup)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Local stand-in for the Javelin gateway, used by the benchmarks.
+
+Every request is answered with a canned QueryResponse after a fixed delay that
+simulates upstream latency. The server speaks HTTP/1.1 with keep-alive and
+HTTP/2 with prior knowledge on the same port, and reports the number of
+accepted connections on `GET /__stats` (reset with `POST /__reset`).
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import time
+from typing import Optional
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.settings
+except ImportError:  # pragma: no cover - HTTP/2 is optional
+    h2 = None
+
+H2_PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+
+QUERY_RESPONSE = json.dumps(
+    {
+        "choices": [
+            {
+                "finish_reason": "stop",
+                "index": 0,
+                "message": {"content": "Bonjour le monde", "role": "assistant"},
+            }
+        ],
+        "created": 1700000000,
+        "id": "chatcmpl-standin",
+        "model": "gpt-3.5-turbo",
+        "object": "chat.completion",
+        "usage": {"completion_tokens": 4, "prompt_tokens": 20, "total_tokens": 24},
+    }
+).encode()
+
+
+class StandInServer:
+    def __init__(self, delay: float = 0.02, max_concurrent_streams: int = 250):
+        self.delay = delay
+        self.max_concurrent_streams = max_concurrent_streams
+        self.connections = 0
+
+    def _response_for(self, method: str, path: str) -> bytes:
+        if path.endswith("/__stats"):
+            return json.dumps({"connections": self.connections}).encode()
+        if path.endswith("/__reset"):
+            self.connections = 0
+            return b"{}"
+        return QUERY_RESPONSE
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            head = await reader.readexactly(len(H2_PREFACE))
+        except asyncio.IncompleteReadError:
+            writer.close()
+            return
+
+        try:
+            if head == H2_PREFACE:
+                await self._serve_h2(head, reader, writer)
+            else:
+                await self._serve_h1(head, reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_h1(self, head: bytes, reader, writer):
+        buffer = head
+        while True:
+            while b"\r\n\r\n" not in buffer:
+                data = await reader.read(65536)
+                if not data:
+                    return
+                buffer += data
+
+            raw_headers, _, buffer = buffer.partition(b"\r\n\r\n")
+            lines = raw_headers.decode("latin-1").split("\r\n")
+            method, path, _ = lines[0].split(" ", 2)
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", 0))
+            while len(buffer) < length:
+                buffer += await reader.readexactly(length - len(buffer))
+            buffer = buffer[length:]
+
+            if not path.endswith(("/__stats", "/__reset")):
+                await asyncio.sleep(self.delay)
+            body = self._response_for(method, path)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"content-type: application/json\r\n"
+                b"content-length: %d\r\n\r\n%s"
+                % (len(body), b"" if method == "HEAD" else body)
+            )
+            await writer.drain()
+
+    async def _serve_h2(self, head: bytes, reader, writer):
+        if h2 is None:
+            raise RuntimeError("HTTP/2 stand-in requires the 'h2' package")
+
+        config = h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        conn = h2.connection.H2Connection(config=config)
+        conn.local_settings = h2.settings.Settings(
+            client=False,
+            initial_values={
+                h2.settings.SettingCodes.MAX_CONCURRENT_STREAMS: self.max_concurrent_streams
+            },
+        )
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+
+        requests = {}
+
+        async def respond(stream_id: int, method: str, path: str):
+            if not path.endswith(("/__stats", "/__reset")):
+                await asyncio.sleep(self.delay)
+            body = self._response_for(method, path)
+            conn.send_headers(
+                stream_id,
+                [
+                    (":status", "200"),
+                    ("content-type", "application/json"),
+                    ("content-length", str(len(body))),
+                ],
+            )
+            conn.send_data(stream_id, body, end_stream=True)
+            writer.write(conn.data_to_send())
+
+        data = head
+        while data:
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    headers = dict(event.headers)
+                    requests[event.stream_id] = (headers[":method"], headers[":path"])
+                elif isinstance(event, h2.events.DataReceived):
+                    conn.acknowledge_received_data(
+                        event.flow_controlled_length, event.stream_id
+                    )
+                elif isinstance(event, h2.events.StreamEnded):
+                    method, path = requests.pop(event.stream_id)
+                    asyncio.ensure_future(respond(event.stream_id, method, path))
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    return
+            writer.write(conn.data_to_send())
+            await writer.drain()
+            data = await reader.read(65536)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0, uds: Optional[str] = None):
+        if uds:
+            server = await asyncio.start_unix_server(self.handle, path=uds)
+        else:
+            server = await asyncio.start_server(self.handle, host=host, port=port)
+        async with server:
+            await server.serve_forever()
+
+
+def _run(delay: float, host: str, port: int, uds: Optional[str]) -> None:
+    asyncio.run(StandInServer(delay=delay).serve(host=host, port=port, uds=uds))
+
+
+def start_in_subprocess(
+    delay: float = 0.02, host: str = "127.0.0.1", port: int = 8765, uds: Optional[str] = None
+) -> multiprocessing.Process:
+    """
+    Start the stand-in server in a separate process and wait until it accepts
+    connections. The caller is responsible for terminating the process.
+    """
+    process = multiprocessing.Process(
+        target=_run, args=(delay, host, port, uds), daemon=True
+    )
+    process.start()
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            if uds:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                sock.connect(uds)
+            else:
+                sock = socket.create_connection((host, port))
+            sock.close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError("Stand-in server did not start")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Javelin gateway.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--uds", default=None, help="Listen on a Unix domain socket")
+    parser.add_argument("--delay", type=float, default=0.02, help="Simulated upstream latency")
+    args = parser.parse_args()
+    _run(args.delay, args.host, args.port, args.uds)
@@ -0,0 +1,93 @@
+"""
+Compare TCP loopback and Unix domain socket connections to a sidecar gateway.
+
+Sends sequential `query_route` calls, then `aquery_route` calls with each
+async backend installed, to a local stand-in gateway listening both on a TCP
+port and on a Unix domain socket, and reports latency percentiles.
+
+    python -m benchmarks.uds --requests 2000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from benchmarks.standin import start_in_subprocess
+from javelin_sdk import JavelinClient
+from javelin_sdk.transport import aiohttp
+
+QUERY_BODY = {
+    "model": "gpt-3.5-turbo",
+    "messages": [{"role": "user", "content": "Translate 'hello world' to French."}],
+    "temperature": 0,
+}
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_sync(base_url: str, requests: int):
+    latencies = []
+    with JavelinClient(javelin_api_key="bench", base_url=base_url) as client:
+        client.query_route("bench_route", QUERY_BODY)
+        for _ in range(requests):
+            start = time.perf_counter()
+            client.query_route("bench_route", QUERY_BODY)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def run_async(base_url: str, backend: str, requests: int):
+    latencies = []
+    async with JavelinClient(
+        javelin_api_key="bench", base_url=base_url, async_backend=backend
+    ) as client:
+        await client.aquery_route("bench_route", QUERY_BODY)
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.aquery_route("bench_route", QUERY_BODY)
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--port", type=int, default=8767)
+    args = parser.parse_args()
+
+    socket_path = os.path.join(tempfile.mkdtemp(), "javelin.sock")
+    servers = [
+        start_in_subprocess(delay=0.0, port=args.port),
+        start_in_subprocess(delay=0.0, uds=socket_path),
+    ]
+    transports = {"tcp": f"http://127.0.0.1:{args.port}", "uds": f"unix://{socket_path}"}
+    clients = {"sync": lambda base_url: run_sync(base_url, args.requests)}
+    for backend in ["httpx"] + (["aiohttp"] if aiohttp is not None else []):
+        clients[f"async {backend}"] = lambda base_url, backend=backend: asyncio.run(
+            run_async(base_url, backend, args.requests)
+        )
+
+    try:
+        print(f"{'client':<15}{'transport':<11}{'p50 µs':>10}{'p99 µs':>10}")
+        for client_name, run in clients.items():
+            for transport, base_url in transports.items():
+                latencies = run(base_url)
+                print(
+                    f"{client_name:<15}{transport:<11}"
+                    f"{percentile(latencies, 0.50) * 1e6:>10.0f}"
+                    f"{percentile(latencies, 0.99) * 1e6:>10.0f}"
+                )
+    finally:
+        for server in servers:
+            server.terminate()
+        os.unlink(socket_path)
+
+
+if __name__ == "__main__":
+    main()
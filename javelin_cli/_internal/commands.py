@@ -1,9 +1,17 @@
+import asyncio
 import os
+import sys
+import time
+from collections import Counter
 from pathlib import Path
 import json
 from pydantic import ValidationError
 
+from javelin_sdk.batch import amap_bounded
 from javelin_sdk.client import JavelinClient
+from javelin_sdk.latency import LatencyWindow
+from javelin_sdk.manifest import Manifest
+from javelin_sdk.pool import PoolConfig
 from javelin_sdk.models import (
     GatewayConfig,
     Gateway,
@@ -24,10 +32,17 @@ from javelin_sdk.exceptions import (
     ProviderNotFoundError, 
     RouteNotFoundError,
     SecretNotFoundError,
-    TemplateNotFoundError
+    TemplateNotFoundError,
+    JavelinClientError,
 )
 
-def get_javelin_client():
+def get_javelin_client(**client_kwargs):
+    # Non-interactive use, e.g. scheduled jobs
+    if os.environ.get("JAVELIN_API_KEY"):
+        if os.environ.get("JAVELIN_BASE_URL"):
+            client_kwargs["base_url"] = os.environ["JAVELIN_BASE_URL"]
+        return JavelinClient(javelin_api_key=os.environ["JAVELIN_API_KEY"], **client_kwargs)
+
     # Path to cache.json file
     home_dir = Path.home()
     json_file_path = home_dir / ".javelin" / "cache.json"
@@ -78,6 +93,7 @@ def get_javelin_client():
     return JavelinClient(
         base_url=base_url,
         javelin_api_key=javelin_api_key,
+        **client_kwargs,
     )
 
 def create_gateway(args):
@@ -626,4 +642,156 @@ def delete_template(args):
     except (BadRequest, ValidationError, NetworkError) as e:
         print(f"An error occurred: {e}")
     except Exception as e:
-        print(f"Unexpected error: {e}")
\ No newline at end of file
+        print(f"Unexpected error: {e}")
+
+def query_route(args):
+    if args.input:
+        try:
+            failed = asyncio.run(_query_route_bulk(args))
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            sys.exit(1)
+        if failed:
+            sys.exit(1)
+        return
+
+    client = None
+    try:
+        client = get_javelin_client()
+        query_body = json.loads(args.body if args.body is not None else sys.stdin.read())
+        if args.stream:
+            with client.query_route(args.route, query_body, stream=True) as stream:
+                for chunk in stream:
+                    for choice in chunk.choices or []:
+                        if choice.delta and choice.delta.content:
+                            print(choice.delta.content, end="", flush=True)
+            print()
+        else:
+            response = client.query_route(args.route, query_body)
+            print(response.json(indent=2))
+
+    except json.JSONDecodeError as e:
+        print(f"Error parsing query body JSON: {e}")
+    except UnauthorizedError as e:
+        print(f"UnauthorizedError: {e}")
+    except (BadRequest, ValidationError, NetworkError, RouteNotFoundError) as e:
+        print(f"An error occurred: {e}")
+    except Exception as e:
+        print(f"Unexpected error: {e}")
+    finally:
+        if client is not None:
+            client.close()
+
+async def _read_lines(path):
+    # Reads run in the default executor so that they do not block the queries
+    loop = asyncio.get_running_loop()
+    if path == "-":
+        input_file = sys.stdin
+    else:
+        input_file = await loop.run_in_executor(None, open, path, "r")
+    try:
+        while True:
+            line = await loop.run_in_executor(None, input_file.readline)
+            if not line:
+                return
+            if line.strip():
+                yield line
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+
+async def _query_route_bulk(args):
+    """
+    Query a route with every line of a JSONL file, writing one JSON line per
+    query to the output as the queries complete. Returns the number of failed
+    queries.
+    """
+    pool_config = PoolConfig(
+        max_connections=max(args.concurrency, 100),
+        max_keepalive_connections=args.concurrency,
+    )
+    client = get_javelin_client(pool_config=pool_config)
+    latencies = LatencyWindow(size=100_000)
+    errors = Counter()
+
+    async def query(line):
+        return await client.aquery_route(args.route, json.loads(line))
+
+    output = sys.stdout if args.output in (None, "-") else open(args.output, "w")
+    start = time.monotonic()
+    total = 0
+    try:
+        async for result in amap_bounded(
+            query, _read_lines(args.input), args.concurrency, ordered=args.ordered
+        ):
+            total += 1
+            latencies.observe(result.latency)
+            output.write(_result_line(result) + "\n")
+            if result.error is not None:
+                errors[type(result.error).__name__] += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        await client.aclose()
+
+    elapsed = time.monotonic() - start
+    _print_query_stats(total, errors, elapsed, latencies)
+    return sum(errors.values())
+
+def _result_line(result):
+    if result.error is not None:
+        return json.dumps({
+            "index": result.index,
+            "error": {"type": type(result.error).__name__, "message": str(result.error)},
+        })
+    return json.dumps({"index": result.index, "response": result.response.dict()})
+
+def _print_query_stats(total, errors, elapsed, latencies):
+    failed = sum(errors.values())
+    lines = [
+        f"Queries: {total} ({total - failed} succeeded, {failed} failed) in {elapsed:.2f}s",
+        f"Throughput: {total / elapsed if elapsed else 0.0:.1f} queries/s",
+    ]
+    if len(latencies):
+        percentiles = ", ".join(
+            f"p{int(q * 100)} {latencies.percentile(q) * 1000:.0f}ms" for q in (0.5, 0.9, 0.99)
+        )
+        lines.append(f"Latency: {percentiles}, max {latencies.percentile(1.0) * 1000:.0f}ms")
+    for name, count in errors.most_common():
+        lines.append(f"  {name}: {count}")
+    print("\n".join(lines), file=sys.stderr)
+
+def apply_manifest(args):
+    try:
+        manifest = Manifest.from_file(args.file)
+        client = get_javelin_client()
+
+        result = client.apply_manifest(manifest, concurrency=args.concurrency, dry_run=args.dry_run)
+        for change in result.changes:
+            if change.error is not None:
+                status = f"failed: {change.error}"
+            elif change.applied or change.action == "unchanged":
+                status = "ok"
+            else:
+                status = "skipped"
+            print(f"{change.action:<9} {change.kind:<8} {change.name}  {status}")
+        print(
+            f"{len(result.created)} created, {len(result.updated)} updated, "
+            f"{len(result.unchanged)} unchanged, {len(result.failed)} failed, "
+            f"{len(result.skipped)} skipped"
+        )
+        if not result.ok:
+            sys.exit(1)
+
+    except (OSError, ImportError) as e:
+        print(f"Error reading manifest: {e}")
+        sys.exit(1)
+    except UnauthorizedError as e:
+        print(f"UnauthorizedError: {e}")
+        sys.exit(1)
+    except (BadRequest, ValidationError, NetworkError) as e:
+        print(f"An error occurred: {e}")
+        sys.exit(1)
+    except JavelinClientError as e:
+        print(f"Error listing the current state, nothing was applied: {e}")
+        sys.exit(1)
@@ -11,6 +11,7 @@ from javelin_cli._internal.commands import (
     create_route, list_routes, get_route, update_route, delete_route,
     create_secret, list_secrets, update_secret, delete_secret,
     create_template, list_templates, get_template, update_template, delete_template,
+    query_route, apply_manifest,
 )
 
 def main():
@@ -205,6 +206,30 @@ def main():
     template_delete.add_argument('--name', type=str, required=True, help='Name of the template to delete')
     template_delete.set_defaults(func=delete_template)
 
+    # Query a route
+    query_parser = subparsers.add_parser(
+        'query',
+        help='Query an LLM through a route, with a single body or in bulk from a JSONL file.'
+    )
+    query_parser.add_argument('--route', type=str, required=True, help='Name of the route to query')
+    query_parser.add_argument('--body', type=str, help='JSON string of the query body, read from stdin if omitted')
+    query_parser.add_argument('--stream', action='store_true', help='Print the response as it is generated')
+    query_parser.add_argument('--input', type=str, help='JSONL file with one query body per line, - for stdin')
+    query_parser.add_argument('--output', type=str, help='JSONL file receiving one result per line (default: stdout)')
+    query_parser.add_argument('--concurrency', type=int, default=10, help='Number of queries in flight in bulk mode')
+    query_parser.add_argument('--ordered', action='store_true', help='Write results in input order instead of as they complete')
+    query_parser.set_defaults(func=query_route)
+
+    # Apply a manifest
+    apply_parser = subparsers.add_parser(
+        'apply',
+        help='Create or update the gateways, providers, templates, secrets and routes described in a manifest.'
+    )
+    apply_parser.add_argument('-f', '--file', type=str, required=True, help='YAML or JSON manifest file')
+    apply_parser.add_argument('--concurrency', type=int, default=16, help='Number of changes applied in parallel')
+    apply_parser.add_argument('--dry-run', action='store_true', help='Show the changes without applying them')
+    apply_parser.set_defaults(func=apply_manifest)
+
     args = parser.parse_args()
     if hasattr(args, 'func'):
         args.func(args)
@@ -1,4 +1,21 @@
+from javelin_sdk.adaptive_timeout import AdaptiveTimeoutPolicy
+from javelin_sdk.batch import BatchProgress, BatchResult
+from javelin_sdk.cache import CacheStats, MemoryCache, ResponseCache, SQLiteCache
+from javelin_sdk.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitState,
+)
+from javelin_sdk.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiterRegistry,
+    ConcurrencyMetrics,
+    ConcurrencySlot,
+)
+from javelin_sdk.codec import JSONCodec, OrjsonCodec, StdlibJSONCodec
 from javelin_sdk.client import JavelinClient
+from javelin_sdk.deadline import Deadline, timeouts
+from javelin_sdk.dns import DNSCache
 from javelin_sdk.exceptions import (
     GatewayNotFoundError,
     GatewayAlreadyExistsError,
@@ -17,9 +34,18 @@ from javelin_sdk.exceptions import (
     MethodNotAllowedError,
     UnauthorizedError,
     ValidationError,
+    CircuitOpenError,
+    DeadlineExceededError,
+    ConcurrencyLimitExceededError,
 )
+from javelin_sdk.hedging import HedgingPolicy, HedgingStats
+from javelin_sdk.lazy import LazyModel, LazyQueryResponse
+from javelin_sdk.manifest import Manifest, SyncChange, SyncResult
+from javelin_sdk.metadata_cache import MetadataCache, MetadataCacheStats
 from javelin_sdk.models import (
+    QueryChunk,
     QueryResponse,
+    StreamedQueryResponse,
     Gateway,
     Gateways,
     Route,
@@ -31,6 +57,11 @@ from javelin_sdk.models import (
     Template,
     Templates,
 )
+from javelin_sdk.pool import ConnectionPool, PoolConfig
+from javelin_sdk.ratelimit import RateLimiter
+from javelin_sdk.retry import RetryBudget, RetryPolicy
+from javelin_sdk.streaming import AsyncQueryStream, QueryStream
+from javelin_sdk.transport import AiohttpTransport
 
 __all__ = [
     "GatewayNotFoundError",
@@ -50,6 +81,9 @@ __all__ = [
     "MethodNotAllowedError",
     "UnauthorizedError",
     "ValidationError",
+    "CircuitOpenError",
+    "DeadlineExceededError",
+    "ConcurrencyLimitExceededError",
     "Gateway",
     "Gateways",
     "Route",
@@ -62,5 +96,44 @@ __all__ = [
     "Secrets",
     "QueryBody",
     "QueryResponse",
+    "StreamedQueryResponse",
+    "QueryChunk",
+    "LazyModel",
+    "LazyQueryResponse",
+    "QueryStream",
+    "AsyncQueryStream",
     "JavelinClient",
+    "ConnectionPool",
+    "PoolConfig",
+    "DNSCache",
+    "Deadline",
+    "timeouts",
+    "AiohttpTransport",
+    "BatchProgress",
+    "BatchResult",
+    "CacheStats",
+    "MemoryCache",
+    "ResponseCache",
+    "SQLiteCache",
+    "JSONCodec",
+    "OrjsonCodec",
+    "StdlibJSONCodec",
+    "CircuitBreaker",
+    "CircuitBreakerRegistry",
+    "CircuitState",
+    "HedgingPolicy",
+    "HedgingStats",
+    "AdaptiveTimeoutPolicy",
+    "AdaptiveConcurrencyLimiter",
+    "ConcurrencyLimiterRegistry",
+    "ConcurrencyMetrics",
+    "ConcurrencySlot",
+    "Manifest",
+    "SyncChange",
+    "SyncResult",
+    "MetadataCache",
+    "MetadataCacheStats",
+    "RateLimiter",
+    "RetryBudget",
+    "RetryPolicy",
 ]
@@ -0,0 +1,97 @@
+import threading
+from typing import Dict, Optional
+
+import httpx
+
+from javelin_sdk.latency import LatencyHistogram
+
+
+class AdaptiveTimeoutPolicy:
+    """
+    Policy deriving the timeout of each query from the latencies recently
+    observed on its route, so that fast routes give up on a stuck request
+    quickly while slow, long-generation routes are not cut short.
+
+    The read timeout of a query is the `percentile` of the latencies of its
+    route times `multiplier`, bounded by `min_timeout` and `max_timeout`. The
+    client timeout is used until `min_samples` latencies were observed on the
+    route. Queries that time out are observed at their timeout, so that once
+    the latency of a route rises, its percentile, and the timeout with it,
+    grow by `multiplier` with every timeout until queries complete again.
+    Queries given a timeout, e.g. with the `timeout` argument, and streamed
+    queries are left alone.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.99,
+        multiplier: float = 2.0,
+        min_timeout: float = 1.0,
+        max_timeout: float = 120.0,
+        min_samples: int = 20,
+        window_size: int = 1000,
+        precision: float = 0.02,
+    ) -> None:
+        """
+        Initialize the AdaptiveTimeoutPolicy.
+
+        :param percentile: Percentile of the recent latencies of the route the
+            timeout is derived from.
+        :param multiplier: Factor applied to that percentile.
+        :param min_timeout: Shortest timeout, in seconds.
+        :param max_timeout: Longest timeout, in seconds.
+        :param min_samples: Latencies to observe on a route before adapting
+            its timeout.
+        :param window_size: Observations per window of the latency sketch of
+            each route.
+        :param precision: Relative error of the latency sketch.
+        """
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self.precision = precision
+        self._latencies: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, route_name: str) -> LatencyHistogram:
+        with self._lock:
+            histogram = self._latencies.get(route_name)
+            if histogram is None:
+                histogram = self._latencies[route_name] = LatencyHistogram(
+                    self.precision, self.window_size
+                )
+            return histogram
+
+    def observe(self, route_name: str, latency: float) -> None:
+        self._histogram(route_name).observe(latency)
+
+    def timeout(self, route_name: str) -> Optional[float]:
+        """
+        Compute the read timeout of a query.
+
+        :param route_name: Name of the queried route.
+        :return: Seconds, or None until enough latencies were observed.
+        """
+        histogram = self._histogram(route_name)
+        if len(histogram) < self.min_samples:
+            return None
+        latency = histogram.percentile(self.percentile)
+        return min(self.max_timeout, max(self.min_timeout, latency * self.multiplier))
+
+    def apply(self, route_name: str, default: httpx.Timeout) -> Optional[httpx.Timeout]:
+        """
+        Timeout of a query: the client timeout with the adapted read timeout.
+
+        :param route_name: Name of the queried route.
+        :param default: Timeout of the client.
+        :return: httpx.Timeout, or None to use the client timeout.
+        """
+        read = self.timeout(route_name)
+        if read is None:
+            return None
+        return httpx.Timeout(
+            connect=default.connect, read=read, write=default.write, pool=default.pool
+        )
@@ -0,0 +1,286 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Union,
+)
+
+
+class BatchResult:
+    """
+    Outcome of one item of a batch: either a response or the exception raised
+    while processing it.
+    """
+
+    __slots__ = ("index", "response", "error", "latency")
+
+    def __init__(
+        self,
+        index: int,
+        response: Any = None,
+        error: Optional[Exception] = None,
+        latency: float = 0.0,
+    ) -> None:
+        """
+        Initialize the BatchResult.
+
+        :param index: Position of the item in the input.
+        :param response: Response to the item, None if it failed.
+        :param error: Exception raised by the item, None if it succeeded.
+        :param latency: Seconds spent processing the item.
+        """
+        self.index = index
+        self.response = response
+        self.error = error
+        self.latency = latency
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def result(self) -> Any:
+        """
+        Return the response, or raise the exception of a failed item.
+        """
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+    def __repr__(self) -> str:
+        outcome = f"error={self.error!r}" if self.error is not None else "ok"
+        return f"BatchResult(index={self.index}, {outcome}, latency={self.latency:.3f})"
+
+
+class BatchProgress:
+    """
+    Counters of a running batch, passed to progress callbacks.
+    """
+
+    __slots__ = ("submitted", "completed", "failed")
+
+    def __init__(self) -> None:
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self.submitted - self.completed
+
+    def __repr__(self) -> str:
+        return (
+            f"BatchProgress(submitted={self.submitted}, completed={self.completed}, "
+            f"failed={self.failed})"
+        )
+
+
+ProgressCallback = Callable[[BatchProgress], None]
+
+
+async def _anext(iterator: Any, is_async: bool) -> Any:
+    if is_async:
+        return await iterator.__anext__()
+    try:
+        return next(iterator)
+    except StopIteration:
+        raise StopAsyncIteration
+
+
+async def amap_bounded(
+    fn: Callable[[Any], Awaitable[Any]],
+    items: Union[Iterable[Any], AsyncIterable[Any]],
+    concurrency: int = 10,
+    ordered: bool = True,
+    on_progress: Optional[ProgressCallback] = None,
+) -> AsyncIterator[BatchResult]:
+    """
+    Apply a coroutine function to items with at most `concurrency` calls in
+    flight, yielding a BatchResult per item.
+
+    Items are pulled from the input only when a slot frees up, so memory use
+    does not depend on the length of the input. When `ordered` is set,
+    results are yielded in input order; a slow item then holds back up to
+    `concurrency` completed results behind it.
+
+    :param fn: Coroutine function called with each item.
+    :param items: Iterable or async iterable of items.
+    :param concurrency: Maximum number of calls in flight.
+    :param ordered: Yield results in input order instead of as they complete.
+    :param on_progress: Called with the BatchProgress after each completion.
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1.")
+
+    is_async = hasattr(items, "__aiter__")
+    iterator = items.__aiter__() if is_async else iter(items)
+    loop = asyncio.get_running_loop()
+    progress = BatchProgress()
+
+    async def run(index: int, item: Any) -> BatchResult:
+        start = loop.time()
+        try:
+            response = await fn(item)
+        except Exception as e:
+            result = BatchResult(index, error=e, latency=loop.time() - start)
+            progress.failed += 1
+        else:
+            result = BatchResult(index, response, latency=loop.time() - start)
+        progress.completed += 1
+        if on_progress is not None:
+            on_progress(progress)
+        return result
+
+    window: Deque["asyncio.Task[BatchResult]"] = deque()
+    running: Set["asyncio.Task[BatchResult]"] = set()
+    exhausted = False
+
+    async def fill() -> None:
+        nonlocal exhausted
+        while not exhausted and len(window if ordered else running) < concurrency:
+            try:
+                item = await _anext(iterator, is_async)
+            except StopAsyncIteration:
+                exhausted = True
+                return
+            task = asyncio.ensure_future(run(progress.submitted, item))
+            progress.submitted += 1
+            if ordered:
+                window.append(task)
+            else:
+                running.add(task)
+
+    try:
+        await fill()
+        if ordered:
+            while window:
+                result = await window[0]
+                window.popleft()
+                await fill()
+                yield result
+        else:
+            while running:
+                done, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                await fill()
+                for task in done:
+                    yield task.result()
+    finally:
+        pending = list(window) + list(running)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def map_bounded(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    concurrency: int = 10,
+    ordered: bool = True,
+    on_progress: Optional[ProgressCallback] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[BatchResult]:
+    """
+    Apply a function to items on a thread pool with at most `concurrency`
+    calls in flight, yielding a BatchResult per item.
+
+    Items are pulled from the input only when a slot frees up, so memory use
+    does not depend on the length of the input. When `ordered` is set,
+    results are yielded in input order. The pool is shut down when the
+    iterator is exhausted or closed, cancelling the items not started yet.
+
+    :param fn: Function called with each item, from a worker thread.
+    :param items: Iterable of items.
+    :param concurrency: Maximum number of calls in flight.
+    :param ordered: Yield results in input order instead of as they complete.
+    :param on_progress: Called with the BatchProgress after each completion,
+        from a worker thread.
+    :param timeout: Seconds the whole batch may take.
+    :raises concurrent.futures.TimeoutError: If the batch takes longer than
+        `timeout`; the remaining items are cancelled.
+    """
+    if concurrency < 1:
+        raise ValueError("Concurrency must be at least 1.")
+
+    iterator = iter(items)
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    progress = BatchProgress()
+    lock = threading.Lock()
+
+    def run(index: int, item: Any) -> BatchResult:
+        start = time.monotonic()
+        try:
+            response = fn(item)
+        except Exception as e:
+            result = BatchResult(index, error=e, latency=time.monotonic() - start)
+        else:
+            result = BatchResult(index, response, latency=time.monotonic() - start)
+        with lock:
+            progress.completed += 1
+            if result.error is not None:
+                progress.failed += 1
+            if on_progress is not None:
+                on_progress(progress)
+        return result
+
+    def remaining() -> Optional[float]:
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="javelin-batch")
+    window: Deque["Future[BatchResult]"] = deque()
+    running: Set["Future[BatchResult]"] = set()
+    exhausted = False
+
+    def fill() -> None:
+        nonlocal exhausted
+        while not exhausted and len(window if ordered else running) < concurrency:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                exhausted = True
+                return
+            with lock:
+                index = progress.submitted
+                progress.submitted += 1
+            future = executor.submit(run, index, item)
+            if ordered:
+                window.append(future)
+            else:
+                running.add(future)
+
+    try:
+        fill()
+        if ordered:
+            while window:
+                result = window[0].result(timeout=remaining())
+                window.popleft()
+                fill()
+                yield result
+        else:
+            while running:
+                done, running = wait(running, timeout=remaining(), return_when=FIRST_COMPLETED)
+                if not done:
+                    raise FuturesTimeoutError()
+                fill()
+                for future in done:
+                    yield future.result()
+    finally:
+        for future in list(window) + list(running):
+            future.cancel()
+        # Calls already running finish in the background
+        executor.shutdown(wait=False)
@@ -0,0 +1,369 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional, Set
+
+Payload = Dict[str, Any]
+
+
+def payload_size(payload: Payload) -> int:
+    """
+    Size of a cached payload, in bytes of compact JSON.
+    """
+    return len(json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode())
+
+
+class CacheStats:
+    """
+    Counters of a ResponseCache.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"CacheStats(hits={self.hits}, misses={self.misses}, "
+            f"evictions={self.evictions}, expirations={self.expirations})"
+        )
+
+
+class ResponseCache(ABC):
+    """
+    Interface of the query response caches used by JavelinClient.
+
+    Entries are JSON-serializable QueryResponse payloads stored under the
+    canonical key of the query, and indexed by route so that the entries of a
+    route can be invalidated when the route changes.
+    """
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Payload]:
+        """
+        Look up a query.
+
+        :param key: Canonical key of the query.
+        :return: Cached payload, or None on a miss.
+        """
+
+    @abstractmethod
+    def set(self, key: str, route_name: str, payload: Payload) -> None:
+        """
+        Store the response to a query.
+
+        :param key: Canonical key of the query.
+        :param route_name: Name of the queried route.
+        :param payload: QueryResponse payload to store.
+        """
+
+    @abstractmethod
+    def invalidate_route(self, route_name: str) -> None:
+        """
+        Drop all the entries of a route.
+
+        :param route_name: Name of the route.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        """
+        Drop all the entries.
+        """
+
+
+class _Entry(NamedTuple):
+    route_name: str
+    payload: Payload
+    size: int
+    expires_at: float
+
+
+class MemoryCache(ResponseCache):
+    """
+    In-process LRU cache with a TTL, bounded both in entries and in bytes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 300.0,
+    ) -> None:
+        """
+        Initialize the MemoryCache.
+
+        :param max_entries: Maximum number of entries.
+        :param max_bytes: Maximum total size of the entries, in bytes.
+        :param ttl: Seconds an entry stays valid.
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._routes: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def _remove(self, key: str) -> _Entry:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        keys = self._routes.get(entry.route_name)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._routes[entry.route_name]
+        return entry
+
+    def get(self, key: str) -> Optional[Payload]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry.payload
+
+    def set(self, key: str, route_name: str, payload: Payload) -> None:
+        size = payload_size(payload)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(route_name, payload, size, time.monotonic() + self.ttl)
+            self._routes.setdefault(route_name, set()).add(key)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    def invalidate_route(self, route_name: str) -> None:
+        with self._lock:
+            for key in list(self._routes.get(route_name, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._routes.clear()
+            self._bytes = 0
+
+
+class SQLiteCache(ResponseCache):
+    """
+    Persistent cache stored in a SQLite database in WAL mode, so that it
+    survives restarts and can be shared by the worker processes of a host.
+
+    Entries expire after their TTL and the least recently used ones are
+    evicted once the stored payloads exceed `max_bytes`. The access time used
+    for eviction is only written back once older than `touch_interval`, so
+    that hits do not contend for the write lock of the database. Payloads
+    larger than `compress_min_bytes` are compressed with zlib when `compress`
+    is set.
+    Each process opens its own connection, also after a fork. Counters in
+    `stats` only cover the current process.
+
+    Rows are keyed by a digest of the query and of the credentials of the
+    client that made it, so clients with different API keys sharing the file
+    do not read each other's responses. Response bodies are stored in
+    plaintext: the file must only be readable by the processes allowed to see
+    them.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            route_name TEXT NOT NULL,
+            payload BLOB NOT NULL,
+            compressed INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_route ON responses (route_name);
+        CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires_at);
+        CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+        CREATE TABLE IF NOT EXISTS usage (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            total_bytes INTEGER NOT NULL
+        );
+        INSERT OR IGNORE INTO usage (id, total_bytes) VALUES (1, 0);
+        CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses
+        BEGIN
+            UPDATE usage SET total_bytes = total_bytes + NEW.size WHERE id = 1;
+        END;
+        CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses
+        BEGIN
+            UPDATE usage SET total_bytes = total_bytes - OLD.size WHERE id = 1;
+        END;
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl: float = 24 * 3600.0,
+        compress: bool = True,
+        compress_min_bytes: int = 512,
+        busy_timeout: float = 5.0,
+        touch_interval: float = 60.0,
+    ) -> None:
+        """
+        Initialize the SQLiteCache.
+
+        :param path: Path of the database file, created if missing.
+        :param max_bytes: Maximum total size of the stored payloads, in bytes.
+        :param ttl: Seconds an entry stays valid.
+        :param compress: Whether to compress large payloads with zlib.
+        :param compress_min_bytes: Size from which payloads are compressed.
+        :param busy_timeout: Seconds to wait for a lock held by another process.
+        :param touch_interval: Seconds after which a hit updates the access
+            time of an entry. 0 updates it on every hit.
+        """
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.compress = compress
+        self.compress_min_bytes = compress_min_bytes
+        self.busy_timeout = busy_timeout
+        self.touch_interval = touch_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not be shared with a forked child
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self._SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Payload]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT payload, compressed, expires_at, accessed_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            data, compressed, expires_at, accessed_at = row
+            if expires_at <= now:
+                conn.execute(
+                    "DELETE FROM responses WHERE key = ? AND expires_at <= ?", (key, now)
+                )
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            if now - accessed_at >= self.touch_interval:
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.stats.hits += 1
+
+        if compressed:
+            data = zlib.decompress(data)
+        return json.loads(data)
+
+    def set(self, key: str, route_name: str, payload: Payload) -> None:
+        data = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
+        size = len(data)
+        if size > self.max_bytes:
+            return
+        compressed = self.compress and size >= self.compress_min_bytes
+        if compressed:
+            data = zlib.compress(data)
+
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.execute(
+                    "INSERT INTO responses "
+                    "(key, route_name, payload, compressed, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, route_name, data, int(compressed), size, now + self.ttl, now),
+                )
+                self._evict(conn, now)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        (total,) = conn.execute("SELECT total_bytes FROM usage WHERE id = 1").fetchone()
+        if total <= self.max_bytes:
+            return
+        expired = conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        self.stats.expirations += expired.rowcount
+        while True:
+            (total,) = conn.execute("SELECT total_bytes FROM usage WHERE id = 1").fetchone()
+            excess = total - self.max_bytes
+            if excess <= 0:
+                return
+            oldest = conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not oldest:
+                return
+            victims = []
+            for key, size in oldest:
+                victims.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+            self.stats.evictions += len(victims)
+
+    def invalidate_route(self, route_name: str) -> None:
+        with self._lock:
+            self._connection().execute(
+                "DELETE FROM responses WHERE route_name = ?", (route_name,)
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
@@ -0,0 +1,242 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from enum import Enum
+from typing import Callable, Deque, Dict, Iterator, Optional, Tuple
+
+import httpx
+
+from javelin_sdk.exceptions import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    InternalServerError,
+    NetworkError,
+)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+StateChangeCallback = Callable[[str, CircuitState, CircuitState], None]
+
+
+def is_breaker_failure(error: BaseException) -> bool:
+    """
+    Whether an error counts against the health of a route: network errors,
+    5xx responses, timeouts and calls running out of their deadline. Errors
+    caused by the request itself (4xx) or by rate limiting do not.
+    """
+    return isinstance(
+        error,
+        (NetworkError, InternalServerError, DeadlineExceededError, httpx.TimeoutException),
+    )
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker failing fast while a route is unhealthy.
+
+    The outcome of the last `window_size` calls is kept. Once at least
+    `minimum_calls` were made, the circuit opens when the share of failed or
+    slow calls reaches its threshold. While open, calls fail immediately with
+    CircuitOpenError. After `open_duration` seconds the circuit is half-open
+    and lets `half_open_max_calls` probe calls through: it closes if they all
+    succeed and opens again otherwise.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: Optional[float] = None,
+        slow_call_rate_threshold: float = 1.0,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_max_calls: int = 1,
+        on_state_change: Optional[StateChangeCallback] = None,
+        is_failure: Callable[[BaseException], bool] = is_breaker_failure,
+    ) -> None:
+        """
+        Initialize the CircuitBreaker.
+
+        :param name: Name of the guarded route, passed to on_state_change.
+        :param failure_rate_threshold: Share of failed calls opening the circuit.
+        :param slow_call_duration: Duration in seconds above which a call is
+            slow, None to ignore durations.
+        :param slow_call_rate_threshold: Share of slow calls opening the circuit.
+        :param window_size: Number of recent calls considered.
+        :param minimum_calls: Number of calls needed before the circuit can open.
+        :param open_duration: Seconds the circuit stays open before probing.
+        :param half_open_max_calls: Number of probe calls while half-open.
+        :param on_state_change: Called with (name, old_state, new_state).
+        :param is_failure: Decide whether an error raised by a call is a failure.
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+        self.on_state_change = on_state_change
+        self.is_failure = is_failure
+
+        self._state = CircuitState.CLOSED
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _transition(self, state: CircuitState) -> Optional[Tuple[CircuitState, CircuitState]]:
+        old, self._state = self._state, state
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        return (old, state) if old != state else None
+
+    def _maybe_half_open(self) -> Optional[Tuple[CircuitState, CircuitState]]:
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.open_duration
+        ):
+            return self._transition(CircuitState.HALF_OPEN)
+        return None
+
+    def _notify(self, change: Optional[Tuple[CircuitState, CircuitState]]) -> None:
+        if change is not None and self.on_state_change is not None:
+            self.on_state_change(self.name, *change)
+
+    def acquire(self) -> bool:
+        """
+        Ask to make a call.
+
+        :raises CircuitOpenError: If the circuit is open, or half-open with all
+            probe calls already in flight.
+        :return: Whether the call is a half-open probe.
+        """
+        with self._lock:
+            change = self._maybe_half_open()
+            state = self._state
+            probe = False
+            if state == CircuitState.HALF_OPEN:
+                if self._probes_in_flight < self.half_open_max_calls:
+                    self._probes_in_flight += 1
+                    probe = True
+                else:
+                    state = CircuitState.OPEN
+        self._notify(change)
+        if state == CircuitState.OPEN:
+            raise CircuitOpenError(message=f"Circuit breaker is open for route {self.name}")
+        return probe
+
+    def release(self, probe: bool) -> None:
+        """
+        Give back a call slot without recording an outcome, e.g. when the call
+        was cancelled.
+        """
+        if probe:
+            with self._lock:
+                if self._state == CircuitState.HALF_OPEN and self._probes_in_flight:
+                    self._probes_in_flight -= 1
+
+    def record(self, duration: float, failed: bool, probe: bool = False) -> None:
+        """
+        Record the outcome of a call.
+
+        :param duration: Duration of the call, in seconds.
+        :param failed: Whether the call failed.
+        :param probe: Whether the call was a half-open probe.
+        """
+        slow = self.slow_call_duration is not None and duration >= self.slow_call_duration
+        change = None
+        with self._lock:
+            if self._state == CircuitState.HALF_OPEN:
+                if probe and (failed or slow):
+                    change = self._transition(CircuitState.OPEN)
+                elif probe:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_max_calls:
+                        change = self._transition(CircuitState.CLOSED)
+            elif self._state == CircuitState.CLOSED:
+                self._outcomes.append((failed, slow))
+                calls = len(self._outcomes)
+                if calls >= self.minimum_calls:
+                    failures = sum(1 for f, _ in self._outcomes if f)
+                    slow_calls = sum(1 for _, s in self._outcomes if s)
+                    if (
+                        failures / calls >= self.failure_rate_threshold
+                        or slow_calls / calls >= self.slow_call_rate_threshold
+                    ):
+                        change = self._transition(CircuitState.OPEN)
+        self._notify(change)
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        Guard a call, failing fast while the circuit is open and recording
+        the outcome of the call otherwise.
+
+        :raises CircuitOpenError: If the circuit is open.
+        """
+        probe = self.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.record(time.monotonic() - start, self.is_failure(e), probe)
+            raise
+        except BaseException:
+            self.release(probe)
+            raise
+        else:
+            self.record(time.monotonic() - start, False, probe)
+
+
+class CircuitBreakerRegistry:
+    """
+    Circuit breakers keyed by route name, created on first use with the
+    arguments given to the registry. A registry can be shared by several
+    JavelinClient instances.
+    """
+
+    def __init__(self, on_state_change: Optional[StateChangeCallback] = None, **kwargs) -> None:
+        """
+        Initialize the CircuitBreakerRegistry.
+
+        :param on_state_change: Called with (route_name, old_state, new_state)
+            whenever the circuit of a route changes state.
+        :param kwargs: CircuitBreaker arguments used for every route.
+        """
+        self.on_state_change = on_state_change
+        self._kwargs = kwargs
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, route_name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(route_name)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    route_name, on_state_change=self.on_state_change, **self._kwargs
+                )
+                self._breakers[route_name] = breaker
+            return breaker
+
+    def states(self) -> Dict[str, CircuitState]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.state for breaker in breakers}
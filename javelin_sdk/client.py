@@ -1,34 +1,101 @@
+import asyncio
+import ipaddress
+import threading
+import time
+from contextlib import asynccontextmanager, nullcontext
+from functools import partial
 from enum import Enum, auto
-from typing import Any, Dict, Optional
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib.parse import urljoin
+from urllib.request import getproxies
 
 import httpx
 
+from javelin_sdk.adaptive_timeout import AdaptiveTimeoutPolicy
+from javelin_sdk.batch import BatchResult, ProgressCallback, amap_bounded, map_bounded
+from javelin_sdk.cache import ResponseCache
+from javelin_sdk.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry
+from javelin_sdk.codec import JSONCodec, get_codec
+from javelin_sdk.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiterRegistry,
+    ConcurrencySlot,
+)
+from javelin_sdk.endpoints import (
+    ENDPOINTS,
+    GATEWAY,
+    GATEWAYS,
+    PROVIDER,
+    PROVIDER_SECRETS,
+    PROVIDERS,
+    QUERY,
+    ROUTE,
+    ROUTES,
+    SECRET,
+    SECRETS,
+    TEMPLATE,
+    TEMPLATES,
+    Endpoint,
+)
+from javelin_sdk.deadline import (
+    DEADLINE_HEADER,
+    Deadline,
+    TimeoutTypes,
+    as_deadline,
+    current_timeouts,
+    earliest,
+)
 from javelin_sdk.exceptions import (
-    GatewayNotFoundError,
-    GatewayAlreadyExistsError,
-    RouteNotFoundError,
-    RouteAlreadyExistsError,
-    ProviderNotFoundError,
-    ProviderAlreadyExistsError,
-    TemplateNotFoundError,
-    TemplateAlreadyExistsError,
-    SecretNotFoundError,
-    SecretAlreadyExistsError,
-    NetworkError,
-    BadRequest,
-    RateLimitExceededError,
+    DeadlineExceededError,
     InternalServerError,
-    MethodNotAllowedError,
+    JavelinClientError,
+    NetworkError,
     UnauthorizedError,
-    ValidationError,
 )
+from javelin_sdk.hedging import HedgingPolicy
+from javelin_sdk.lazy import LazyQueryResponse
+from javelin_sdk.manifest import Manifest, SyncResult, aapply_manifest, apply_manifest
+from javelin_sdk.metadata_cache import FRESH, STALE, MetadataCache, MetadataEntry, MetadataKey
 from javelin_sdk.models import QueryResponse
 from javelin_sdk.models import Gateway, Gateways
 from javelin_sdk.models import Route, Routes
 from javelin_sdk.models import Provider, Providers
 from javelin_sdk.models import Secret, Secrets
 from javelin_sdk.models import Template, Templates
+from javelin_sdk.pool import ConnectionPool, PoolConfig
+from javelin_sdk.ratelimit import RateLimiter, parse_rate_limit_period
+from javelin_sdk.retry import RETRY_STATS_EXTENSION, THROTTLED_EXTENSION, RetryPolicy
+from javelin_sdk.singleflight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    credentials_scope,
+    query_key,
+)
+from javelin_sdk.streaming import (
+    AsyncQueryStream,
+    QueryStream,
+    aiter_json_array,
+    iter_json_array,
+)
+from javelin_sdk.transport import (
+    AUTO,
+    check_async_backend,
+    resolve_async_backend,
+    split_uds_url,
+)
 
 API_BASEURL = "https://api-dev.javelin.live"
 API_BASE_PATH = "/v1"
@@ -53,6 +120,37 @@ def log_response(response):
     if response.content:
         print(f"Response Body: {response.content.decode()}")
 
+
+def _environment_proxies() -> Dict[str, Optional[str]]:
+    """
+    Proxy mounts configured by the HTTP_PROXY, HTTPS_PROXY, ALL_PROXY and
+    NO_PROXY environment variables, in upper or lower case.
+    """
+    environment = getproxies()
+    proxies: Dict[str, Optional[str]] = {}
+    for scheme, url in environment.items():
+        if scheme in ("http", "https", "all") and url:
+            proxies[f"{scheme}://"] = url if "://" in url else f"http://{url}"
+
+    for host in environment.get("no", "").split(","):
+        host = host.strip()
+        if host == "*":
+            return {}
+        if not host:
+            continue
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            address = None
+        if address is not None and address.version == 6:
+            proxies[f"all://[{host}]"] = None
+        elif address is not None or host == "localhost":
+            proxies[f"all://{host}"] = None
+        else:
+            proxies[f"all://*{host}"] = None
+    return proxies
+
+
 class HttpMethod(Enum):
     GET = auto()
     POST = auto()
@@ -60,6 +158,88 @@ class HttpMethod(Enum):
     DELETE = auto()
 
 
+class _StreamGuard:
+    """
+    Circuit breaker call and concurrency slot of a streamed query, held until
+    the stream ends, fails or is closed so that they get the outcome of the
+    whole stream. The latency recorded is the one of the response headers,
+    so that long completions do not count as slow calls.
+    """
+
+    def __init__(
+        self,
+        breaker: Optional[CircuitBreaker],
+        limiter: Optional[AdaptiveConcurrencyLimiter],
+    ) -> None:
+        self._breaker = breaker
+        self._limiter = limiter
+        self._generation: Optional[int] = None
+        self._probe = False
+        self._start = time.monotonic()
+        self._latency: Optional[float] = None
+        self._finished = False
+        self.slot = ConcurrencySlot()
+
+    def _acquire_breaker(self) -> None:
+        try:
+            if self._breaker is not None:
+                self._probe = self._breaker.acquire()
+        except BaseException:
+            if self._generation is not None:
+                self._limiter.release(self._generation)
+            raise
+        self._start = time.monotonic()
+
+    def acquire(self, deadline: Optional[Deadline]) -> None:
+        if self._limiter is not None:
+            self._generation = self._limiter.acquire(deadline)
+        self._acquire_breaker()
+
+    async def aacquire(self, deadline: Optional[Deadline]) -> None:
+        if self._limiter is not None:
+            self._generation = await self._limiter.aacquire(deadline)
+        self._acquire_breaker()
+
+    def headers_received(self) -> None:
+        self._latency = time.monotonic() - self._start
+
+    def finish(self, error: Optional[BaseException]) -> None:
+        """
+        Record the outcome of the stream, once.
+
+        :param error: Exception that ended the stream, None if it completed
+            or was closed by the caller.
+        """
+        if self._finished:
+            return
+        self._finished = True
+        latency = self._latency
+        if latency is None:
+            latency = time.monotonic() - self._start
+        failed = isinstance(error, Exception)
+
+        if self._breaker is not None:
+            if error is None or failed:
+                self._breaker.record(
+                    latency, failed and self._breaker.is_failure(error), self._probe
+                )
+            else:
+                self._breaker.release(self._probe)
+
+        if self._generation is not None:
+            if error is None:
+                if self.slot.overloaded:
+                    self._limiter.release(self._generation, overloaded=True)
+                else:
+                    self._limiter.release(self._generation, latency=latency)
+            elif failed:
+                self._limiter.release(
+                    self._generation, overloaded=self._limiter.is_overload(error)
+                )
+            else:
+                self._limiter.release(self._generation)
+
+
 class JavelinClient:
     def __init__(
         self,
@@ -67,12 +247,96 @@ class JavelinClient:
         base_url: str = API_BASEURL,
         javelin_virtualapikey: Optional[str] = None,
         llm_api_key: Optional[str] = None,
+        http2: bool = False,
+        timeout: Union[float, httpx.Timeout] = API_TIMEOUT,
+        pool_config: Optional[PoolConfig] = None,
+        pool: Optional[ConnectionPool] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limit_routes: bool = False,
+        rate_limit_period: Optional[float] = None,
+        circuit_breakers: Optional[CircuitBreakerRegistry] = None,
+        hedging_policy: Optional[HedgingPolicy] = None,
+        coalesce_queries: bool = False,
+        response_cache: Optional[ResponseCache] = None,
+        metadata_cache: Optional[MetadataCache] = None,
+        json_codec: Union[str, JSONCodec, None] = None,
+        lazy_responses: bool = False,
+        async_backend: str = AUTO,
+        uds: Optional[str] = None,
+        adaptive_timeouts: Optional[AdaptiveTimeoutPolicy] = None,
+        concurrency_limiters: Optional[ConcurrencyLimiterRegistry] = None,
+        proxies: Optional[Dict[str, Optional[str]]] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
     ) -> None:
         """
         Initialize the JavelinClient.
 
-        :param base_url: Base URL for the Javelin API.
+        :param base_url: Base URL for the Javelin API, or
+            `unix:///path/to/socket` for a gateway listening on a Unix domain
+            socket, e.g. a sidecar.
         :param api_key: API key for authorization (if required).
+        :param http2: Whether to speak HTTP/2 to the gateway, so that concurrent
+            requests are multiplexed over a few connections. Requires the `h2`
+            package (`pip install javelin_sdk[http2]`).
+        :param timeout: Default timeout in seconds, or an httpx.Timeout with
+            separate connect, read, write and pool timeouts. Queries and
+            admin calls take a `timeout` and a `deadline` per call, and
+            `javelin_sdk.timeouts()` sets them for any call made in a block.
+        :param pool_config: Connection limits and keep-alive policy of the
+            client's own connection pool. Ignored when `pool` is given.
+        :param pool: ConnectionPool shared with other clients. The client does
+            not close a pool it was given.
+        :param retry_policy: RetryPolicy applied to every request. Requests
+            are not retried when None.
+        :param rate_limit_routes: Whether to pace queries on the client side
+            using the `rate_limit` of the routes read with get_route, so that
+            they are not rejected by the gateway with 429 errors.
+        :param rate_limit_period: Seconds the `rate_limit` of a route is
+            counted over, unless the `RateLimit-Policy` header of its
+            responses tells. Routes whose
+            period is unknown are not paced.
+        :param circuit_breakers: CircuitBreakerRegistry guarding queries with
+            one circuit breaker per route.
+        :param hedging_policy: HedgingPolicy duplicating slow aquery_route
+            calls that carry an idempotency key. Hedged queries are billed
+            twice by the LLM provider.
+        :param coalesce_queries: Whether identical queries made concurrently
+            share a single request to the gateway. The callers then receive
+            the same QueryResponse object.
+        :param response_cache: ResponseCache answering repeated queries
+            without a request to the gateway, e.g. a MemoryCache.
+        :param metadata_cache: MetadataCache serving get_* and list_* calls for
+            gateways, providers, routes and templates, revalidated with
+            conditional requests.
+        :param json_codec: JSONCodec encoding request bodies and decoding
+            responses, or its name ("orjson" or "json"). Defaults to orjson
+            when it is installed and to the standard library otherwise.
+        :param lazy_responses: Whether query_route and aquery_route return a
+            LazyQueryResponse, decoding fields on access without validation,
+            instead of a QueryResponse.
+        :param async_backend: Transport of the async client: "httpx", "aiohttp"
+            (requires the `aiohttp` package, HTTP/1.1 only) or "auto", which
+            selects aiohttp when it is installed and the event loop is a
+            uvloop loop, and httpx otherwise.
+        :param uds: Path of a Unix domain socket to connect to instead of the
+            host of `base_url`, which is still sent in the Host header.
+        :param adaptive_timeouts: AdaptiveTimeoutPolicy deriving the read
+            timeout of queries from the latencies observed on their route.
+        :param concurrency_limiters: ConcurrencyLimiterRegistry adapting the
+            number of queries in flight on each route to what it sustains.
+            Streamed queries hold their slot until the stream ends or is
+            closed.
+        :param proxies: Proxy URL of each URL pattern, e.g.
+            `{"https://": "http://proxy:3128"}`, or None for a pattern that
+            is not proxied. Defaults to the HTTP_PROXY, HTTPS_PROXY,
+            ALL_PROXY and NO_PROXY environment variables; `{}` disables
+            proxies. Proxied requests do not go through the pool.
+        :param transport: Transport sending the requests of the synchronous
+            methods instead of the pool, e.g. an httpx.MockTransport. Proxies
+            are not applied to it.
+        :param async_transport: Transport sending the requests of the
+            asynchronous methods instead of the pool.
         """
         headers = {}
         if not javelin_api_key or javelin_api_key == "":
@@ -84,6 +348,7 @@ class JavelinClient:
             )
 
         headers["x-api-key"] = javelin_api_key
+        check_async_backend(async_backend, http2)
 
         if javelin_virtualapikey:
             headers["x-javelin-virtualapikey"] = javelin_virtualapikey
@@ -91,11 +356,76 @@ class JavelinClient:
         if llm_api_key:
             headers["Authorization"] = f"Bearer {llm_api_key}"
 
+        base_url, socket_path = split_uds_url(base_url)
         self.base_url = urljoin(base_url, API_BASE_PATH)
+        self._uds = uds or socket_path
+        self._urls = {endpoint: endpoint.compile(self.base_url) for endpoint in ENDPOINTS}
         self._headers = headers
+        self._credentials_scope = credentials_scope(headers)
+        self._http2 = http2
+        self._timeout = timeout
+        self._default_timeout = httpx.Timeout(timeout)
+        self._owns_pool = pool is None
+        self._pool = pool or ConnectionPool(pool_config)
+        self._retry_policy = retry_policy
+        self._rate_limit_routes = rate_limit_routes
+        self._rate_limit_period = rate_limit_period
+        self._rate_limiters: Dict[str, RateLimiter] = {}
+        self._explicit_rate_limits = set()
+        # Rate limit of the routes read with get_route and the period it is
+        # counted over, from their config or the headers of their responses
+        self._route_rate_limits: Dict[str, int] = {}
+        self._rate_limit_periods: Dict[str, float] = {}
+        self._circuit_breakers = circuit_breakers
+        self._hedging_policy = hedging_policy
+        self._singleflight = SingleFlight() if coalesce_queries else None
+        self._asingleflight = AsyncSingleFlight() if coalesce_queries else None
+        self._response_cache = response_cache
+        self._metadata_cache = metadata_cache
+        self._codec = get_codec(json_codec)
+        self._lazy_responses = lazy_responses
+        self._async_backend = async_backend
+        self._adaptive_timeouts = adaptive_timeouts
+        self._concurrency_limiters = concurrency_limiters
+        self._proxies = proxies
+        self._transport = transport
+        self._async_transport = async_transport
+        self._metadata_tasks: Set["asyncio.Task[None]"] = set()
+        self._keepalive_stop: Optional[threading.Event] = None
+        self._keepalive_task: Optional["asyncio.Task[None]"] = None
         self._client = None
         self._aclient = None
 
+    def _transport_kwargs(self) -> Dict[str, Any]:
+        """
+        Keyword arguments selecting the HTTP version and the Unix domain socket,
+        if any, of the transports.
+
+        httpx only negotiates HTTP/2 through TLS ALPN, so for plain http://
+        gateways (e.g. sidecars) HTTP/2 is spoken with prior knowledge.
+        """
+        kwargs: Dict[str, Any] = {"uds": self._uds} if self._uds else {}
+        if not self._http2:
+            return kwargs
+        if httpx.URL(self.base_url).scheme == "http":
+            return {**kwargs, "http1": False, "http2": True}
+        return {**kwargs, "http2": True}
+
+    def _client_kwargs(self, transport: Any) -> Dict[str, Any]:
+        """
+        Keyword arguments routing the requests of the clients through their
+        proxies, if any. httpx only reads the proxies of the environment when
+        it creates the transport itself, so they are read here instead.
+        """
+        if self._uds or transport is not None:
+            return {}
+        proxies = self._proxies
+        if proxies is None:
+            proxies = _environment_proxies()
+        if not proxies:
+            return {}
+        return {"proxies": proxies, "http2": self._http2, "limits": self._pool.config.limits}
+
     @property
     def client(self):
         if self._client is None:
@@ -104,7 +434,9 @@ class JavelinClient:
                 # event_hooks={"request": [log_request], "response": [log_response]},
                 base_url=self.base_url,
                 headers=self._headers,
-                timeout=API_TIMEOUT,
+                timeout=self._timeout,
+                transport=self._transport or self._pool.transport(**self._transport_kwargs()),
+                **self._client_kwargs(self._transport),
             )
         return self._client
 
@@ -112,7 +444,15 @@ class JavelinClient:
     def aclient(self):
         if self._aclient is None:
             self._aclient = httpx.AsyncClient(
-                base_url=self.base_url, headers=self._headers, timeout=API_TIMEOUT
+                base_url=self.base_url,
+                headers=self._headers,
+                timeout=self._timeout,
+                transport=self._async_transport
+                or self._pool.atransport(
+                    resolve_async_backend(self._async_backend, self._http2),
+                    **self._transport_kwargs(),
+                ),
+                **self._client_kwargs(self._async_transport),
             )
         return self._aclient
 
@@ -129,537 +469,700 @@ class JavelinClient:
         self.close()
 
     async def aclose(self):
+        for task in list(self._metadata_tasks):
+            task.cancel()
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
         if self._aclient:
             await self._aclient.aclose()
+        if self._owns_pool:
+            await self._pool.aclose()
 
     def close(self):
+        if self._keepalive_stop is not None:
+            self._keepalive_stop.set()
+            self._keepalive_stop = None
         if self._client:
             self._client.close()
+        if self._owns_pool:
+            self._pool.close()
+
+    def warmup(self, connections: int = 1, keepalive: Optional[float] = None) -> int:
+        """
+        Open connections to the gateway ahead of the first requests, so that
+        they do not wait for DNS, TCP and TLS setup.
+
+        `connections` concurrent HEAD requests are sent to the base URL and
+        held until all of them were answered, so that each one opens its own
+        connection, which then stays idle in the pool. At most
+        `max_keepalive_connections` of the PoolConfig are kept, and only for
+        `keepalive_expiry` seconds. Over HTTP/2, a single connection is opened.
+
+        :param connections: Number of connections to open.
+        :param keepalive: Seconds between background warmups keeping the
+            connections open, until the client is closed. Should be lower than
+            `keepalive_expiry` and the idle timeout of the gateway. None for a
+            single warmup.
+        :return: Number of requests answered by the gateway, i.e. of
+            connections opened or already in the pool.
+        """
+        opened = self._warmup_sync(connections)
+        if keepalive is not None:
+            if self._keepalive_stop is not None:
+                self._keepalive_stop.set()
+            stop = self._keepalive_stop = threading.Event()
+
+            def ping() -> None:
+                while not stop.wait(keepalive):
+                    self._warmup_sync(connections)
+
+            threading.Thread(target=ping, name="javelin-keepalive", daemon=True).start()
+        return opened
+
+    def _warmup_sync(self, connections: int) -> int:
+        client = self.client
 
-    def _send_request_sync(
+        def head(_: int) -> httpx.Response:
+            return client.send(client.build_request("HEAD", self.base_url), stream=True)
+
+        responses = []
+        try:
+            for result in map_bounded(head, range(connections), connections):
+                if result.ok:
+                    responses.append(result.response)
+        finally:
+            # Reading the empty bodies only once every request was answered
+            # hands the connections back to the pool
+            for response in responses:
+                try:
+                    response.read()
+                except httpx.HTTPError:
+                    pass
+                finally:
+                    response.close()
+        return len(responses)
+
+    async def awarmup(self, connections: int = 1, keepalive: Optional[float] = None) -> int:
+        """
+        Asynchronously open connections to the gateway ahead of the first
+        requests. See warmup.
+
+        :param connections: Number of connections to open.
+        :param keepalive: Seconds between background warmups keeping the
+            connections open, until the client is closed. None for a single
+            warmup.
+        :return: Number of requests answered by the gateway.
+        """
+        opened = await self._awarmup(connections)
+        if keepalive is not None:
+            if self._keepalive_task is not None:
+                self._keepalive_task.cancel()
+
+            async def ping() -> None:
+                while True:
+                    await asyncio.sleep(keepalive)
+                    await self._awarmup(connections)
+
+            self._keepalive_task = asyncio.ensure_future(ping())
+        return opened
+
+    async def _awarmup(self, connections: int) -> int:
+        aclient = self.aclient
+        results = await asyncio.gather(
+            *(
+                aclient.send(aclient.build_request("HEAD", self.base_url), stream=True)
+                for _ in range(connections)
+            ),
+            return_exceptions=True,
+        )
+        responses = [result for result in results if isinstance(result, httpx.Response)]
+        for response in responses:
+            try:
+                await response.aread()
+            except httpx.HTTPError:
+                pass
+            finally:
+                await response.aclose()
+        return len(responses)
+
+    def _prepare_request(
         self,
         method: HttpMethod,
-        gateway: Optional[str] = "",
-        provider: Optional[str] = "",
-        route: Optional[str] = "",
-        secret: Optional[str] = "",
-        template: Optional[str] = "",
-        is_query: bool = False,
+        endpoint: Endpoint,
+        url_params: Optional[Dict[str, str]] = None,
         data: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
-    ) -> httpx.Response:
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[httpx.Timeout] = None,
+    ) -> Dict[str, Any]:
         """
-        Send a request to the Javelin API.
+        Build the request to an endpoint, without IO. Shared by the sync and
+        async clients.
 
         :param method: HTTP method to use.
-        :param gateway: Name of the gateway to send the request to.
-        :param provider: Name of the provider to send the request to.
-        :param route: Name of the route to send the request to.
-        :param is_query: Whether the route is a query route.
+        :param endpoint: Endpoint to send the request to.
+        :param url_params: Values of the placeholders of the endpoint URL.
         :param data: Data to send with the request.
         :param headers: Additional headers to send with the request.
-        :return: Response from the Javelin API.
-
-        :raises ValueError: If an unsupported HTTP method is used.
-        :raises NetworkError: If a network error occurs.
-
-        :raises InternalServerError: If the Javelin API returns a 500 error.
-        :raises RateLimitExceededError: If the Javelin API returns a 429 error.
-        :raises GatewayAlreadyExistsError: If the Javelin API returns a 409 error.
-        :raises GatewayNotFoundError: If the Javelin API returns a 404 error.
-        :raises ProviderAlreadyExistsError: If the Javelin API returns a 409 error.
-        :raises ProviderNotFoundError: If the Javelin API returns a 404 error.
-        :raises RouteAlreadyExistsError: If the Javelin API returns a 409 error.
-        :raises RouteNotFoundError: If the Javelin API returns a 404 error.
-        :raises UnauthorizedError: If the Javelin API returns a 401 error.
-
-        """
-        url = self._construct_url(gateway_name=gateway, 
-                                  provider_name=provider,
-                                  route_name=route,
-                                  secret_name=secret,
-                                  template_name=template,
-                                  query=is_query)
-        client = self.client
-
+        :param params: Query string parameters.
+        :param timeout: Timeout of the request, None for the client default.
+        :return: Keyword arguments of httpx's build_request.
+        """
+        url_params = url_params or {}
         # Merging additional headers with default headers
         request_headers = {**self._headers, **(headers or {})}
-        if is_query and route:
-            request_headers["x-javelin-route"] = route
+        if endpoint is QUERY:
+            request_headers["x-javelin-route"] = url_params["name"]
+        content = self._codec.dumps(data) if data is not None else None
+        if content is not None:
+            request_headers.setdefault("Content-Type", "application/json")
+        return {
+            "method": method.name,
+            "url": self._urls[endpoint](**url_params),
+            "content": content,
+            "headers": request_headers,
+            "params": params,
+            "timeout": timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        }
+
+    def _call_timeouts(
+        self,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Tuple[Optional[httpx.Timeout], Optional[Deadline]]:
+        """
+        Resolve the timeout and deadline of a call from its arguments and the
+        enclosing `timeouts()` block, if any. A deadline given in seconds
+        starts now.
+        """
+        scope_timeout, scope_deadline = current_timeouts()
+        if timeout is not None:
+            scope_timeout = httpx.Timeout(timeout)
+        return scope_timeout, earliest(scope_deadline, as_deadline(deadline))
 
-        try:
-            if method == HttpMethod.GET:
-                response = client.get(url, headers=request_headers)
-            elif method == HttpMethod.POST:
-                response = client.post(url, json=data, headers=request_headers)
-            elif method == HttpMethod.PUT:
-                response = client.put(url, json=data, headers=request_headers)
-            elif method == HttpMethod.DELETE:
-                response = client.delete(url, headers=request_headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+    def _start_attempt(
+        self,
+        request: httpx.Request,
+        timeout: Optional[httpx.Timeout],
+        deadline: Deadline,
+        retries: int,
+        slept: float,
+    ) -> None:
+        """
+        Fit an attempt within the deadline of its call: cap its timeouts to the
+        time left and forward that time to the gateway.
 
-            return response
-        except httpx.NetworkError as e:
-            raise NetworkError(message=str(e))
+        :raises DeadlineExceededError: If the deadline has passed.
+        """
+        if deadline.expired:
+            raise self._with_retry_stats(DeadlineExceededError(), retries, slept)
+        timeout = deadline.clamp(timeout or self._default_timeout)
+        request.extensions["timeout"] = timeout.as_dict()
+        request.headers[DEADLINE_HEADER] = str(int(deadline.remaining() * 1000))
 
-    async def _send_request_async(
+    def _next_retry(
+        self,
+        request: httpx.Request,
+        retries: int,
+        slept: float,
+        error: Optional[httpx.TransportError] = None,
+        response: Optional[httpx.Response] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[float]:
+        """
+        Decide whether an attempt is retried, without IO. Shared by the sync
+        and async clients.
+
+        :param request: Request of the attempt.
+        :param retries: Number of retries made so far.
+        :param slept: Seconds slept between the attempts so far.
+        :param error: Exception raised by the attempt, if any.
+        :param response: Response of the attempt, if any.
+        :param deadline: Deadline of the call, not retried past it.
+        :return: Seconds to wait before the next attempt, None when the
+            response is final.
+
+        :raises NetworkError: If a network error occurs and is not retried.
+        :raises DeadlineExceededError: If the attempt timed out on the
+            deadline of the call.
+        """
+        policy = self._retry_policy
+        delay = policy and policy.next_delay(
+            request.method, request.headers, retries, error=error, response=response
+        )
+        if delay is not None and deadline is not None and delay >= deadline.remaining():
+            delay = None
+        if delay is not None and response is not None and response.status_code == 429:
+            request.extensions[THROTTLED_EXTENSION] = True
+        if delay is None:
+            if error is not None:
+                if isinstance(error, httpx.TimeoutException) and deadline and deadline.expired:
+                    raise self._with_retry_stats(DeadlineExceededError(), retries, slept)
+                if isinstance(error, httpx.NetworkError):
+                    raise self._with_retry_stats(NetworkError(message=str(error)), retries, slept)
+                raise error
+            response.extensions[RETRY_STATS_EXTENSION] = (retries, slept)
+        return delay
+
+    def _send_request_sync(
         self,
         method: HttpMethod,
-        gateway: Optional[str] = "",
-        provider: Optional[str] = "",
-        route: Optional[str] = "",
-        secret: Optional[str] = "",
-        template: Optional[str] = "",
-        is_query: bool = False,
+        endpoint: Endpoint,
+        url_params: Optional[Dict[str, str]] = None,
         data: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
     ) -> httpx.Response:
         """
-        Send a request asynchronously to the Javelin API.
+        Send a request to the Javelin API, retried according to the retry
+        policy. The response is returned whatever its status, for the parser
+        of the endpoint to raise the matching exception.
 
         :param method: HTTP method to use.
-        
-        :param gateway: Name of the gateway to send the request to.
-        :param provider: Name of the provider to send the request to.
-        :param route: Name of the route to send the request to.
-        :param is_query: Whether the route is a query route.
+        :param endpoint: Endpoint to send the request to.
+        :param url_params: Values of the placeholders of the endpoint URL.
         :param data: Data to send with the request.
         :param headers: Additional headers to send with the request.
+        :param stream: Whether to return as soon as the response headers are
+            received, leaving the body to be streamed by the caller.
+        :param params: Query string parameters.
+        :param timeout: Timeout of each attempt, None for the enclosing
+            `timeouts()` block or the client default.
+        :param deadline: Deadline shared by all the attempts.
         :return: Response from the Javelin API.
 
-        :raises ValueError: If an unsupported HTTP method is used.
-        :raises NetworkError: If a network error occurs.
-
-        :raises InternalServerError: If the Javelin API returns a 500 error.
-        :raises RateLimitExceededError: If the Javelin API returns a 429 error.
-        :raises RouteAlreadyExistsError: If the Javelin API returns a 409 error.
-        :raises GatewayAlreadyExistsError: If the Javelin API returns a 409 error.
-        :raises GatewayNotFoundError: If the Javelin API returns a 404 error.
-        :raises ProviderAlreadyExistsError: If the Javelin API returns a 409 error.
-        :raises ProviderNotFoundError: If the Javelin API returns a 404 error.
-        :raises RouteNotFoundError: If the Javelin API returns a 404 error.
-        :raises UnauthorizedError: If the Javelin API returns a 401 error.
-
-        """
-        url = self._construct_url(gateway_name=gateway,
-                                  provider_name=provider,
-                                  route_name=route, 
-                                  secret_name=secret,
-                                  template_name=template,
-                                  query=is_query)
-        aclient = self.aclient
+        :raises NetworkError: If a network error occurs and is not retried.
+        :raises DeadlineExceededError: If the deadline passes first.
+        """
+        client = self.client
+        timeout, deadline = self._call_timeouts(timeout, deadline)
+        request = client.build_request(
+            **self._prepare_request(method, endpoint, url_params, data, headers, params, timeout)
+        )
+        if self._retry_policy is not None:
+            self._retry_policy.on_request()
+        retries, slept = 0, 0.0
+
+        while True:
+            if deadline is not None:
+                self._start_attempt(request, timeout, deadline, retries, slept)
+            try:
+                response = client.send(request, stream=stream)
+            except httpx.TransportError as e:
+                delay = self._next_retry(request, retries, slept, error=e, deadline=deadline)
+            else:
+                delay = self._next_retry(
+                    request, retries, slept, response=response, deadline=deadline
+                )
+                if delay is None:
+                    return response
+                response.close()
 
-        # Merging additional headers with default headers
-        request_headers = {**self._headers, **(headers or {})}
-        if is_query and route:
-            request_headers["x-javelin-route"] = route
+            time.sleep(delay)
+            retries += 1
+            slept += delay
 
-        try:
-            if method == HttpMethod.GET:
-                response = await aclient.get(url, headers=request_headers)
-            elif method == HttpMethod.POST:
-                response = await aclient.post(url, json=data, headers=request_headers)
-            elif method == HttpMethod.PUT:
-                response = await aclient.put(url, json=data, headers=request_headers)
-            elif method == HttpMethod.DELETE:
-                response = await aclient.delete(url, headers=request_headers)
+    async def _send_request_async(
+        self,
+        method: HttpMethod,
+        endpoint: Endpoint,
+        url_params: Optional[Dict[str, str]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> httpx.Response:
+        """
+        Send a request asynchronously to the Javelin API. See
+        _send_request_sync.
+        """
+        aclient = self.aclient
+        timeout, deadline = self._call_timeouts(timeout, deadline)
+        request = aclient.build_request(
+            **self._prepare_request(method, endpoint, url_params, data, headers, params, timeout)
+        )
+        if self._retry_policy is not None:
+            self._retry_policy.on_request()
+        retries, slept = 0, 0.0
+
+        while True:
+            if deadline is not None:
+                self._start_attempt(request, timeout, deadline, retries, slept)
+            try:
+                response = await aclient.send(request, stream=stream)
+            except httpx.TransportError as e:
+                delay = self._next_retry(request, retries, slept, error=e, deadline=deadline)
             else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+                delay = self._next_retry(
+                    request, retries, slept, response=response, deadline=deadline
+                )
+                if delay is None:
+                    return response
+                await response.aclose()
 
-            return response
-        except httpx.NetworkError as e:
-            raise NetworkError(message=str(e))
+            await asyncio.sleep(delay)
+            retries += 1
+            slept += delay
 
-    def _process_gateway_response_ok(self, response: httpx.Response) -> str:
+    @staticmethod
+    def _with_retry_stats(
+        error: JavelinClientError, retries: int, slept: float
+    ) -> JavelinClientError:
         """
-        Process a successful response from the Javelin API.
+        Record on an error raised by the client how many retries were made.
         """
-        self._handle_gateway_response(response)
-        return response.text
+        error.retry_count = retries
+        error.retry_sleep = slept
+        return error
 
-    def _process_provider_response_ok(self, response: httpx.Response) -> str:
+    @staticmethod
+    def _parse_text(endpoint: Endpoint, response: httpx.Response) -> str:
         """
-        Process a successful response from the Javelin API.
+        Parse a response to a create, update or delete request.
+        Return the response text (e.g., "OK").
         """
-        self._handle_provider_response(response)
+        endpoint.raise_for_status(response)
         return response.text
 
-    def _process_route_response_ok(self, response: httpx.Response) -> str:
+    def _parse_model(self, endpoint: Endpoint, response: httpx.Response) -> Any:
         """
-        Process a successful response from the Javelin API.
+        Parse a response into the model of its endpoint.
+        This is for Get() requests.
         """
-        self._handle_route_response(response)
-        return response.text
+        endpoint.raise_for_status(response)
+        return endpoint.model(**self._codec.loads(response.content))
 
-    def _process_secret_response_ok(self, response: httpx.Response) -> str:
+    def _parse_list(self, endpoint: Endpoint, response: httpx.Response) -> Any:
         """
-        Process a successful response from the Javelin API.
+        Parse the body of a list response into the model of its endpoint, e.g.
+        a Routes object. Error and non-JSON bodies are parsed as an empty list.
         """
-        self._handle_secret_response(response)
-        return response.text
+        try:
+            response_json = self._codec.loads(response.content)
+            # Check if there's an error in the JSON response
+            if "error" in response_json:
+                return endpoint.model()
+            return endpoint.model(**{endpoint.items: response_json})
+        except ValueError:
+            # Handle cases where the response is not JSON (possibly a string)
+            return endpoint.model()
 
-    def _process_template_response_ok(self, response: httpx.Response) -> str:
+    def _parse_list_strict(self, endpoint: Endpoint, response: httpx.Response) -> Any:
         """
-        Process a successful response from the Javelin API.
+        Parse the body of a list response into the model of its endpoint,
+        raising on error and non-JSON bodies instead of returning an empty
+        list, for callers that must not mistake a failure for no resources.
+
+        :raises JavelinClientError: If the gateway did not return a list.
         """
-        self._handle_template_response(response)
-        return response.text
+        endpoint.raise_for_status(response)
+        try:
+            items = self._codec.loads(response.content)
+        except ValueError:
+            items = None
+        if not isinstance(items, list):
+            raise InternalServerError(
+                response=response, message=f"Invalid list response from {endpoint.path}"
+            )
+        return endpoint.model(**{endpoint.items: items})
 
-    def _process_gateway_response_json(self, response: httpx.Response) -> QueryResponse:
+    def _list_strict_sync(self, endpoint: Endpoint) -> Any:
         """
-        Process a successful response from the Javelin API.
-        Parse body into a QueryResponse object and return it.
-        This is for Query() requests.
+        List the resources of an endpoint from the gateway, bypassing the
+        metadata cache. See _parse_list_strict.
         """
-        self._handle_gateway_response(response)
-        return QueryResponse(**response.json())
+        response = self._send_request_sync(HttpMethod.GET, endpoint)
+        return self._parse_list_strict(endpoint, response)
 
-    def _process_provider_response_json(self, response: httpx.Response) -> QueryResponse:
+    async def _alist_strict(self, endpoint: Endpoint) -> Any:
         """
-        Process a successful response from the Javelin API.
-        Parse body into a QueryResponse object and return it.
-        This is for Query() requests.
+        Asynchronously list the resources of an endpoint from the gateway,
+        bypassing the metadata cache. See _parse_list_strict.
         """
-        self._handle_provider_response(response)
-        return QueryResponse(**response.json())
+        response = await self._send_request_async(HttpMethod.GET, endpoint)
+        return self._parse_list_strict(endpoint, response)
 
-    def _process_route_response_json(self, response: httpx.Response) -> QueryResponse:
+    def _parser(self, endpoint: Endpoint) -> Callable[[httpx.Response], Any]:
         """
-        Process a successful response from the Javelin API.
-        Parse body into a QueryResponse object and return it.
-        This is for Query() requests.
+        Parser of the responses of a get or list endpoint.
         """
-        self._handle_route_response(response)
-        return QueryResponse(**response.json())
-
-    def _process_secret_response_json(self, response: httpx.Response) -> QueryResponse:
-        """
-        Process a successful response from the Javelin API.
-        Parse body into a QueryResponse object and return it.
-        This is for Query() requests.
-        """
-        self._handle_secret_response(response)
-        return QueryResponse(**response.json())
-
-    def _process_template_response_json(self, response: httpx.Response) -> QueryResponse:
+        return partial(self._parse_list if endpoint.items else self._parse_model, endpoint)
+
+    def _parse_query(self, response: httpx.Response) -> Union[QueryResponse, LazyQueryResponse]:
         """
-        Process a successful response from the Javelin API.
-        Parse body into a QueryResponse object and return it.
-        This is for Query() requests.
+        Parse the response to a query into a QueryResponse object, or wrap it
+        in a LazyQueryResponse.
         """
-        self._handle_template_response(response)
-        return QueryResponse(**response.json())
-
-    def _handle_gateway_response(self, response: httpx.Response) -> None:
-        """
-        Handle the API response by raising appropriate exceptions based on the
-        response status code.
-
-        :param response: The API response to handle.
-        """
-        if response.status_code == 400:
-            raise BadRequest(response=response)
-        elif response.status_code == 409:
-            raise GatewayAlreadyExistsError(response=response)
-        elif response.status_code == 401:
-            raise UnauthorizedError(response=response)
-        elif response.status_code == 403:
-            raise UnauthorizedError(response=response)
-        elif response.status_code == 404:
-            raise GatewayNotFoundError(response=response)
-        elif response.status_code == 429:
-            raise RateLimitExceededError(response=response)
-        elif response.status_code != 200:
-            raise InternalServerError(response=response)
-
-    def _handle_provider_response(self, response: httpx.Response) -> None:
-        """
-        Handle the API response by raising appropriate exceptions based on the
-        response status code.
-
-        :param response: The API response to handle.
-        """
-        if response.status_code == 400:
-            raise BadRequest(response=response)
-        elif response.status_code == 409:
-            raise ProviderAlreadyExistsError(response=response)
-        elif response.status_code == 401:
-            raise UnauthorizedError(response=response)
-        elif response.status_code == 403:
-            raise UnauthorizedError(response=response)
-        elif response.status_code == 404:
-            raise ProviderNotFoundError(response=response)
-        elif response.status_code == 429:
-            raise RateLimitExceededError(response=response)
-        elif response.status_code != 200:
-            raise InternalServerError(response=response)
-
-    def _handle_route_response(self, response: httpx.Response) -> None:
-        """
-        Handle the API response by raising appropriate exceptions based on the
-        response status code.
-
-        :param response: The API response to handle.
-        """
-        if response.status_code == 400:
-            raise BadRequest(response=response)
-        elif response.status_code == 409:
-            raise RouteAlreadyExistsError(response=response)
-        elif response.status_code == 401:
-            raise UnauthorizedError(response=response)
-        elif response.status_code == 403:
-            raise UnauthorizedError(response=response)
-        elif response.status_code == 404:
-            raise RouteNotFoundError(response=response)
-        elif response.status_code == 429:
-            raise RateLimitExceededError(response=response)
-        elif response.status_code != 200:
-            raise InternalServerError(response=response)
-
-    def _handle_secret_response(self, response: httpx.Response) -> None:
-        """
-        Handle the API response by raising appropriate exceptions based on the
-        response status code.
-
-        :param response: The API response to handle.
-        """
-        if response.status_code == 400:
-            raise BadRequest(response=response)
-        elif response.status_code == 409:
-            raise SecretAlreadyExistsError(response=response)
-        elif response.status_code == 401:
-            raise UnauthorizedError(response=response)
-        elif response.status_code == 403:
-            raise UnauthorizedError(response=response)
-        elif response.status_code == 404:
-            raise SecretNotFoundError(response=response)
-        elif response.status_code == 429:
-            raise RateLimitExceededError(response=response)
-        elif response.status_code != 200:
-            raise InternalServerError(response=response)
-
-    def _handle_template_response(self, response: httpx.Response) -> None:
-        """
-        Handle the API response by raising appropriate exceptions based on the
-        response status code.
-
-        :param response: The API response to handle.
-        """
-        if response.status_code == 400:
-            raise BadRequest(response=response)
-        elif response.status_code == 409:
-            raise TemplateAlreadyExistsError(response=response)
-        elif response.status_code == 401:
-            raise UnauthorizedError(response=response)
-        elif response.status_code == 403:
-            raise UnauthorizedError(response=response)
-        elif response.status_code == 404:
-            raise TemplateNotFoundError(response=response)
-        elif response.status_code == 429:
-            raise RateLimitExceededError(response=response)
-        elif response.status_code != 200:
-            raise InternalServerError(response=response)
-
-    def _construct_url(
-        self, 
-        gateway_name: Optional[str] = "", 
-        provider_name: Optional[str] = "", 
-        route_name: Optional[str] = "", 
-        secret_name: Optional[str] = "", 
-        template_name: Optional[str] = "", 
-        query: bool = False
-    ) -> str:
+        QUERY.raise_for_status(response)
+        if self._lazy_responses:
+            return LazyQueryResponse(content=response.content, loads=self._codec.loads)
+        return QueryResponse(**self._codec.loads(response.content))
+
+    def _query_response(self, payload: Dict[str, Any]) -> Union[QueryResponse, LazyQueryResponse]:
         """
-        Construct the complete URL for a given route name and action.
+        Build the response to a query answered from the response cache.
+        """
+        if self._lazy_responses:
+            return LazyQueryResponse(payload)
+        return QueryResponse(**payload)
 
-        :param route_name: Name of the route.
-        :param query: If True, add "query" to the end of the URL.
-        :return: Constructed URL.
+    def _parse_query_stream(
+        self,
+        response: httpx.Response,
+        deadline: Optional[Deadline] = None,
+        on_finish: Optional[Callable[[Optional[BaseException]], None]] = None,
+    ) -> QueryStream:
         """
-        url_parts = [self.base_url]
-        
-        '''
-        print(f"_construct_url gateway_name: {gateway_name}")
-        print(f"_construct_url provider_name: {provider_name}")
-        print(f"_construct_url route_name: {route_name}")
-        print(f"_construct_url secret_name: {secret_name}")
-        '''
-        if query:
-            url_parts.append("query")
-            if route_name is not None:  # Check if route_name is not None
-                url_parts.append(route_name)
-        elif gateway_name:
-            url_parts.append("admin")
-            url_parts.append("gateways")
-            if gateway_name != "###":
-                url_parts.append(gateway_name)
-        elif provider_name and not secret_name:
-            url_parts.append("admin")
-            url_parts.append("providers")
-            if provider_name != "###":
-                url_parts.append(provider_name)
-        elif route_name:
-            url_parts.append("admin")
-            url_parts.append("routes")
-            if route_name != "###":
-                url_parts.append(route_name)
-        elif secret_name:
-            url_parts.append("admin")
-            url_parts.append("providers")
-            if provider_name != "###":
-                url_parts.append(provider_name)
-            url_parts.append("secrets")
-            if secret_name != "###":
-                url_parts.append(secret_name)
-            else:
-                url_parts.append("keys")
-        elif template_name:
-            url_parts.append("admin")
-            url_parts.append("processors")
-            url_parts.append("dp")
-            url_parts.append("templates")
-            if template_name != "###":
-                url_parts.append(template_name)
-        else:
-            url_parts.append("admin")
-            url_parts.append("routes")
-        return "/".join(url_parts)
+        Wrap the response to a streamed query in a QueryStream.
+        The error body is read before raising so that it can be reported.
+        """
+        if response.status_code != 200:
+            response.read()
+            response.close()
+            QUERY.raise_for_status(response)
+        return QueryStream(response, self._codec.loads, deadline, on_finish)
+
+    async def _aparse_query_stream(
+        self,
+        response: httpx.Response,
+        deadline: Optional[Deadline] = None,
+        on_finish: Optional[Callable[[Optional[BaseException]], None]] = None,
+    ) -> AsyncQueryStream:
+        """
+        Wrap the response to a streamed query in an AsyncQueryStream.
+        The error body is read before raising so that it can be reported.
+        """
+        if response.status_code != 200:
+            await response.aread()
+            await response.aclose()
+            QUERY.raise_for_status(response)
+        return AsyncQueryStream(response, self._codec.loads, deadline, on_finish)
 
-    def get_route(self, route_name: str) -> Route:
+    def get_route(
+        self,
+        route_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Route:
         """
         Retrieve details of a specific route.
 
         :param route_name: Name of the route to retrieve.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response object containing route details.
         """
         self._validate_route_name(route_name)
-        response = self._send_request_sync(HttpMethod.GET, route=route_name)
-        return self._process_response_route(response)
+        route = self._get_metadata_sync(
+            ("route", route_name), ROUTE, {"name": route_name}, timeout=timeout, deadline=deadline
+        )
+        self._seed_rate_limiter(route)
+        return route
 
-    async def aget_route(self, route_name: str) -> Route:
+    async def aget_route(
+        self,
+        route_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Route:
         """
         Asynchronously retrieve details of a specific route.
 
         :param route_name: Name of the route to retrieve.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response object containing route details.
         """
         self._validate_route_name(route_name)
-        response = await self._send_request_async(HttpMethod.GET, route=route_name)
-        return self._process_response_route(response)
-
-    def _process_response_route(self, response: httpx.Response) -> Route:
-        """
-        Process a successful response from the Javelin API.
-        Parse body into a Route object and return it.
-        This is for Get() requests.
-        """
-        self._handle_route_response(response)
-        return Route(**response.json())
+        route = await self._aget_metadata(
+            ("route", route_name), ROUTE, {"name": route_name}, timeout=timeout, deadline=deadline
+        )
+        self._seed_rate_limiter(route)
+        return route
 
     # create a route
-    def create_route(self, route: Route) -> str:
+    def create_route(
+        self,
+        route: Route,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Create a new route.
 
         :param route: Route object containing route details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_route_name(route.name)
         response = self._send_request_sync(
-            HttpMethod.POST, route=route.name, data=route.dict()
+            HttpMethod.POST,
+            ROUTE,
+            {"name": route.name},
+            data=route.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_route_response_ok(response)
+        result = self._parse_text(ROUTE, response)
+        self._invalidate_metadata("route", route.name)
+        return result
 
     # async create a route
-    async def acreate_route(self, route: Route) -> str:
+    async def acreate_route(
+        self,
+        route: Route,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously create a new route.
 
         :param route: Route object containing route details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_route_name(route.name)
         response = await self._send_request_async(
-            HttpMethod.POST, route=route.name, data=route.dict()
+            HttpMethod.POST,
+            ROUTE,
+            {"name": route.name},
+            data=route.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_route_response_ok(response)
+        result = self._parse_text(ROUTE, response)
+        self._invalidate_metadata("route", route.name)
+        return result
 
     # update a route
-    def update_route(self, route: Route) -> str:
+    def update_route(
+        self,
+        route: Route,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Update an existing route.
 
         :param route_name: Name of the route to update.
         :param route: Route object containing updated route details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_route_name(route.name)
         response = self._send_request_sync(
-            HttpMethod.PUT, route=route.name, data=route.dict()
+            HttpMethod.PUT,
+            ROUTE,
+            {"name": route.name},
+            data=route.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_route_response_ok(response)
+        result = self._parse_text(ROUTE, response)
+        self._seed_rate_limiter(route)
+        self._invalidate_route_cache(route.name)
+        self._invalidate_metadata("route", route.name)
+        return result
 
     # async update a route
-    async def aupdate_route(self, route: Route) -> str:
+    async def aupdate_route(
+        self,
+        route: Route,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously update an existing route.
 
         :param route_name: Name of the route to update.
         :param route: Route object containing updated route details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_route_name(route.name)
         response = await self._send_request_async(
-            HttpMethod.PUT, route=route.name, data=route.dict()
+            HttpMethod.PUT,
+            ROUTE,
+            {"name": route.name},
+            data=route.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_route_response_ok(response)
+        result = self._parse_text(ROUTE, response)
+        self._seed_rate_limiter(route)
+        self._invalidate_route_cache(route.name)
+        self._invalidate_metadata("route", route.name)
+        return result
 
     # list routes
-    def list_routes(self) -> Routes:
+    def list_routes(
+        self,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Routes:
         """
         Retrieve a list of all routes.
 
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Routes object containing a list of all routes, or an empty list if an error occurs or no routes are found.
         """
-        response = self._send_request_sync(HttpMethod.GET, gateway="", provider="", route="###")
-
-        try:
-            # Attempt to parse the response as JSON
-            response_json = response.json()
-            # Check if there's an error in the JSON response
-            if 'error' in response_json:
-                # print(f"Error retrieving routes: {response_json['error']}")
-                return Routes(routes=[])  # Return an empty list of routes if an error is found
-            else:
-                return Routes(routes=response_json)  # Return the list of routes
-        except ValueError:
-            # Handle cases where the response is not JSON (possibly a string)
-            # print("Response:", response.text)
-            return Routes(routes=[])  # Return an empty list of routes for non-JSON responses
+        return self._get_metadata_sync(
+            ("route", None), ROUTES, timeout=timeout, deadline=deadline
+        )
 
     # async list routes
-    async def alist_routes(self) -> Routes:
+    async def alist_routes(
+        self,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Routes:
         """
         Asynchronously retrieve a list of all routes.
 
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Routes object containing a list of all routes, or an empty list if an error occurs or no routes are found.
         """
-        response = await self._send_request_async(HttpMethod.GET, gateway="", provider="", route="###")
+        return await self._aget_metadata(
+            ("route", None), ROUTES, timeout=timeout, deadline=deadline
+        )
 
-        try:
-            # Attempt to parse the response as JSON
-            response_json = response.json()
-            # Check if there's an error in the JSON response
-            if 'error' in response_json:
-                # print(f"Error retrieving routes: {response_json['error']}")
-                return Routes(routes=[])  # Return an empty list of routes if an error is found
-            else:
-                return Routes(routes=response_json)  # Return the list of routes
-        except ValueError:
-            # Handle cases where the response is not JSON (possibly a string)
-            # print("Response:", response.text)
-            return Routes(routes=[])  # Return an empty list of routes for non-JSON responses
+    # iterate over routes
+    def iter_routes(self, page_size: Optional[int] = None) -> Iterator[Route]:
+        """
+        Iterate over all routes, parsing the response as it is received
+        instead of loading the whole list in memory.
+
+        :param page_size: Number of routes requested at a time, for gateways
+            supporting `limit` / `offset` pagination. None fetches them all in
+            a single request.
+        :return: Iterator of Route objects.
+        """
+        return self._iter_list_sync(ROUTES, page_size)
+
+    # async iterate over routes
+    def aiter_routes(self, page_size: Optional[int] = None) -> AsyncIterator[Route]:
+        """
+        Asynchronously iterate over all routes, parsing the response as it is
+        received instead of loading the whole list in memory.
+
+        :param page_size: Number of routes requested at a time, for gateways
+            supporting `limit` / `offset` pagination. None fetches them all in
+            a single request.
+        :return: Async iterator of Route objects.
+        """
+        return self._aiter_list(ROUTES, page_size)
 
     # query an LLM through a route
     def query_route(
@@ -667,20 +1170,175 @@ class JavelinClient:
         route_name: str,
         query_body: Dict[str, Any],
         headers: Optional[Dict[str, str]] = None,
-    ) -> QueryResponse:
+        stream: bool = False,
+        cache: Optional[bool] = None,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Union[QueryResponse, LazyQueryResponse, QueryStream]:
         """
         Query an LLM through a specific route.
 
         :param route_name: Name of the route to query.
         :param query_body: QueryBody object containing the query details.
         :param headers: Additional headers to send with the request.
+        :param stream: If True, return a QueryStream yielding QueryChunk objects
+            as they arrive. The aggregated QueryResponse is available from the
+            stream once it has been consumed.
+        :param cache: Whether to use the client's response cache. By default
+            only deterministic queries (temperature 0) are cached. A
+            `Cache-Control: no-cache` header refreshes the cached entry and
+            `no-store` bypasses the cache.
+        :param timeout: Timeout of each request, in seconds or as an
+            httpx.Timeout, e.g. a long read timeout for long completions.
+            When streaming, the read timeout bounds the wait for each chunk.
+            Defaults to the client timeout.
+        :param deadline: Seconds, or a Deadline shared with other calls, by
+            which the query must have completed, retries and hedged requests
+            included. The time left is sent to the gateway in the
+            `x-javelin-deadline-ms` header.
         :return: Response object containing query results.
+
+        :raises CircuitOpenError: If the circuit breaker of the route is open.
+        :raises DeadlineExceededError: If the deadline passes first.
         """
         self._validate_route_name(route_name)
-        response = self._send_request_sync(
-            HttpMethod.POST, route=route_name, is_query=True, data=query_body, headers=headers
-        )
-        return self._process_route_response_json(response)
+        timeout, deadline = self._call_timeouts(timeout, deadline)
+        if stream:
+            return self._send_query_sync(
+                route_name, query_body, headers, True, timeout, deadline
+            )
+
+        read_cache, write_cache = self._cache_policy(query_body, headers, cache)
+        if read_cache or write_cache:
+            cache_key = self._cache_key(route_name, query_body, headers)
+        if read_cache:
+            payload = self._response_cache.get(cache_key)
+            if payload is not None:
+                return self._query_response(payload)
+
+        def send() -> QueryResponse:
+            result = self._send_query_sync(
+                route_name, query_body, headers, timeout=timeout, deadline=deadline
+            )
+            if write_cache:
+                self._response_cache.set(cache_key, route_name, result.dict())
+            return result
+
+        if self._singleflight is not None:
+            key = query_key(route_name, query_body, headers, scope=self._credentials_scope)
+            return self._singleflight.do(key, send, deadline)
+        return send()
+
+    def query_route_many(
+        self,
+        route_name: str,
+        query_bodies: Iterable[Dict[str, Any]],
+        concurrency: int = 10,
+        ordered: bool = True,
+        headers: Optional[Dict[str, str]] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[BatchResult]:
+        """
+        Query a route with many bodies from a pool of worker threads, with at
+        most `concurrency` queries in flight.
+
+        The threads share the connections of this client, so `concurrency`
+        should not exceed the connection limits of its PoolConfig. Bodies are
+        read from the input only as slots free up, and a failed query does not
+        stop the batch: its exception is reported in its BatchResult. Closing
+        the returned iterator early cancels the queries not started yet.
+
+        :param route_name: Name of the route to query.
+        :param query_bodies: Iterable of query bodies.
+        :param concurrency: Maximum number of queries in flight.
+        :param ordered: Yield results in input order instead of as they complete.
+        :param headers: Additional headers to send with every request.
+        :param on_progress: Called with a BatchProgress after each query, from
+            a worker thread.
+        :param timeout: Seconds the whole batch may take.
+        :return: Iterator of BatchResult objects, whose index is the position
+            of the body in the input.
+
+        :raises concurrent.futures.TimeoutError: If the batch takes longer than
+            `timeout`.
+        """
+        self._validate_route_name(route_name)
+        # Create the shared httpx.Client before the worker threads race to
+        self.client
+        # Worker threads do not inherit the caller's timeouts() block
+        call_timeout, call_deadline = current_timeouts()
+
+        def query(query_body: Dict[str, Any]) -> QueryResponse:
+            return self.query_route(
+                route_name, query_body, headers, timeout=call_timeout, deadline=call_deadline
+            )
+
+        return map_bounded(query, query_bodies, concurrency, ordered, on_progress, timeout)
+
+    def _send_query_sync(
+        self,
+        route_name: str,
+        query_body: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+        timeout: Optional[httpx.Timeout] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Union[QueryResponse, QueryStream]:
+        """
+        Send a query, after waiting on the rate limiter and the concurrency
+        limiter of the route and through its circuit breaker.
+        """
+        limiter = self._rate_limiters.get(route_name)
+        if limiter is not None:
+            limiter.acquire()
+
+        if stream:
+            guard = self._stream_guard(route_name)
+            guard.acquire(deadline)
+            try:
+                response = self._send_request_sync(
+                    HttpMethod.POST,
+                    QUERY,
+                    {"name": route_name},
+                    data={**query_body, "stream": True},
+                    headers={"Accept": "text/event-stream", **(headers or {})},
+                    stream=True,
+                    timeout=timeout,
+                    deadline=deadline,
+                )
+                guard.headers_received()
+                self._learn_rate_limit_period(route_name, response)
+                self._report_throttled(guard.slot, response)
+                return self._parse_query_stream(response, deadline, guard.finish)
+            except BaseException as e:
+                guard.finish(e)
+                raise
+
+        with self._concurrency_guard(route_name, deadline) as slot:
+            with self._circuit_guard(route_name):
+                adaptive = timeout is None
+                if adaptive:
+                    timeout = self._adaptive_timeout(route_name)
+                try:
+                    response = self._send_request_sync(
+                        HttpMethod.POST,
+                        QUERY,
+                        {"name": route_name},
+                        data=query_body,
+                        headers=headers,
+                        timeout=timeout,
+                        deadline=deadline,
+                    )
+                except httpx.TimeoutException:
+                    if adaptive:
+                        self._observe_timeout(route_name, timeout)
+                    raise
+                self._learn_rate_limit_period(route_name, response)
+                result = self._parse_query(response)
+                self._observe_latency(route_name, response)
+                self._report_throttled(slot, response)
+                return result
 
     # async query an LLM through a route
     async def aquery_route(
@@ -688,44 +1346,719 @@ class JavelinClient:
         route_name: str,
         query_body: Dict[str, Any],
         headers: Optional[Dict[str, str]] = None,
-    ) -> QueryResponse:
+        stream: bool = False,
+        cache: Optional[bool] = None,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Union[QueryResponse, LazyQueryResponse, AsyncQueryStream]:
         """
         Asynchronously query an LLM through a specific route.
 
         :param route_name: Name of the route to query.
         :param query_body: QueryBody object containing the query details.
         :param headers: Additional headers to send with the request.
+        :param stream: If True, return an AsyncQueryStream yielding QueryChunk
+            objects as they arrive. The aggregated QueryResponse is available
+            from the stream once it has been consumed.
+        :param cache: Whether to use the client's response cache. By default
+            only deterministic queries (temperature 0) are cached. A
+            `Cache-Control: no-cache` header refreshes the cached entry and
+            `no-store` bypasses the cache.
+        :param timeout: Timeout of each request, in seconds or as an
+            httpx.Timeout, e.g. a long read timeout for long completions.
+            When streaming, the read timeout bounds the wait for each chunk.
+            Defaults to the client timeout.
+        :param deadline: Seconds, or a Deadline shared with other calls, by
+            which the query must have completed, retries and hedged requests
+            included. The time left is sent to the gateway in the
+            `x-javelin-deadline-ms` header.
         :return: Response object containing query results.
+
+        :raises CircuitOpenError: If the circuit breaker of the route is open.
+        :raises DeadlineExceededError: If the deadline passes first.
+        """
+        self._validate_route_name(route_name)
+        timeout, deadline = self._call_timeouts(timeout, deadline)
+        if stream:
+            return await self._send_query_async(
+                route_name, query_body, headers, True, timeout, deadline
+            )
+
+        read_cache, write_cache = self._cache_policy(query_body, headers, cache)
+        if read_cache or write_cache:
+            cache_key = self._cache_key(route_name, query_body, headers)
+        if read_cache:
+            payload = self._response_cache.get(cache_key)
+            if payload is not None:
+                return self._query_response(payload)
+
+        async def send() -> QueryResponse:
+            result = await self._send_query_async(
+                route_name, query_body, headers, timeout=timeout, deadline=deadline
+            )
+            if write_cache:
+                self._response_cache.set(cache_key, route_name, result.dict())
+            return result
+
+        if self._asingleflight is not None:
+            key = query_key(route_name, query_body, headers, scope=self._credentials_scope)
+            return await self._asingleflight.do(key, send, deadline)
+        return await send()
+
+    async def aquery_route_many(
+        self,
+        route_name: str,
+        query_bodies: Union[Iterable[Dict[str, Any]], AsyncIterable[Dict[str, Any]]],
+        concurrency: int = 10,
+        ordered: bool = True,
+        headers: Optional[Dict[str, str]] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> AsyncIterator[BatchResult]:
+        """
+        Asynchronously query a route with many bodies, with at most
+        `concurrency` queries in flight.
+
+        Bodies are read from the input only as slots free up, so arbitrarily
+        long inputs, e.g. generators reading a file, run in constant memory.
+        A failed query does not stop the batch: its exception is reported in
+        its BatchResult.
+
+        :param route_name: Name of the route to query.
+        :param query_bodies: Iterable or async iterable of query bodies.
+        :param concurrency: Maximum number of queries in flight.
+        :param ordered: Yield results in input order instead of as they complete.
+        :param headers: Additional headers to send with every request.
+        :param on_progress: Called with a BatchProgress after each query.
+        :return: Async iterator of BatchResult objects, whose index is the
+            position of the body in the input.
         """
         self._validate_route_name(route_name)
-        response = await self._send_request_async(
-            HttpMethod.POST, route=route_name, is_query=True, data=query_body, headers=headers
-        )
-        return self._process_route_response_json(response)
+
+        async def query(query_body: Dict[str, Any]) -> QueryResponse:
+            return await self.aquery_route(route_name, query_body, headers)
+
+        results = amap_bounded(query, query_bodies, concurrency, ordered, on_progress)
+        try:
+            async for result in results:
+                yield result
+        finally:
+            await results.aclose()
+
+    async def _send_query_async(
+        self,
+        route_name: str,
+        query_body: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+        timeout: Optional[httpx.Timeout] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Union[QueryResponse, AsyncQueryStream]:
+        """
+        Asynchronously send a query, after waiting on the rate limiter and the
+        concurrency limiter of the route and through its circuit breaker,
+        hedging it if enabled.
+        """
+        limiter = self._rate_limiters.get(route_name)
+        if limiter is not None:
+            await limiter.aacquire()
+
+        if stream:
+            guard = self._stream_guard(route_name)
+            await guard.aacquire(deadline)
+            try:
+                response = await self._send_request_async(
+                    HttpMethod.POST,
+                    QUERY,
+                    {"name": route_name},
+                    data={**query_body, "stream": True},
+                    headers={"Accept": "text/event-stream", **(headers or {})},
+                    stream=True,
+                    timeout=timeout,
+                    deadline=deadline,
+                )
+                guard.headers_received()
+                self._learn_rate_limit_period(route_name, response)
+                self._report_throttled(guard.slot, response)
+                return await self._aparse_query_stream(response, deadline, guard.finish)
+            except BaseException as e:
+                guard.finish(e)
+                raise
+
+        async with self._aconcurrency_guard(route_name, deadline) as slot:
+            with self._circuit_guard(route_name):
+                adaptive = timeout is None
+                if adaptive:
+                    timeout = self._adaptive_timeout(route_name)
+                hedging = self._hedging_policy
+                if hedging is not None and hedging.is_idempotent(headers):
+                    return await self._aquery_route_hedged(
+                        route_name, query_body, headers, timeout, deadline, adaptive, slot
+                    )
+
+                try:
+                    response = await self._send_request_async(
+                        HttpMethod.POST,
+                        QUERY,
+                        {"name": route_name},
+                        data=query_body,
+                        headers=headers,
+                        timeout=timeout,
+                        deadline=deadline,
+                    )
+                except httpx.TimeoutException:
+                    if adaptive:
+                        self._observe_timeout(route_name, timeout)
+                    raise
+                self._learn_rate_limit_period(route_name, response)
+                result = self._parse_query(response)
+                self._observe_latency(route_name, response)
+                self._report_throttled(slot, response)
+                return result
+
+    async def _aquery_route_hedged(
+        self,
+        route_name: str,
+        query_body: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        deadline: Optional[Deadline] = None,
+        adaptive: bool = False,
+        slot: Optional[ConcurrencySlot] = None,
+    ) -> QueryResponse:
+        """
+        Query a route, sending a duplicate request when the first one is slow
+        and returning whichever succeeds first. The other one is cancelled.
+        Both requests share the deadline of the call.
+        """
+        policy = self._hedging_policy
+        loop = asyncio.get_running_loop()
+
+        async def attempt() -> Tuple[QueryResponse, float]:
+            start = loop.time()
+            try:
+                response = await self._send_request_async(
+                    HttpMethod.POST,
+                    QUERY,
+                    {"name": route_name},
+                    data=query_body,
+                    headers=headers,
+                    timeout=timeout,
+                    deadline=deadline,
+                )
+            except httpx.TimeoutException:
+                if adaptive:
+                    self._observe_timeout(route_name, timeout)
+                raise
+            self._learn_rate_limit_period(route_name, response)
+            result = self._parse_query(response)
+            self._observe_latency(route_name, response)
+            self._report_throttled(slot, response)
+            return result, loop.time() - start
+
+        primary = asyncio.ensure_future(attempt())
+        pending = {primary}
+        try:
+            hedged = False
+            delay = policy.hedge_delay(route_name)
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done and policy.try_hedge():
+                    pending.add(asyncio.ensure_future(attempt()))
+                    hedged = True
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        result, latency = task.result()
+                        policy.observe(route_name, latency)
+                        if hedged:
+                            policy.record_winner(hedge_won=task is not primary)
+                        return result
+                    if error is None or task is primary:
+                        error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            # Wait for the cancelled request so its connection is released
+            await asyncio.gather(*pending, return_exceptions=True)
 
     # delete a route
-    def delete_route(self, route_name: str) -> str:
+    def delete_route(
+        self,
+        route_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Delete a specific route.
 
         :param route_name: Name of the route to delete.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_route_name(route_name)
-        response = self._send_request_sync(HttpMethod.DELETE, route=route_name)
-        return self._process_route_response_ok(response)
+        response = self._send_request_sync(
+            HttpMethod.DELETE, ROUTE, {"name": route_name}, timeout=timeout, deadline=deadline
+        )
+        result = self._parse_text(ROUTE, response)
+        self._rate_limiters.pop(route_name, None)
+        self._explicit_rate_limits.discard(route_name)
+        self._route_rate_limits.pop(route_name, None)
+        self._rate_limit_periods.pop(route_name, None)
+        self._invalidate_route_cache(route_name)
+        self._invalidate_metadata("route", route_name)
+        return result
 
     # async delete a route
-    async def adelete_route(self, route_name: str) -> str:
+    async def adelete_route(
+        self,
+        route_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously delete a specific route.
 
         :param route_name: Name of the route to delete.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_route_name(route_name)
-        response = await self._send_request_async(HttpMethod.DELETE, route=route_name)
-        return self._process_route_response_ok(response)
+        response = await self._send_request_async(
+            HttpMethod.DELETE, ROUTE, {"name": route_name}, timeout=timeout, deadline=deadline
+        )
+        result = self._parse_text(ROUTE, response)
+        self._rate_limiters.pop(route_name, None)
+        self._explicit_rate_limits.discard(route_name)
+        self._route_rate_limits.pop(route_name, None)
+        self._rate_limit_periods.pop(route_name, None)
+        self._invalidate_route_cache(route_name)
+        self._invalidate_metadata("route", route_name)
+        return result
+
+    def set_rate_limit(
+        self,
+        route_name: str,
+        rate: Optional[float],
+        period: Optional[float] = None,
+        burst: Optional[float] = None,
+    ) -> None:
+        """
+        Pace the queries of a route on the client side.
+
+        An explicit limit takes precedence over the route's `rate_limit`.
+
+        :param route_name: Name of the route to limit.
+        :param rate: Maximum number of queries per period, None to remove the
+            limit.
+        :param period: Length of the period, in seconds. Required with a rate.
+        :param burst: Maximum number of queries sent back to back.
+        """
+        self._validate_route_name(route_name)
+        if rate is None:
+            self._rate_limiters.pop(route_name, None)
+            self._explicit_rate_limits.discard(route_name)
+            self._update_rate_limiter(route_name)
+            return
+        if period is None:
+            raise ValueError("Rate limit period must be given with the rate.")
+        self._rate_limiters[route_name] = RateLimiter(rate, period=period, burst=burst)
+        self._explicit_rate_limits.add(route_name)
+
+    def _cache_policy(
+        self,
+        query_body: Dict[str, Any],
+        headers: Optional[Dict[str, str]],
+        cache: Optional[bool],
+    ) -> Tuple[bool, bool]:
+        """
+        Decide whether a query is looked up in and stored to the response cache.
+
+        :return: Tuple of (read, write).
+        """
+        if self._response_cache is None or cache is False:
+            return False, False
+        directives = {
+            directive.strip().lower()
+            for name, value in (headers or {}).items()
+            if name.lower() == "cache-control"
+            for directive in value.split(",")
+        }
+        if "no-store" in directives:
+            return False, False
+        if cache is None and query_body.get("temperature") != 0:
+            return False, False
+        return "no-cache" not in directives, True
+
+    def _cache_key(
+        self, route_name: str, query_body: Dict[str, Any], headers: Optional[Dict[str, str]]
+    ) -> str:
+        """
+        Response cache key of a query, ignoring its cache directives. Clients
+        sending different credentials get different keys, so that they can
+        share a cache without reading each other's responses.
+        """
+        headers = {
+            name: value
+            for name, value in (headers or {}).items()
+            if name.lower() != "cache-control"
+        }
+        return query_key(route_name, query_body, headers, scope=self._credentials_scope)
+
+    def _circuit_guard(self, route_name: str) -> ContextManager[None]:
+        """
+        Guard a query with the circuit breaker of its route, if any.
+        """
+        if self._circuit_breakers is None:
+            return nullcontext()
+        return self._circuit_breakers.get(route_name).guard()
+
+    def _concurrency_guard(
+        self, route_name: str, deadline: Optional[Deadline]
+    ) -> ContextManager[Optional[ConcurrencySlot]]:
+        """
+        Hold a slot of the concurrency limiter of the route, if any, during a
+        query.
+        """
+        if self._concurrency_limiters is None:
+            return nullcontext()
+        return self._concurrency_limiters.get(route_name).guard(deadline)
+
+    @asynccontextmanager
+    async def _aconcurrency_guard(
+        self, route_name: str, deadline: Optional[Deadline]
+    ) -> AsyncIterator[Optional[ConcurrencySlot]]:
+        """
+        Asynchronously hold a slot of the concurrency limiter of the route, if
+        any, during a query.
+        """
+        if self._concurrency_limiters is None:
+            yield None
+            return
+        async with self._concurrency_limiters.get(route_name).aguard(deadline) as slot:
+            yield slot
+
+    def _stream_guard(self, route_name: str) -> _StreamGuard:
+        """
+        Guard of a streamed query, with the circuit breaker and the concurrency
+        limiter of its route, if any.
+        """
+        breaker = None
+        if self._circuit_breakers is not None:
+            breaker = self._circuit_breakers.get(route_name)
+        limiter = None
+        if self._concurrency_limiters is not None:
+            limiter = self._concurrency_limiters.get(route_name)
+        return _StreamGuard(breaker, limiter)
+
+    @staticmethod
+    def _report_throttled(slot: Optional[ConcurrencySlot], response: httpx.Response) -> None:
+        """
+        Report to the concurrency limiter a query that succeeded only after
+        429 responses were retried, which it would not see otherwise.
+        """
+        if slot is not None and response.request.extensions.get(THROTTLED_EXTENSION):
+            slot.overloaded = True
+
+    def _adaptive_timeout(self, route_name: str) -> Optional[httpx.Timeout]:
+        """
+        Timeout of a query given none, derived from the latencies of its route
+        when adaptive timeouts are enabled.
+        """
+        if self._adaptive_timeouts is None:
+            return None
+        return self._adaptive_timeouts.apply(route_name, self._default_timeout)
+
+    def _observe_timeout(self, route_name: str, timeout: Optional[httpx.Timeout]) -> None:
+        """
+        Record a query that timed out at its adaptive timeout, so that the
+        timeout grows back when the latency of the route rises.
+        """
+        read = (timeout or self._default_timeout).read
+        if self._adaptive_timeouts is not None and read is not None:
+            self._adaptive_timeouts.observe(route_name, read)
+
+    def _observe_latency(self, route_name: str, response: httpx.Response) -> None:
+        """
+        Record the latency of the last attempt of a successful query.
+        """
+        if self._adaptive_timeouts is not None:
+            self._adaptive_timeouts.observe(route_name, response.elapsed.total_seconds())
+
+    def _invalidate_route_cache(self, route_name: str) -> None:
+        """
+        Drop the cached responses of a route after it was changed.
+        """
+        if self._response_cache is not None:
+            self._response_cache.invalidate_route(route_name)
+
+    def _iter_list_sync(
+        self, endpoint: Endpoint, page_size: Optional[int], url_params: Optional[Dict[str, str]] = None
+    ) -> Iterator[Any]:
+        """
+        Stream the responses of a list endpoint, yielding one model per
+        element. With a page size, pages are requested until one comes back
+        with another number of elements: shorter at the end of the list, or
+        longer when the gateway ignores the limit.
+
+        :raises JavelinClientError: Mapped from the status of an unsuccessful
+            page, with the body of the error.
+        """
+        model = endpoint.item_model
+        offset = 0
+        while True:
+            params = {"limit": page_size, "offset": offset} if page_size else None
+            response = self._send_request_sync(
+                HttpMethod.GET, endpoint, url_params, stream=True, params=params
+            )
+            count = 0
+            try:
+                if response.status_code != 200:
+                    response.read()
+                    endpoint.raise_for_status(response)
+                for element in iter_json_array(response.iter_bytes()):
+                    count += 1
+                    yield model(**element)
+            finally:
+                response.close()
+            if not page_size or count != page_size:
+                return
+            offset += count
+
+    async def _aiter_list(
+        self, endpoint: Endpoint, page_size: Optional[int], url_params: Optional[Dict[str, str]] = None
+    ) -> AsyncIterator[Any]:
+        """
+        Asynchronously stream the responses of a list endpoint, yielding one
+        model per element. Pages are requested as by _iter_list_sync.
+        """
+        model = endpoint.item_model
+        offset = 0
+        while True:
+            params = {"limit": page_size, "offset": offset} if page_size else None
+            response = await self._send_request_async(
+                HttpMethod.GET, endpoint, url_params, stream=True, params=params
+            )
+            count = 0
+            try:
+                if response.status_code != 200:
+                    await response.aread()
+                    endpoint.raise_for_status(response)
+                async for element in aiter_json_array(response.aiter_bytes()):
+                    count += 1
+                    yield model(**element)
+            finally:
+                await response.aclose()
+            if not page_size or count != page_size:
+                return
+            offset += count
+
+    def _invalidate_metadata(self, kind: str, name: str) -> None:
+        """
+        Drop the cached metadata of a resource after it was changed.
+        """
+        if self._metadata_cache is not None:
+            self._metadata_cache.invalidate(kind, name)
+
+    def _get_metadata_sync(
+        self,
+        key: MetadataKey,
+        endpoint: Endpoint,
+        url_params: Optional[Dict[str, str]] = None,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Any:
+        """
+        Read a resource through the metadata cache, if any. A stale entry is
+        returned while a background thread revalidates it.
+
+        :param key: Kind and name of the resource.
+        :param endpoint: Get or list endpoint of the resource.
+        :param url_params: Values of the placeholders of the endpoint URL.
+        :param timeout: Timeout of the request, if one is sent.
+        :param deadline: Deadline of the request, if one is sent. Background
+            revalidations are not bound to it.
+        """
+        cache = self._metadata_cache
+        parse = self._parser(endpoint)
+        if cache is None:
+            return parse(
+                self._send_request_sync(
+                    HttpMethod.GET, endpoint, url_params, timeout=timeout, deadline=deadline
+                )
+            )
+
+        entry, state = cache.lookup(key)
+        if state == FRESH:
+            return entry.result()
+        if state == STALE:
+            if cache.start_revalidation(entry):
+                threading.Thread(
+                    target=self._revalidate_metadata_sync,
+                    args=(key, entry, parse, endpoint, url_params),
+                    daemon=True,
+                ).start()
+            return entry.result()
+        return self._fetch_metadata_sync(
+            key, entry, parse, endpoint, url_params, timeout, deadline
+        )
+
+    def _fetch_metadata_sync(
+        self,
+        key: MetadataKey,
+        entry: Optional[MetadataEntry],
+        parse: Callable[[httpx.Response], Any],
+        endpoint: Endpoint,
+        url_params: Optional[Dict[str, str]],
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Any:
+        cache = self._metadata_cache
+        generation = cache.generation
+        try:
+            response = self._send_request_sync(
+                HttpMethod.GET,
+                endpoint,
+                url_params,
+                headers=cache.conditional_headers(entry),
+                timeout=timeout,
+                deadline=deadline,
+            )
+        except BaseException:
+            cache.finish_revalidation(entry)
+            raise
+        return cache.store(key, generation, entry, response, parse)
+
+    def _revalidate_metadata_sync(self, *args: Any) -> None:
+        try:
+            self._fetch_metadata_sync(*args)
+        except Exception:
+            # The stale entry is kept until it expires
+            pass
+
+    async def _aget_metadata(
+        self,
+        key: MetadataKey,
+        endpoint: Endpoint,
+        url_params: Optional[Dict[str, str]] = None,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Any:
+        """
+        Asynchronously read a resource through the metadata cache, if any. A
+        stale entry is returned while a background task revalidates it.
+
+        :param key: Kind and name of the resource.
+        :param endpoint: Get or list endpoint of the resource.
+        :param url_params: Values of the placeholders of the endpoint URL.
+        :param timeout: Timeout of the request, if one is sent.
+        :param deadline: Deadline of the request, if one is sent. Background
+            revalidations are not bound to it.
+        """
+        cache = self._metadata_cache
+        parse = self._parser(endpoint)
+        if cache is None:
+            return parse(
+                await self._send_request_async(
+                    HttpMethod.GET, endpoint, url_params, timeout=timeout, deadline=deadline
+                )
+            )
+
+        entry, state = cache.lookup(key)
+        if state == FRESH:
+            return entry.result()
+        if state == STALE:
+            if cache.start_revalidation(entry):
+                task = asyncio.ensure_future(
+                    self._arevalidate_metadata(key, entry, parse, endpoint, url_params)
+                )
+                self._metadata_tasks.add(task)
+                task.add_done_callback(self._metadata_tasks.discard)
+            return entry.result()
+        return await self._afetch_metadata(
+            key, entry, parse, endpoint, url_params, timeout, deadline
+        )
+
+    async def _afetch_metadata(
+        self,
+        key: MetadataKey,
+        entry: Optional[MetadataEntry],
+        parse: Callable[[httpx.Response], Any],
+        endpoint: Endpoint,
+        url_params: Optional[Dict[str, str]],
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Any:
+        cache = self._metadata_cache
+        generation = cache.generation
+        try:
+            response = await self._send_request_async(
+                HttpMethod.GET,
+                endpoint,
+                url_params,
+                headers=cache.conditional_headers(entry),
+                timeout=timeout,
+                deadline=deadline,
+            )
+        except BaseException:
+            cache.finish_revalidation(entry)
+            raise
+        return cache.store(key, generation, entry, response, parse)
+
+    async def _arevalidate_metadata(self, *args: Any) -> None:
+        try:
+            await self._afetch_metadata(*args)
+        except Exception:
+            # The stale entry is kept until it expires
+            pass
+
+    def _seed_rate_limiter(self, route: Route) -> None:
+        """
+        Create, update or remove the rate limiter of a route from its config.
+        """
+        if not self._rate_limit_routes:
+            return
+        config = route.config
+        if config is not None and config.rate_limit:
+            self._route_rate_limits[route.name] = config.rate_limit
+        else:
+            self._route_rate_limits.pop(route.name, None)
+        self._update_rate_limiter(route.name)
+
+    def _learn_rate_limit_period(self, route_name: str, response: httpx.Response) -> None:
+        """
+        Take the period of the rate limit of a route from the
+        `RateLimit-Policy` header of a response to a query, if any.
+        """
+        if not self._rate_limit_routes:
+            return
+        period = parse_rate_limit_period(response.headers)
+        if period is not None and self._rate_limit_periods.get(route_name) != period:
+            self._rate_limit_periods[route_name] = period
+            self._update_rate_limiter(route_name)
+
+    def _update_rate_limiter(self, route_name: str) -> None:
+        """
+        Create, update or remove the rate limiter of a route from its known
+        rate limit and period, unless it was set with set_rate_limit.
+        """
+        if route_name in self._explicit_rate_limits:
+            return
+        rate = self._route_rate_limits.get(route_name)
+        period = self._rate_limit_periods.get(route_name, self._rate_limit_period)
+        if not rate or period is None:
+            self._rate_limiters.pop(route_name, None)
+            return
+        limiter = self._rate_limiters.get(route_name)
+        if limiter is None or limiter.rate != rate or limiter.period != period:
+            self._rate_limiters[route_name] = RateLimiter(rate, period=period)
 
     @staticmethod
     def _validate_route_name(route_name: str):
@@ -747,164 +2080,271 @@ class JavelinClient:
         if not body:
             raise ValueError("Body cannot be empty.")
 
-    def get_gateway(self, gateway_name: str) -> Gateway:
+    def get_gateway(
+        self,
+        gateway_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Gateway:
         """
         Retrieve details of a specific gateway.
 
         :param gateway_name: Name of the gateway to retrieve.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response object containing gateway details.
         """
         self._validate_gateway_name(gateway_name)
-        response = self._send_request_sync(HttpMethod.GET, gateway=gateway_name)
-        return self._process_response_gateway(response)
+        return self._get_metadata_sync(
+            ("gateway", gateway_name),
+            GATEWAY,
+            {"name": gateway_name},
+            timeout=timeout,
+            deadline=deadline,
+        )
 
-    async def aget_gateway(self, gateway_name: str) -> Gateway:
+    async def aget_gateway(
+        self,
+        gateway_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Gateway:
         """
         Asynchronously retrieve details of a specific gateway.
 
         :param gateway_name: Name of the gateway to retrieve.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response object containing gateway details.
         """
         self._validate_gateway_name(gateway_name)
-        response = await self._send_request_async(HttpMethod.GET, gateway=gateway_name)
-        return self._process_response_gateway(response)
-
-    def _process_response_gateway(self, response: httpx.Response) -> Gateway:
-        """
-        Process a successful response from the Javelin API.
-        Parse body into a Gateway object and return it.
-        This is for Get() requests.
-        """
-        self._handle_gateway_response(response)
-        return Gateway(**response.json())
+        return await self._aget_metadata(
+            ("gateway", gateway_name),
+            GATEWAY,
+            {"name": gateway_name},
+            timeout=timeout,
+            deadline=deadline,
+        )
 
     # create a gateway
-    def create_gateway(self, gateway: Gateway) -> str:
+    def create_gateway(
+        self,
+        gateway: Gateway,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Create a new gateway.
 
         :param gateway: Gateway object containing gateway details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_gateway_name(gateway.name)
         response = self._send_request_sync(
-            HttpMethod.POST, gateway=gateway.name, data=gateway.dict()
+            HttpMethod.POST,
+            GATEWAY,
+            {"name": gateway.name},
+            data=gateway.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_gateway_response_ok(response)
+        result = self._parse_text(GATEWAY, response)
+        self._invalidate_metadata("gateway", gateway.name)
+        return result
 
     # async create a gateway
-    async def acreate_gateway(self, gateway: Gateway) -> str:
+    async def acreate_gateway(
+        self,
+        gateway: Gateway,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously create a new gateway.
 
         :param gateway: Gateway object containing gateway details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_gateway_name(gateway.name)
         response = await self._send_request_async(
-            HttpMethod.POST, gateway=gateway.name, data=gateway.dict()
+            HttpMethod.POST,
+            GATEWAY,
+            {"name": gateway.name},
+            data=gateway.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_gateway_response_ok(response)
+        result = self._parse_text(GATEWAY, response)
+        self._invalidate_metadata("gateway", gateway.name)
+        return result
 
     # update a gateway
-    def update_gateway(self, gateway: Gateway) -> str:
+    def update_gateway(
+        self,
+        gateway: Gateway,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Update an existing gateway.
 
         :param gateway_name: Name of the gateway to update.
         :param gateway: Gateway object containing updated gateway details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_gateway_name(gateway.name)
         response = self._send_request_sync(
-            HttpMethod.PUT, gateway=gateway.name, data=gateway.dict()
+            HttpMethod.PUT,
+            GATEWAY,
+            {"name": gateway.name},
+            data=gateway.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_gateway_response_ok(response)
+        result = self._parse_text(GATEWAY, response)
+        self._invalidate_metadata("gateway", gateway.name)
+        return result
 
     # async update a gateway
-    async def update_gateway(self, gateway: Gateway) -> str:
+    async def aupdate_gateway(
+        self,
+        gateway: Gateway,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously update an existing gateway.
 
         :param gateway_name: Name of the gateway to update.
         :param gateway: Gateway object containing updated gateway details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_gateway_name(gateway.name)
         response = await self._send_request_async(
-            HttpMethod.PUT, gateway=gateway.name, data=gateway.dict()
+            HttpMethod.PUT,
+            GATEWAY,
+            {"name": gateway.name},
+            data=gateway.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_gateway_response_ok(response)
+        result = self._parse_text(GATEWAY, response)
+        self._invalidate_metadata("gateway", gateway.name)
+        return result
 
     # list gateways
-    def list_gateways(self) -> Gateways:
+    def list_gateways(
+        self,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Gateways:
         """
         Retrieve a list of all gateways.
 
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Gateways object containing a list of all gateways, or an empty list if an error occurs or no gateways are found.
         """
-        response = self._send_request_sync(HttpMethod.GET, gateway="###", provider="", route="")
-
-        try:
-            # Attempt to parse the response as JSON
-            response_json = response.json()
-            # Check if there's an error in the JSON response
-            if 'error' in response_json:
-                # print("Error:", response_json['error'])
-                return Gateways(gateways=[])  # Return an empty list of gateways if an error is found
-            else:
-                return Gateways(gateways=response_json)  # Return the list of gateways
-        except ValueError:
-            # Handle cases where the response is not JSON (possibly a string)
-            # print("Response:", response.text)
-            return Gateways(gateways=[])  # Return an empty list of gateways for non-JSON responses
+        return self._get_metadata_sync(
+            ("gateway", None), GATEWAYS, timeout=timeout, deadline=deadline
+        )
 
     # async list gateways
-    async def alist_gateways(self) -> Gateways:
+    async def alist_gateways(
+        self,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Gateways:
         """
         Asynchronously retrieve a list of all gateways.
 
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Gateways object containing a list of all gateways, or an empty list if an error occurs or no gateways are found.
         """
-        response = await self._send_request_async(HttpMethod.GET, gateway="###", provider="", route="")
+        return await self._aget_metadata(
+            ("gateway", None), GATEWAYS, timeout=timeout, deadline=deadline
+        )
 
-        try:
-            # Attempt to parse the response as JSON
-            response_json = response.json()
-            # Check if there's an error in the JSON response
-            if 'error' in response_json:
-                # print("Error:", response_json['error'])
-                return Gateways(gateways=[])  # Return an empty list of gateways if an error is found
-            else:
-                return Gateways(gateways=response_json)  # Return the list of gateways
-        except ValueError:
-            # Handle cases where the response is not JSON (possibly a string)
-            # print("Response:", response.text)
-            return Gateways(gateways=[])  # Return an empty list of gateways for non-JSON responses
+    # iterate over gateways
+    def iter_gateways(self, page_size: Optional[int] = None) -> Iterator[Gateway]:
+        """
+        Iterate over all gateways, parsing the response as it is received
+        instead of loading the whole list in memory.
+
+        :param page_size: Number of gateways requested at a time, for gateways
+            supporting `limit` / `offset` pagination. None fetches them all in
+            a single request.
+        :return: Iterator of Gateway objects.
+        """
+        return self._iter_list_sync(GATEWAYS, page_size)
+
+    # async iterate over gateways
+    def aiter_gateways(self, page_size: Optional[int] = None) -> AsyncIterator[Gateway]:
+        """
+        Asynchronously iterate over all gateways, parsing the response as it is
+        received instead of loading the whole list in memory.
+
+        :param page_size: Number of gateways requested at a time, for gateways
+            supporting `limit` / `offset` pagination. None fetches them all in
+            a single request.
+        :return: Async iterator of Gateway objects.
+        """
+        return self._aiter_list(GATEWAYS, page_size)
 
     # delete a gateway
-    def delete_gateway(self, gateway_name: str) -> str:
+    def delete_gateway(
+        self,
+        gateway_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Delete a specific gateway.
 
         :param gateway_name: Name of the gateway to delete.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_gateway_name(gateway_name)
-        response = self._send_request_sync(HttpMethod.DELETE, gateway=gateway_name)
-        return self._process_gateway_response_ok(response)
+        response = self._send_request_sync(
+            HttpMethod.DELETE, GATEWAY, {"name": gateway_name}, timeout=timeout, deadline=deadline
+        )
+        result = self._parse_text(GATEWAY, response)
+        self._invalidate_metadata("gateway", gateway_name)
+        return result
 
     # async delete a gateway
-    async def adelete_gateway(self, gateway_name: str) -> str:
+    async def adelete_gateway(
+        self,
+        gateway_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously delete a specific gateway.
 
         :param gateway_name: Name of the provider to delete.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_gateway_name(gateway_name)
-        response = await self._send_request_async(HttpMethod.DELETE, gateway=gateway_name)
-        return self._process_gateway_response_ok(response)
+        response = await self._send_request_async(
+            HttpMethod.DELETE, GATEWAY, {"name": gateway_name}, timeout=timeout, deadline=deadline
+        )
+        result = self._parse_text(GATEWAY, response)
+        self._invalidate_metadata("gateway", gateway_name)
+        return result
 
     @staticmethod
     def _validate_gateway_name(gateway_name: str):
@@ -916,164 +2356,271 @@ class JavelinClient:
         if not gateway_name:
             raise ValueError("Gateway name cannot be empty.")
         
-    def get_provider(self, provider_name: str) -> Provider:
+    def get_provider(
+        self,
+        provider_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Provider:
         """
         Retrieve details of a specific provider.
 
         :param provider_name: Name of the provider to retrieve.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response object containing provider details.
         """
         self._validate_provider_name(provider_name)
-        response = self._send_request_sync(HttpMethod.GET, provider=provider_name)
-        return self._process_response_provider(response)
+        return self._get_metadata_sync(
+            ("provider", provider_name),
+            PROVIDER,
+            {"name": provider_name},
+            timeout=timeout,
+            deadline=deadline,
+        )
 
-    async def aget_provider(self, provider_name: str) -> Provider:
+    async def aget_provider(
+        self,
+        provider_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Provider:
         """
         Asynchronously retrieve details of a specific provider.
 
         :param provider_name: Name of the provider to retrieve.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response object containing provider details.
         """
         self._validate_provider_name(provider_name)
-        response = await self._send_request_async(HttpMethod.GET, provider=provider_name)
-        return self._process_response_provider(response)
-
-    def _process_response_provider(self, response: httpx.Response) -> Provider:
-        """
-        Process a successful response from the Javelin API.
-        Parse body into a Provider object and return it.
-        This is for Get() requests.
-        """
-        self._handle_provider_response(response)
-        return Provider(**response.json())
+        return await self._aget_metadata(
+            ("provider", provider_name),
+            PROVIDER,
+            {"name": provider_name},
+            timeout=timeout,
+            deadline=deadline,
+        )
 
     # create a provider
-    def create_provider(self, provider: Provider) -> str:
+    def create_provider(
+        self,
+        provider: Provider,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Create a new provider.
 
         :param provider: Provider object containing provider details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_provider_name(provider.name)
         response = self._send_request_sync(
-            HttpMethod.POST, provider=provider.name, data=provider.dict()
+            HttpMethod.POST,
+            PROVIDER,
+            {"name": provider.name},
+            data=provider.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_provider_response_ok(response)
+        result = self._parse_text(PROVIDER, response)
+        self._invalidate_metadata("provider", provider.name)
+        return result
 
     # async create a provider
-    async def acreate_provider(self, provider: Provider) -> str:
+    async def acreate_provider(
+        self,
+        provider: Provider,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously create a new provider.
 
         :param provider: Provider object containing provider details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_provider_name(provider.name)
         response = await self._send_request_async(
-            HttpMethod.POST, provider=provider.name, data=provider.dict()
+            HttpMethod.POST,
+            PROVIDER,
+            {"name": provider.name},
+            data=provider.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_provider_response_ok(response)
+        result = self._parse_text(PROVIDER, response)
+        self._invalidate_metadata("provider", provider.name)
+        return result
 
     # update a provider
-    def update_provider(self, provider: Provider) -> str:
+    def update_provider(
+        self,
+        provider: Provider,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Update an existing provider.
 
         :param provider_name: Name of the provider to update.
         :param provider: Provider object containing updated provider details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_provider_name(provider.name)
         response = self._send_request_sync(
-            HttpMethod.PUT, provider=provider.name, data=provider.dict()
+            HttpMethod.PUT,
+            PROVIDER,
+            {"name": provider.name},
+            data=provider.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_provider_response_ok(response)
+        result = self._parse_text(PROVIDER, response)
+        self._invalidate_metadata("provider", provider.name)
+        return result
 
     # async update a provider
-    async def update_provider(self, provider: Provider) -> str:
+    async def aupdate_provider(
+        self,
+        provider: Provider,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously update an existing provider.
 
         :param provider_name: Name of the provider to update.
         :param provider: Provider object containing updated provider details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_provider_name(provider.name)
         response = await self._send_request_async(
-            HttpMethod.PUT, provider=provider.name, data=provider.dict()
+            HttpMethod.PUT,
+            PROVIDER,
+            {"name": provider.name},
+            data=provider.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_provider_response_ok(response)
+        result = self._parse_text(PROVIDER, response)
+        self._invalidate_metadata("provider", provider.name)
+        return result
 
     # list providers
-    def list_providers(self) -> Providers:
+    def list_providers(
+        self,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Providers:
         """
         Retrieve a list of all providers.
 
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Providers object containing a list of all providers.
         """
-        response = self._send_request_sync(HttpMethod.GET, gateway="", provider="###", route="")
-
-        # Attempt to parse the response as JSON
-        try:
-            response_json = response.json()
-            # Check if there's an error in the JSON response
-            if 'error' in response_json:
-                # print("Error:", response_json['error'])
-                return Providers(providers=[])  # Return an empty list of providers if an error is found
-            else:
-                return Providers(providers=response_json)  # Return the list of providers
-        except ValueError:
-            # Handle cases where the response is not JSON (possibly a string)
-            # print("Response:", response.text)
-            return Providers(providers=[])  # Return an empty list of providers for non-JSON responses
+        return self._get_metadata_sync(
+            ("provider", None), PROVIDERS, timeout=timeout, deadline=deadline
+        )
     
     # async list providers
-    async def alist_providers(self) -> Providers:
+    async def alist_providers(
+        self,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Providers:
         """
         Asynchronously retrieve a list of all providers.
 
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Providers object containing a list of all providers, or an empty list if an error occurs or no providers are found.
         """
-        response = await self._send_request_async(HttpMethod.GET, gateway="", provider="###", route="")
+        return await self._aget_metadata(
+            ("provider", None), PROVIDERS, timeout=timeout, deadline=deadline
+        )
 
-        try:
-            # Attempt to parse the response as JSON
-            response_json = response.json()
-            # Check if there's an error in the JSON response
-            if 'error' in response_json:
-                # print("Error:", response_json['error'])
-                return Providers(providers=[])  # Return an empty list of providers if an error is found
-            else:
-                return Providers(providers=response_json)  # Return the list of providers
-        except ValueError:
-            # Handle cases where the response is not JSON (possibly a string)
-            # print("Response:", response.text)
-            return Providers(providers=[])  # Return an empty list of providers for non-JSON responses
+    # iterate over providers
+    def iter_providers(self, page_size: Optional[int] = None) -> Iterator[Provider]:
+        """
+        Iterate over all providers, parsing the response as it is received
+        instead of loading the whole list in memory.
+
+        :param page_size: Number of providers requested at a time, for gateways
+            supporting `limit` / `offset` pagination. None fetches them all in
+            a single request.
+        :return: Iterator of Provider objects.
+        """
+        return self._iter_list_sync(PROVIDERS, page_size)
+
+    # async iterate over providers
+    def aiter_providers(self, page_size: Optional[int] = None) -> AsyncIterator[Provider]:
+        """
+        Asynchronously iterate over all providers, parsing the response as it is
+        received instead of loading the whole list in memory.
+
+        :param page_size: Number of providers requested at a time, for gateways
+            supporting `limit` / `offset` pagination. None fetches them all in
+            a single request.
+        :return: Async iterator of Provider objects.
+        """
+        return self._aiter_list(PROVIDERS, page_size)
 
     # delete a provider
-    def delete_provider(self, provider_name: str) -> str:
+    def delete_provider(
+        self,
+        provider_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Delete a specific provider.
 
         :param provider_name: Name of the provider to delete.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_provider_name(provider_name)
-        response = self._send_request_sync(HttpMethod.DELETE, provider=provider_name)
-        return self._process_provider_response_ok(response)
+        response = self._send_request_sync(
+            HttpMethod.DELETE, PROVIDER, {"name": provider_name}, timeout=timeout, deadline=deadline
+        )
+        result = self._parse_text(PROVIDER, response)
+        self._invalidate_metadata("provider", provider_name)
+        return result
 
     # async delete a provider
-    async def adelete_provider(self, provider_name: str) -> str:
+    async def adelete_provider(
+        self,
+        provider_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously delete a specific provider.
 
         :param provider_name: Name of the provider to delete.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_provider_name(provider_name)
-        response = await self._send_request_async(HttpMethod.DELETE, provider=provider_name)
-        return self._process_provider_response_ok(response)
+        response = await self._send_request_async(
+            HttpMethod.DELETE, PROVIDER, {"name": provider_name}, timeout=timeout, deadline=deadline
+        )
+        result = self._parse_text(PROVIDER, response)
+        self._invalidate_metadata("provider", provider_name)
+        return result
 
     @staticmethod
     def _validate_provider_name(provider_name: str):
@@ -1085,214 +2632,315 @@ class JavelinClient:
         if not provider_name:
             raise ValueError("Provider name cannot be empty.")
         
-    def get_secret(self, secret_name: str) -> Secret:
+    def get_secret(
+        self,
+        secret_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Secret:
         """
         Retrieve details of a specific secret.
 
         :param secret_name: Name of the secret to retrieve.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response object containing secret details.
         """
         self._validate_secret_name(secret_name)
-        response = self._send_request_sync(HttpMethod.GET, secret=secret_name)
-        return self._process_response_secret(response)
+        response = self._send_request_sync(
+            HttpMethod.GET,
+            SECRET,
+            {"provider": "", "name": secret_name},
+            timeout=timeout,
+            deadline=deadline,
+        )
+        return self._parse_model(SECRET, response)
 
-    async def aget_secret(self, secret_name: str) -> Secret:
+    async def aget_secret(
+        self,
+        secret_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Secret:
         """
         Asynchronously retrieve details of a specific secret.
 
         :param secret_name: Name of the secret to retrieve.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response object containing secret details.
         """
         self._validate_secret_name(secret_name)
-        response = await self._send_request_async(HttpMethod.GET, secret=secret_name)
-        return self._process_response_secret(response)
-
-    def _process_response_secret(self, response: httpx.Response) -> Secret:
-        """
-        Process a successful response from the Javelin API.
-        Parse body into a Secret object and return it.
-        This is for Get() requests.
-        """
-        self._handle_secret_response(response)
-        return Secret(**response.json())
+        response = await self._send_request_async(
+            HttpMethod.GET,
+            SECRET,
+            {"provider": "", "name": secret_name},
+            timeout=timeout,
+            deadline=deadline,
+        )
+        return self._parse_model(SECRET, response)
 
     # create a secret
-    def create_secret(self, secret: Secret) -> str:
+    def create_secret(
+        self,
+        secret: Secret,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Create a new secret.
 
         :param secret: Secret object containing secret details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_secret_name(secret.api_key)
         response = self._send_request_sync(
-            HttpMethod.POST, provider=secret.provider_name, secret=secret.api_key, data=secret.dict()
+            HttpMethod.POST,
+            SECRET,
+            {"provider": secret.provider_name, "name": secret.api_key},
+            data=secret.dict(), timeout=timeout, deadline=deadline
         )
-        return self._process_secret_response_ok(response)
+        return self._parse_text(SECRET, response)
 
     # async create a secret
-    async def acreate_secret(self, secret: Secret) -> str:
+    async def acreate_secret(
+        self,
+        secret: Secret,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously create a new secret.
 
         :param secret: Secret object containing secret details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_secret_name(secret.api_key)
         response = await self._send_request_async(
-            HttpMethod.POST, provider=secret.provider_name, secret=secret.api_key, data=secret.dict()
+            HttpMethod.POST,
+            SECRET,
+            {"provider": secret.provider_name, "name": secret.api_key},
+            data=secret.dict(), timeout=timeout, deadline=deadline
         )
-        return self._process_secret_response_ok(response)
+        return self._parse_text(SECRET, response)
 
     # update a secret
-    def update_secret(self, secret: Secret) -> str:
+    def update_secret(
+        self,
+        secret: Secret,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Update an existing secret.
 
         :param secret_name: Name of the secret to update.
         :param secret: Secret object containing updated secret details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_secret_name(secret.api_key)
         response = self._send_request_sync(
-            HttpMethod.PUT, provider=secret.provider_name, secret=secret.api_key, data=secret.dict()
+            HttpMethod.PUT,
+            SECRET,
+            {"provider": secret.provider_name, "name": secret.api_key},
+            data=secret.dict(), timeout=timeout, deadline=deadline
         )
-        return self._process_secret_response_ok(response)
+        return self._parse_text(SECRET, response)
 
     # async update a secret
-    async def update_secret(self, secret: Secret) -> str:
+    async def aupdate_secret(
+        self,
+        secret: Secret,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously update an existing secret.
 
         :param secret_name: Name of the secret to update.
         :param secret: Secret object containing updated secret details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_secret_name(secret.api_key)
         response = await self._send_request_async(
-            HttpMethod.PUT, provider=secret.provider_name, secret=secret.api_key, data=secret.dict()
+            HttpMethod.PUT,
+            SECRET,
+            {"provider": secret.provider_name, "name": secret.api_key},
+            data=secret.dict(), timeout=timeout, deadline=deadline
         )
-        return self._process_secret_response_ok(response)
+        return self._parse_text(SECRET, response)
 
     # list all secrets
-    def list_secrets(self) -> Secrets:
+    def list_secrets(
+        self,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Secrets:
         """
         Retrieve a list of all secrets.
 
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Secrets object containing a list of all secrets, or an empty list if an error occurs or no secrets are found.
         """
-        response = self._send_request_sync(HttpMethod.GET, gateway="", provider="###", route="", secret="###")
-
-        try:
-            # Attempt to parse the response as JSON
-            response_json = response.json()
-            # Check if there's an error in the JSON response
-            if 'error' in response_json:
-                # print("Error:", response_json['error'])
-                return Secrets(secrets=[])  # Return an empty list of secrets if an error is found
-            else:
-                return Secrets(secrets=response_json)  # Return the list of secrets
-        except ValueError:
-            # Handle cases where the response is not JSON (possibly a string)
-            # print("Response:", response.text)
-            return Secrets(secrets=[])  # Return an empty list of secrets for non-JSON responses
+        response = self._send_request_sync(
+            HttpMethod.GET, SECRETS, timeout=timeout, deadline=deadline
+        )
+        return self._parse_list(SECRETS, response)
 
     # async list all secrets
-    async def alist_secrets(self) -> Secrets:
+    async def alist_secrets(
+        self,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Secrets:
         """
         Asynchronously retrieve a list of all secrets.
 
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Secrets object containing a list of all secrets, or an empty list if an error occurs or no secrets are found.
         """
-        response = await self._send_request_async(HttpMethod.GET, gateway="", provider="###", route="", secret="###")
+        response = await self._send_request_async(
+            HttpMethod.GET, SECRETS, timeout=timeout, deadline=deadline
+        )
+        return self._parse_list(SECRETS, response)
+
+    # iterate over secrets
+    def iter_secrets(self, page_size: Optional[int] = None) -> Iterator[Secret]:
+        """
+        Iterate over all secrets, parsing the response as it is received
+        instead of loading the whole list in memory.
 
-        try:
-            # Attempt to parse the response as JSON
-            response_json = response.json()
-            # Check if there's an error in the JSON response
-            if 'error' in response_json:
-                # print("Error:", response_json['error'])
-                return Secrets(secrets=[])  # Return an empty list of secrets if an error is found
-            else:
-                return Secrets(secrets=response_json)  # Return the list of secrets
-        except ValueError:
-            # Handle cases where the response is not JSON (possibly a string)
-            # print("Response:", response.text)
-            return Secrets(secrets=[])  # Return an empty list of secrets for non-JSON responses
+        :param page_size: Number of secrets requested at a time, for gateways
+            supporting `limit` / `offset` pagination. None fetches them all in
+            a single request.
+        :return: Iterator of Secret objects.
+        """
+        return self._iter_list_sync(SECRETS, page_size)
+
+    # async iterate over secrets
+    def aiter_secrets(self, page_size: Optional[int] = None) -> AsyncIterator[Secret]:
+        """
+        Asynchronously iterate over all secrets, parsing the response as it is
+        received instead of loading the whole list in memory.
+
+        :param page_size: Number of secrets requested at a time, for gateways
+            supporting `limit` / `offset` pagination. None fetches them all in
+            a single request.
+        :return: Async iterator of Secret objects.
+        """
+        return self._aiter_list(SECRETS, page_size)
 
     # list all secrets of a provider
-    def list_provider_secrets(self, provider_name: str) -> Secrets:
+    def list_provider_secrets(
+        self,
+        provider_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Secrets:
         """
         Retrieve a list of all secrets of a provider.
 
         :param provider_name: Name of the provider.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Secrets object containing a list of all secrets, or an empty list if an error occurs or no secrets are found.
         """
-        response = self._send_request_sync(HttpMethod.GET, gateway="", provider=provider_name, route="", secret="###")
-
-        try:
-            # Attempt to parse the response as JSON
-            response_json = response.json()
-            # Check if there's an error in the JSON response
-            if 'error' in response_json:
-                # print(f"Error retrieving secrets for provider {provider_name}: {response_json['error']}")
-                return Secrets(secrets=[])  # Return an empty list of secrets if an error is found
-            else:
-                return Secrets(secrets=response_json)  # Return the list of secrets
-        except ValueError:
-            # Handle cases where the response is not JSON (possibly a string)
-            # print(f"Response from provider {provider_name}:", response.text)
-            return Secrets(secrets=[])  # Return an empty list of secrets for non-JSON responses
+        response = self._send_request_sync(
+            HttpMethod.GET,
+            PROVIDER_SECRETS,
+            {"provider": provider_name},
+            timeout=timeout,
+            deadline=deadline,
+        )
+        return self._parse_list(PROVIDER_SECRETS, response)
 
     # async list all secrets of a provider
-    async def alist_provider_secrets(self, provider_name: str) -> Secrets:
+    async def alist_provider_secrets(
+        self,
+        provider_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Secrets:
         """
         Asynchronously retrieve a list of all secrets of a provider.
 
         :param provider_name: Name of the provider.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Secrets object containing a list of all secrets, or an empty list if an error occurs or no secrets are found.
         """
-        response = await self._send_request_async(HttpMethod.GET, gateway="", provider=provider_name, route="", secret="###")
-
-        try:
-            # Attempt to parse the response as JSON
-            response_json = response.json()
-            # Check if there's an error in the JSON response
-            if 'error' in response_json:
-                # print(f"Error retrieving secrets for provider {provider_name}: {response_json['error']}")
-                return Secrets(secrets=[])  # Return an empty list of secrets if an error is found
-            else:
-                return Secrets(secrets=response_json)  # Return the list of secrets
-        except ValueError:
-            # Handle cases where the response is not JSON (possibly a string)
-            # print(f"Response from provider {provider_name}:", response.text)
-            return Secrets(secrets=[])  # Return an empty list of secrets for non-JSON responses
+        response = await self._send_request_async(
+            HttpMethod.GET,
+            PROVIDER_SECRETS,
+            {"provider": provider_name},
+            timeout=timeout,
+            deadline=deadline,
+        )
+        return self._parse_list(PROVIDER_SECRETS, response)
 
     # delete a secret
-    def delete_secret(self, provider_name: str, secret_name: str) -> str:
+    def delete_secret(
+        self,
+        provider_name: str,
+        secret_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Delete a specific secret.
 
         :param provider_name: Name of the provider secret to delete.
         :param secret_name: Name of the secret to delete.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_secret_name(secret_name)
-        response = self._send_request_sync(HttpMethod.DELETE, provider=provider_name, secret=secret_name)
-        return self._process_provider_response_ok(response)
+        response = self._send_request_sync(
+            HttpMethod.DELETE,
+            SECRET,
+            {"provider": provider_name, "name": secret_name},
+            timeout=timeout,
+            deadline=deadline,
+        )
+        return self._parse_text(SECRET, response)
 
     # async delete a secret
-    async def adelete_secret(self, provider_name: str, secret_name: str) -> str:
+    async def adelete_secret(
+        self,
+        provider_name: str,
+        secret_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously delete a specific secret.
 
         :param provider_name: Name of the provider secret to delete.
         :param secret_name: Name of the secret to delete.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_secret_name(secret_name)
-        response = await self._send_request_async(HttpMethod.DELETE, provider=provider_name, secret=secret_name)
-        return self._process_provider_response_ok(response)
+        response = await self._send_request_async(
+            HttpMethod.DELETE,
+            SECRET,
+            {"provider": provider_name, "name": secret_name},
+            timeout=timeout,
+            deadline=deadline,
+        )
+        return self._parse_text(SECRET, response)
 
     @staticmethod
     def _validate_secret_name(secret_name: str):
@@ -1304,162 +2952,269 @@ class JavelinClient:
         if not secret_name:
             raise ValueError("Secret name cannot be empty.")
 
-    def get_template(self, template_name: str) -> Template:
+    def get_template(
+        self,
+        template_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Template:
         """
         Retrieve details of a specific template.
 
         :param template_name: Name of the template to retrieve.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response object containing template details.
         """
         self._validate_template_name(template_name)
-        response = self._send_request_sync(HttpMethod.GET, template=template_name)
-        return self._process_response_template(response)
+        return self._get_metadata_sync(
+            ("template", template_name),
+            TEMPLATE,
+            {"name": template_name},
+            timeout=timeout,
+            deadline=deadline,
+        )
 
-    async def aget_template(self, template_name: str) -> Template:
+    async def aget_template(
+        self,
+        template_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Template:
         """
         Asynchronously retrieve details of a specific template.
 
         :param template_name: Name of the template to retrieve.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response object containing template details.
         """
         self._validate_template_name(template_name)
-        response = await self._send_request_async(HttpMethod.GET, template=template_name)
-        return self._process_response_template(response)
-
-    def _process_response_template(self, response: httpx.Response) -> Template:
-        """
-        Process a successful response from the Javelin API.
-        Parse body into a Template object and return it.
-        This is for Get() requests.
-        """
-        self._handle_template_response(response)
-        return Template(**response.json())
+        return await self._aget_metadata(
+            ("template", template_name),
+            TEMPLATE,
+            {"name": template_name},
+            timeout=timeout,
+            deadline=deadline,
+        )
 
     # create a template
-    def create_template(self, template: Template) -> str:
+    def create_template(
+        self,
+        template: Template,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Create a new template.
 
         :param template: Template object containing template details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_template_name(template.name)
         response = self._send_request_sync(
-            HttpMethod.POST, template=template.name, data=template.dict()
+            HttpMethod.POST,
+            TEMPLATE,
+            {"name": template.name},
+            data=template.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_template_response_ok(response)
+        result = self._parse_text(TEMPLATE, response)
+        self._invalidate_metadata("template", template.name)
+        return result
 
     # async create a template
-    async def acreate_template(self, template: Template) -> str:
+    async def acreate_template(
+        self,
+        template: Template,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously create a new template.
 
         :param secret: Template object containing template details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_template_name(template.name)
         response = await self._send_request_async(
-            HttpMethod.POST, template=template.name, data=template.dict()
+            HttpMethod.POST,
+            TEMPLATE,
+            {"name": template.name},
+            data=template.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_template_response_ok(response)
+        result = self._parse_text(TEMPLATE, response)
+        self._invalidate_metadata("template", template.name)
+        return result
 
     # update a template
-    def update_template(self, template: Template) -> str:
+    def update_template(
+        self,
+        template: Template,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Update an existing template.
 
         :param template: Secret object containing updated template details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_template_name(template.name)
         response = self._send_request_sync(
-            HttpMethod.PUT, template=template.name, data=template.dict()
+            HttpMethod.PUT,
+            TEMPLATE,
+            {"name": template.name},
+            data=template.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_template_response_ok(response)
+        result = self._parse_text(TEMPLATE, response)
+        self._invalidate_metadata("template", template.name)
+        return result
 
     # async update a template
-    async def update_template(self, template: Template) -> str:
+    async def aupdate_template(
+        self,
+        template: Template,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously update an existing template.
 
         :param template: Secret object containing updated template details.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_template_name(template.name)
         response = await self._send_request_async(
-            HttpMethod.PUT, template=template.name, data=template.dict()
+            HttpMethod.PUT,
+            TEMPLATE,
+            {"name": template.name},
+            data=template.dict(),
+            timeout=timeout,
+            deadline=deadline,
         )
-        return self._process_template_response_ok(response)
+        result = self._parse_text(TEMPLATE, response)
+        self._invalidate_metadata("template", template.name)
+        return result
 
     # list all templates
-    def list_templates(self) -> Templates:
+    def list_templates(
+        self,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Templates:
         """
         Retrieve a list of all templates.
 
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Templates object containing a list of all templates, or an empty list if an error occurs or no templates are found.
         """
-        response = self._send_request_sync(HttpMethod.GET, template="###")
-
-        try:
-            # Attempt to parse the response as JSON
-            response_json = response.json()
-            # Check if there's an error in the JSON response
-            if 'error' in response_json:
-                # print("Error:", response_json['error'])
-                return Templates(templates=[])  # Return an empty list of templates if an error is found
-            else:
-                return Templates(templates=response_json)  # Return the list of templates
-        except ValueError:
-            # Handle cases where the response is not JSON (possibly a string)
-            # print("Response:", response.text)
-            return Templates(templates=[])  # Return an empty list of templates for non-JSON responses
+        return self._get_metadata_sync(
+            ("template", None), TEMPLATES, timeout=timeout, deadline=deadline
+        )
 
     # async list all templates
-    async def alist_templates(self) -> Templates:
+    async def alist_templates(
+        self,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> Templates:
         """
         Asynchronously retrieve a list of all templates.
 
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Templates object containing a list of all templates, or an empty list if an error occurs or no templates are found.
         """
-        response = await self._send_request_async(HttpMethod.GET, template="###")
+        return await self._aget_metadata(
+            ("template", None), TEMPLATES, timeout=timeout, deadline=deadline
+        )
 
-        try:
-            # Attempt to parse the response as JSON
-            response_json = response.json()
-            # Check if there's an error in the JSON response
-            if 'error' in response_json:
-                # print("Error:", response_json['error'])
-                return Templates(templates=[])  # Return an empty list of secrets if an error is found
-            else:
-                return Templates(templates=response_json)  # Return the list of secrets
-        except ValueError:
-            # Handle cases where the response is not JSON (possibly a string)
-            # print("Response:", response.text)
-            return Templates(templates=[])  # Return an empty list of secrets for non-JSON responses
+    # iterate over templates
+    def iter_templates(self, page_size: Optional[int] = None) -> Iterator[Template]:
+        """
+        Iterate over all templates, parsing the response as it is received
+        instead of loading the whole list in memory.
+
+        :param page_size: Number of templates requested at a time, for gateways
+            supporting `limit` / `offset` pagination. None fetches them all in
+            a single request.
+        :return: Iterator of Template objects.
+        """
+        return self._iter_list_sync(TEMPLATES, page_size)
+
+    # async iterate over templates
+    def aiter_templates(self, page_size: Optional[int] = None) -> AsyncIterator[Template]:
+        """
+        Asynchronously iterate over all templates, parsing the response as it is
+        received instead of loading the whole list in memory.
+
+        :param page_size: Number of templates requested at a time, for gateways
+            supporting `limit` / `offset` pagination. None fetches them all in
+            a single request.
+        :return: Async iterator of Template objects.
+        """
+        return self._aiter_list(TEMPLATES, page_size)
 
     # delete a template
-    def delete_secret(self, template_name: str) -> str:
+    def delete_template(
+        self,
+        template_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Delete a specific template.
 
         :param template_name: Name of the template to delete.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_template_name(template_name)
-        response = self._send_request_sync(HttpMethod.DELETE, template=template_name)
-        return self._process_template_response_ok(response)
+        response = self._send_request_sync(
+            HttpMethod.DELETE, TEMPLATE, {"name": template_name}, timeout=timeout, deadline=deadline
+        )
+        result = self._parse_text(TEMPLATE, response)
+        self._invalidate_metadata("template", template_name)
+        return result
 
     # async delete a template
-    async def adelete_secret(self, template_name: str) -> str:
+    async def adelete_template(
+        self,
+        template_name: str,
+        timeout: Optional[TimeoutTypes] = None,
+        deadline: Union[float, Deadline, None] = None,
+    ) -> str:
         """
         Asynchronously delete a specific template.
 
         :param template_name: Name of the template to delete.
+        :param timeout: Timeout of each request. See query_route.
+        :param deadline: Deadline of the call. See query_route.
         :return: Response text indicating the success status (e.g., "OK").
         """
         self._validate_template_name(template_name)
-        response = await self._send_request_async(HttpMethod.DELETE, template=template_name)
-        return self._process_template_response_ok(response)
+        response = await self._send_request_async(
+            HttpMethod.DELETE, TEMPLATE, {"name": template_name}, timeout=timeout, deadline=deadline
+        )
+        result = self._parse_text(TEMPLATE, response)
+        self._invalidate_metadata("template", template_name)
+        return result
 
     @staticmethod
     def _validate_template_name(template_name: str):
@@ -1469,4 +3224,46 @@ class JavelinClient:
         :param template_name: Name of the template to validate.
         """
         if not template_name:
-            raise ValueError("Template name cannot be empty.")
\ No newline at end of file
+            raise ValueError("Template name cannot be empty.")
+
+    # reconcile the gateway with a manifest
+    def apply_manifest(
+        self, manifest: Manifest, concurrency: int = 16, dry_run: bool = False
+    ) -> SyncResult:
+        """
+        Bring gateways, providers, templates, secrets and routes to the state
+        described by a manifest.
+
+        The current state is listed concurrently from the gateway, bypassing
+        the metadata cache, and diffed against the manifest: missing resources
+        are created, resources whose fields set in the manifest differ are
+        updated and the others are left alone. Secret values are masked by the
+        gateway and left out of the diff. Resources absent from the manifest
+        are not deleted. Changes are applied in dependency order (providers
+        and templates, then secrets, then routes), in parallel within each
+        level, and the next levels are skipped when a change fails.
+
+        :param manifest: Desired state, e.g. from Manifest.from_file.
+        :param concurrency: Maximum number of changes applied in parallel.
+        :param dry_run: Only compute the changes, without applying them.
+        :return: SyncResult listing the change made to each resource.
+
+        :raises JavelinClientError: If the current state could not be listed,
+            e.g. on a 401 or 5xx error. Nothing is applied then.
+        """
+        return apply_manifest(self, manifest, concurrency, dry_run)
+
+    # async reconcile the gateway with a manifest
+    async def aapply_manifest(
+        self, manifest: Manifest, concurrency: int = 16, dry_run: bool = False
+    ) -> SyncResult:
+        """
+        Asynchronously bring gateways, providers, templates, secrets and routes
+        to the state described by a manifest. See `apply_manifest`.
+
+        :param manifest: Desired state, e.g. from Manifest.from_file.
+        :param concurrency: Maximum number of changes applied in parallel.
+        :param dry_run: Only compute the changes, without applying them.
+        :return: SyncResult listing the change made to each resource.
+        """
+        return await aapply_manifest(self, manifest, concurrency, dry_run)
@@ -0,0 +1,88 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class JSONCodec(ABC):
+    """
+    Encoder and decoder of the JSON bodies exchanged with the gateway.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encode an object as compact UTF-8 JSON.
+        """
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decode a JSON document.
+        """
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class StdlibJSONCodec(JSONCodec):
+    """
+    Codec using the standard library json module.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    Codec using orjson, several times faster than the standard library.
+    Requires the `orjson` package.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson (`pip install javelin_sdk[orjson]`).")
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+_CODECS = {
+    StdlibJSONCodec.name: StdlibJSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+
+def get_codec(codec: Union[str, JSONCodec, None] = None) -> JSONCodec:
+    """
+    Resolve the codec setting of a JavelinClient.
+
+    :param codec: A JSONCodec, the name of one ("orjson" or "json"), or None
+        for orjson when it is installed and the standard library otherwise.
+    :return: The JSONCodec to use.
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        return OrjsonCodec() if orjson is not None else StdlibJSONCodec()
+    try:
+        return _CODECS[codec]()
+    except KeyError:
+        raise ValueError(f"Unknown JSON codec: {codec}")
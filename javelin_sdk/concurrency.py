@@ -0,0 +1,431 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Callable, Deque, Dict, Iterator, Optional
+
+import httpx
+
+from javelin_sdk.deadline import Deadline
+from javelin_sdk.exceptions import (
+    ConcurrencyLimitExceededError,
+    DeadlineExceededError,
+    RateLimitExceededError,
+)
+
+
+def is_overload(error: BaseException) -> bool:
+    """
+    Whether an error signals that the route is overloaded, cutting its
+    concurrency limit: the gateway rejected the call with 429, or it timed
+    out or ran out of its deadline.
+    """
+    return isinstance(
+        error, (RateLimitExceededError, DeadlineExceededError, httpx.TimeoutException)
+    )
+
+
+class ConcurrencySlot:
+    """
+    Slot held by a call guarded by an AdaptiveConcurrencyLimiter. Setting
+    `overloaded` cuts the limit although the call succeeded, e.g. after
+    429 responses absorbed by retries.
+    """
+
+    __slots__ = ("overloaded",)
+
+    def __init__(self) -> None:
+        self.overloaded = False
+
+
+class ConcurrencyMetrics:
+    """
+    Snapshot of an AdaptiveConcurrencyLimiter.
+
+    `limit` is the current concurrency limit, `in_flight` the calls holding a
+    slot and `queue_depth` the calls waiting for one. `rejected` counts the
+    calls turned away because the queue was full or the wait too long,
+    `drops` the limit cuts caused by overload errors and `latency_cuts` those
+    caused by latency inflation.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        in_flight: int,
+        queue_depth: int,
+        acquired: int,
+        rejected: int,
+        drops: int,
+        latency_cuts: int,
+    ) -> None:
+        self.limit = limit
+        self.in_flight = in_flight
+        self.queue_depth = queue_depth
+        self.acquired = acquired
+        self.rejected = rejected
+        self.drops = drops
+        self.latency_cuts = latency_cuts
+
+    def __repr__(self) -> str:
+        return (
+            f"ConcurrencyMetrics(limit={self.limit}, in_flight={self.in_flight}, "
+            f"queue_depth={self.queue_depth}, acquired={self.acquired}, "
+            f"rejected={self.rejected}, drops={self.drops}, latency_cuts={self.latency_cuts})"
+        )
+
+
+class _Waiter:
+    __slots__ = ("event", "future", "loop", "granted", "generation")
+
+    def __init__(
+        self,
+        event: Optional[threading.Event] = None,
+        future: Optional["asyncio.Future[None]"] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> None:
+        self.event = event
+        self.future = future
+        self.loop = loop
+        self.granted = False
+        self.generation = 0
+
+
+def _wake(future: "asyncio.Future[None]") -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit adapting to what a route can sustain (AIMD).
+
+    While calls succeed at a healthy latency, the limit grows by one slot
+    per limit's worth of calls. It is cut by `backoff_ratio` when a call
+    fails with an overload error (429, timeout, deadline), succeeds after
+    retrying 429 responses, or when latency inflates,
+    i.e. the short-term average latency exceeds `latency_tolerance` times the
+    long-term average. The limit is cut at most once per generation of calls,
+    so a burst of failures from calls admitted together counts once, and
+    after a latency cut only once `short_window` more calls were observed.
+
+    Calls over the limit wait in a FIFO queue of at most `max_queue` calls for
+    at most `queue_timeout` seconds, and are rejected with
+    ConcurrencyLimitExceededError beyond that. The same limiter can be used
+    from threads and coroutines.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: Optional[float] = 2.0,
+        short_window: int = 10,
+        long_window: int = 100,
+        max_queue: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        is_overload: Callable[[BaseException], bool] = is_overload,
+    ) -> None:
+        """
+        Initialize the AdaptiveConcurrencyLimiter.
+
+        :param name: Name of the route, for metrics.
+        :param initial_limit: Concurrency limit to start from.
+        :param min_limit: Lowest concurrency limit.
+        :param max_limit: Highest concurrency limit.
+        :param backoff_ratio: Factor applied to the limit when it is cut.
+        :param latency_tolerance: Ratio of the short-term to the long-term
+            average latency beyond which the limit is cut, None to only react
+            to errors.
+        :param short_window: Number of calls the short-term average latency
+            is taken over.
+        :param long_window: Number of calls the long-term average latency is
+            taken over.
+        :param max_queue: Maximum number of calls waiting for a slot, None for
+            no limit.
+        :param queue_timeout: Seconds a call waits for a slot, None to wait
+            until one frees up.
+        :param is_overload: Decides whether an error cuts the limit.
+        """
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.short_window = short_window
+        self.long_window = long_window
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.is_overload = is_overload
+        self._limit = float(min(max_limit, max(min_limit, initial_limit)))
+        self._in_flight = 0
+        self._waiters: Deque[_Waiter] = deque()
+        self._generation = 0
+        self._short_latency: Optional[float] = None
+        self._long_latency: Optional[float] = None
+        # Calls observed since the last latency cut
+        self._samples = 0
+        self._acquired = 0
+        self._rejected = 0
+        self._drops = 0
+        self._latency_cuts = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self._limit))
+
+    def metrics(self) -> ConcurrencyMetrics:
+        with self._lock:
+            return ConcurrencyMetrics(
+                self.limit,
+                self._in_flight,
+                len(self._waiters),
+                self._acquired,
+                self._rejected,
+                self._drops,
+                self._latency_cuts,
+            )
+
+    def _admit(self, waiter: _Waiter) -> bool:
+        """
+        Take a slot if one is free and nobody is queued, or queue the waiter.
+        Called with the lock held.
+
+        :raises ConcurrencyLimitExceededError: If the queue is full.
+        """
+        if not self._waiters and self._in_flight < self.limit:
+            self._in_flight += 1
+            self._acquired += 1
+            waiter.granted = True
+            waiter.generation = self._generation
+            return True
+        if self.max_queue is not None and len(self._waiters) >= self.max_queue:
+            self._rejected += 1
+            raise ConcurrencyLimitExceededError()
+        self._waiters.append(waiter)
+        return False
+
+    def _grant(self) -> None:
+        """
+        Hand the free slots to the queued waiters. Called with the lock held.
+        """
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if waiter.future is not None:
+                try:
+                    waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+                except RuntimeError:
+                    # The loop of the waiter was closed
+                    continue
+            else:
+                waiter.event.set()
+            self._in_flight += 1
+            self._acquired += 1
+            waiter.granted = True
+            waiter.generation = self._generation
+
+    def _give_up(self, waiter: _Waiter, deadline: Optional[Deadline]) -> bool:
+        """
+        Leave the queue after waiting too long, unless a slot was granted
+        meanwhile.
+
+        :return: Whether a slot was granted.
+        :raises DeadlineExceededError: If the deadline of the call passed.
+        :raises ConcurrencyLimitExceededError: If the queue timeout passed.
+        """
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            self._rejected += 1
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceededError()
+        raise ConcurrencyLimitExceededError()
+
+    def _wait_timeout(self, deadline: Optional[Deadline]) -> Optional[float]:
+        if deadline is None:
+            return self.queue_timeout
+        if self.queue_timeout is None:
+            return deadline.remaining()
+        return min(self.queue_timeout, deadline.remaining())
+
+    def acquire(self, deadline: Optional[Deadline] = None) -> int:
+        """
+        Block until a slot is free.
+
+        :param deadline: Deadline of the call, bounding the wait.
+        :return: Generation of the slot, to pass to release.
+
+        :raises ConcurrencyLimitExceededError: If the queue is full or the
+            queue timeout passes first.
+        :raises DeadlineExceededError: If the deadline passes first.
+        """
+        waiter = _Waiter(event=threading.Event())
+        with self._lock:
+            if self._admit(waiter):
+                return waiter.generation
+        if not waiter.event.wait(self._wait_timeout(deadline)):
+            self._give_up(waiter, deadline)
+        return waiter.generation
+
+    async def aacquire(self, deadline: Optional[Deadline] = None) -> int:
+        """
+        Asynchronously wait until a slot is free. See acquire.
+        """
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(future=loop.create_future(), loop=loop)
+        with self._lock:
+            if self._admit(waiter):
+                return waiter.generation
+        try:
+            await asyncio.wait_for(waiter.future, self._wait_timeout(deadline))
+        except asyncio.TimeoutError:
+            self._give_up(waiter, deadline)
+        except BaseException:
+            with self._lock:
+                if waiter.granted:
+                    self._in_flight -= 1
+                    self._grant()
+                else:
+                    self._waiters.remove(waiter)
+            raise
+        return waiter.generation
+
+    def _cut(self, generation: int) -> bool:
+        """
+        Cut the limit, once per generation. Called with the lock held.
+        """
+        if generation != self._generation:
+            return False
+        self._limit = max(float(self.min_limit), self._limit * self.backoff_ratio)
+        self._generation += 1
+        return True
+
+    def _observe(self, latency: float) -> bool:
+        """
+        Update the average latencies. Called with the lock held.
+
+        :return: Whether the latency is inflated.
+        """
+        self._samples += 1
+        if self._short_latency is None:
+            self._short_latency = self._long_latency = latency
+            return False
+        self._short_latency += (latency - self._short_latency) * 2 / (self.short_window + 1)
+        self._long_latency += (latency - self._long_latency) * 2 / (self.long_window + 1)
+        return (
+            self.latency_tolerance is not None
+            and self._samples >= self.short_window
+            and self._short_latency > self.latency_tolerance * self._long_latency
+        )
+
+    def release(
+        self, generation: int, latency: Optional[float] = None, overloaded: bool = False
+    ) -> None:
+        """
+        Free a slot and adapt the limit to the outcome of the call.
+
+        :param generation: Generation returned by acquire.
+        :param latency: Seconds the call took if it succeeded.
+        :param overloaded: Whether the call failed with an overload error.
+        """
+        with self._lock:
+            self._in_flight -= 1
+            if overloaded:
+                if self._cut(generation):
+                    self._drops += 1
+            elif latency is not None:
+                if self._observe(latency):
+                    if self._cut(generation):
+                        self._latency_cuts += 1
+                        # Judge the new limit on calls made under it
+                        self._short_latency = self._long_latency
+                        self._samples = 0
+                elif (self._in_flight + 1) * 2 >= self.limit:
+                    # Only grow a limit that is being used
+                    self._limit = min(float(self.max_limit), self._limit + 1 / self._limit)
+            self._grant()
+
+    @contextmanager
+    def guard(self, deadline: Optional[Deadline] = None) -> Iterator[ConcurrencySlot]:
+        """
+        Hold a slot during a call and adapt the limit to its outcome.
+
+        :param deadline: Deadline of the call, bounding the wait for a slot.
+        :return: Context manager yielding the ConcurrencySlot of the call.
+        """
+        generation = self.acquire(deadline)
+        slot = ConcurrencySlot()
+        start = time.monotonic()
+        try:
+            yield slot
+        except Exception as e:
+            self.release(generation, overloaded=self.is_overload(e))
+            raise
+        except BaseException:
+            self.release(generation)
+            raise
+        else:
+            if slot.overloaded:
+                self.release(generation, overloaded=True)
+            else:
+                self.release(generation, latency=time.monotonic() - start)
+
+    @asynccontextmanager
+    async def aguard(self, deadline: Optional[Deadline] = None) -> AsyncIterator[ConcurrencySlot]:
+        """
+        Asynchronously hold a slot during a call. See guard.
+        """
+        generation = await self.aacquire(deadline)
+        slot = ConcurrencySlot()
+        start = time.monotonic()
+        try:
+            yield slot
+        except Exception as e:
+            self.release(generation, overloaded=self.is_overload(e))
+            raise
+        except BaseException:
+            self.release(generation)
+            raise
+        else:
+            if slot.overloaded:
+                self.release(generation, overloaded=True)
+            else:
+                self.release(generation, latency=time.monotonic() - start)
+
+
+class ConcurrencyLimiterRegistry:
+    """
+    Adaptive concurrency limiters keyed by route name, created on first use
+    with the arguments given to the registry. A registry can be shared by
+    several JavelinClient instances.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        """
+        Initialize the ConcurrencyLimiterRegistry.
+
+        :param kwargs: AdaptiveConcurrencyLimiter arguments used for every
+            route.
+        """
+        self._kwargs = kwargs
+        self._limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, route_name: str) -> AdaptiveConcurrencyLimiter:
+        with self._lock:
+            limiter = self._limiters.get(route_name)
+            if limiter is None:
+                limiter = AdaptiveConcurrencyLimiter(route_name, **self._kwargs)
+                self._limiters[route_name] = limiter
+            return limiter
+
+    def metrics(self) -> Dict[str, ConcurrencyMetrics]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.name: limiter.metrics() for limiter in limiters}
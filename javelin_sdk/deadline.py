@@ -0,0 +1,113 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple, Union
+
+import httpx
+
+# Header forwarding the milliseconds left before the deadline of a call, so
+# that the gateway does not keep working on, or falling back for, a request
+# the client has given up on
+DEADLINE_HEADER = "x-javelin-deadline-ms"
+
+TimeoutTypes = Union[float, httpx.Timeout]
+
+
+class Deadline:
+    """
+    Point in time by which a call must have completed.
+
+    The deadline of a call is shared by its retries and hedged requests, and
+    a Deadline can be passed to several calls, e.g. all the queries made to
+    serve one incoming request, so that together they stay within its budget.
+    """
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, seconds: float) -> None:
+        """
+        Initialize the Deadline.
+
+        :param seconds: Seconds from now until the deadline.
+        """
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """
+        Seconds left before the deadline, 0 once it has passed.
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def clamp(self, timeout: httpx.Timeout) -> httpx.Timeout:
+        """
+        Cap the connect, read, write and pool timeouts to the time left.
+        """
+        remaining = self.remaining()
+
+        def cap(value: Optional[float]) -> float:
+            return remaining if value is None else min(value, remaining)
+
+        return httpx.Timeout(
+            connect=cap(timeout.connect),
+            read=cap(timeout.read),
+            write=cap(timeout.write),
+            pool=cap(timeout.pool),
+        )
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.3f})"
+
+
+def as_deadline(deadline: Union[float, Deadline, None]) -> Optional[Deadline]:
+    if deadline is None or isinstance(deadline, Deadline):
+        return deadline
+    return Deadline(deadline)
+
+
+def earliest(*deadlines: Optional[Deadline]) -> Optional[Deadline]:
+    candidates = [deadline for deadline in deadlines if deadline is not None]
+    return min(candidates, key=lambda deadline: deadline.expires_at, default=None)
+
+
+_SCOPE: ContextVar[Tuple[Optional[httpx.Timeout], Optional[Deadline]]] = ContextVar(
+    "javelin_timeouts", default=(None, None)
+)
+
+
+def current_timeouts() -> Tuple[Optional[httpx.Timeout], Optional[Deadline]]:
+    """
+    Timeout and deadline set by the innermost `timeouts()` block, if any.
+    """
+    return _SCOPE.get()
+
+
+@contextmanager
+def timeouts(
+    timeout: Optional[TimeoutTypes] = None,
+    deadline: Union[float, Deadline, None] = None,
+) -> Iterator[Optional[Deadline]]:
+    """
+    Apply a timeout and a deadline to the calls of JavelinClient made in the
+    block, including admin calls and the tasks it starts. A nested block
+    cannot extend the deadline of an enclosing one.
+
+    :param timeout: Timeout of each request, in seconds or as an
+        httpx.Timeout with separate connect, read, write and pool timeouts.
+        None keeps the enclosing or client timeout.
+    :param deadline: Seconds, or a Deadline, by which every call of the block
+        must have completed, retries included.
+    :return: Context manager yielding the deadline of the block.
+    """
+    outer_timeout, outer_deadline = _SCOPE.get()
+    scope_deadline = earliest(outer_deadline, as_deadline(deadline))
+    token = _SCOPE.set(
+        (httpx.Timeout(timeout) if timeout is not None else outer_timeout, scope_deadline)
+    )
+    try:
+        yield scope_deadline
+    finally:
+        _SCOPE.reset(token)
@@ -0,0 +1,178 @@
+import asyncio
+import ipaddress
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import httpcore
+import httpx
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+class DNSCache:
+    """
+    Cache of the addresses of the hosts a ConnectionPool connects to, so that
+    new connections to the gateway do not wait for a DNS lookup.
+
+    A host is resolved again once its entry is older than `ttl` seconds, or
+    after connections to all its cached addresses failed.
+    """
+
+    def __init__(self, ttl: float = 60.0) -> None:
+        """
+        Initialize the DNSCache.
+
+        :param ttl: Seconds resolved addresses are reused.
+        """
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, host: str, port: int) -> Optional[List[str]]:
+        with self._lock:
+            entry = self._entries.get((host, port))
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            return None
+        return entry[1]
+
+    def _store(self, host: str, port: int, infos: List[Tuple]) -> List[str]:
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[(host, port)] = (time.monotonic(), addresses)
+        return addresses
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """
+        Return the addresses of a host, looking them up if they are not cached.
+
+        :raises OSError: If the lookup fails.
+        """
+        addresses = self._lookup(host, port)
+        if addresses is None:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addresses = self._store(host, port, infos)
+        return addresses
+
+    async def aresolve(self, host: str, port: int) -> List[str]:
+        """
+        Asynchronously return the addresses of a host, looking them up if they
+        are not cached.
+
+        :raises OSError: If the lookup fails.
+        """
+        addresses = self._lookup(host, port)
+        if addresses is None:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                host, port, type=socket.SOCK_STREAM
+            )
+            addresses = self._store(host, port, infos)
+        return addresses
+
+    def invalidate(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_CONNECT_ERRORS = (httpcore.ConnectError, httpcore.ConnectTimeout)
+
+
+class DNSCachingBackend(httpcore.NetworkBackend):
+    """
+    httpcore network backend resolving hosts through a DNSCache, and trying
+    their addresses in turn until a connection succeeds.
+
+    Requests keep the host name in their URL, so that connections are pooled
+    per host and TLS checks the certificate against the host name.
+    """
+
+    def __init__(self, backend: httpcore.NetworkBackend, cache: DNSCache) -> None:
+        self._backend = backend
+        self._cache = cache
+
+    def connect_tcp(
+        self, host: str, port: int, timeout: Optional[float] = None, **kwargs: Any
+    ) -> httpcore.NetworkStream:
+        if _is_ip(host):
+            return self._backend.connect_tcp(host, port, timeout, **kwargs)
+        try:
+            addresses = self._cache.resolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        error: Exception = httpcore.ConnectError(f"No address found for {host}")
+        for address in addresses:
+            try:
+                return self._backend.connect_tcp(address, port, timeout, **kwargs)
+            except _CONNECT_ERRORS as e:
+                error = e
+        self._cache.invalidate(host, port)
+        raise error
+
+    def connect_unix_socket(self, *args: Any, **kwargs: Any) -> httpcore.NetworkStream:
+        return self._backend.connect_unix_socket(*args, **kwargs)
+
+    def sleep(self, seconds: float) -> None:
+        self._backend.sleep(seconds)
+
+
+class AsyncDNSCachingBackend(httpcore.AsyncNetworkBackend):
+    """
+    Async httpcore network backend resolving hosts through a DNSCache. See
+    DNSCachingBackend.
+    """
+
+    def __init__(self, backend: httpcore.AsyncNetworkBackend, cache: DNSCache) -> None:
+        self._backend = backend
+        self._cache = cache
+
+    async def connect_tcp(
+        self, host: str, port: int, timeout: Optional[float] = None, **kwargs: Any
+    ) -> httpcore.AsyncNetworkStream:
+        if _is_ip(host):
+            return await self._backend.connect_tcp(host, port, timeout, **kwargs)
+        try:
+            addresses = await self._cache.aresolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        error: Exception = httpcore.ConnectError(f"No address found for {host}")
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, **kwargs)
+            except _CONNECT_ERRORS as e:
+                error = e
+        self._cache.invalidate(host, port)
+        raise error
+
+    async def connect_unix_socket(
+        self, *args: Any, **kwargs: Any
+    ) -> httpcore.AsyncNetworkStream:
+        return await self._backend.connect_unix_socket(*args, **kwargs)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+def use_dns_cache(
+    transport: Union[httpx.HTTPTransport, httpx.AsyncHTTPTransport], cache: DNSCache
+) -> None:
+    """
+    Make the connections of an httpx transport resolve hosts through a
+    DNSCache. httpx does not take a network backend, so the one of the
+    httpcore pool of the transport is wrapped.
+    """
+    pool = transport._pool
+    if isinstance(transport, httpx.AsyncHTTPTransport):
+        pool._network_backend = AsyncDNSCachingBackend(pool._network_backend, cache)
+    else:
+        pool._network_backend = DNSCachingBackend(pool._network_backend, cache)
@@ -0,0 +1,161 @@
+from typing import Callable, Dict, Optional, Type
+
+import httpx
+from pydantic import BaseModel
+
+from javelin_sdk.exceptions import (
+    BadRequest,
+    GatewayAlreadyExistsError,
+    GatewayNotFoundError,
+    InternalServerError,
+    ProviderAlreadyExistsError,
+    ProviderNotFoundError,
+    RateLimitExceededError,
+    RouteAlreadyExistsError,
+    RouteNotFoundError,
+    SecretAlreadyExistsError,
+    SecretNotFoundError,
+    TemplateAlreadyExistsError,
+    TemplateNotFoundError,
+    UnauthorizedError,
+)
+from javelin_sdk.models import (
+    Gateway,
+    Gateways,
+    Provider,
+    Providers,
+    QueryResponse,
+    Route,
+    Routes,
+    Secret,
+    Secrets,
+    Template,
+    Templates,
+)
+
+# Exceptions raised for the error statuses shared by all the endpoints. Other
+# statuses than 200 raise InternalServerError.
+STATUS_ERRORS: Dict[int, Type[Exception]] = {
+    400: BadRequest,
+    401: UnauthorizedError,
+    403: UnauthorizedError,
+    429: RateLimitExceededError,
+}
+
+
+class Endpoint:
+    """
+    A resource of the Javelin API: the template of its URL, relative to the
+    base URL of the client, the model of its responses and the exceptions
+    raised for their error statuses.
+    """
+
+    __slots__ = ("path", "model", "items", "errors")
+
+    def __init__(
+        self,
+        path: str,
+        model: Type[BaseModel],
+        not_found: Type[Exception],
+        already_exists: Type[Exception],
+        items: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the Endpoint.
+
+        :param path: URL template, with `{name}` style placeholders.
+        :param model: Model of the response body.
+        :param not_found: Exception raised on 404 responses.
+        :param already_exists: Exception raised on 409 responses.
+        :param items: For list endpoints, the field of `model` holding the
+            elements of the list.
+        """
+        self.path = path
+        self.model = model
+        self.items = items
+        self.errors = {**STATUS_ERRORS, 404: not_found, 409: already_exists}
+
+    @property
+    def item_model(self) -> Type[BaseModel]:
+        """
+        Model of the elements of a list endpoint.
+        """
+        return self.model.__fields__[self.items].type_
+
+    def compile(self, base_url: str) -> Callable[..., str]:
+        """
+        Bind the URL template to a base URL, once per client.
+
+        :return: Function formatting the URL from the placeholder values.
+        """
+        return f"{base_url}/{self.path}".format
+
+    def raise_for_status(self, response: httpx.Response) -> None:
+        """
+        Raise the exception mapped to the status of an unsuccessful response.
+        """
+        status = response.status_code
+        if status != 200:
+            raise self.errors.get(status, InternalServerError)(response=response)
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.path!r})"
+
+
+GATEWAY = Endpoint("admin/gateways/{name}", Gateway, GatewayNotFoundError, GatewayAlreadyExistsError)
+GATEWAYS = Endpoint(
+    "admin/gateways", Gateways, GatewayNotFoundError, GatewayAlreadyExistsError, items="gateways"
+)
+PROVIDER = Endpoint(
+    "admin/providers/{name}", Provider, ProviderNotFoundError, ProviderAlreadyExistsError
+)
+PROVIDERS = Endpoint(
+    "admin/providers", Providers, ProviderNotFoundError, ProviderAlreadyExistsError, items="providers"
+)
+ROUTE = Endpoint("admin/routes/{name}", Route, RouteNotFoundError, RouteAlreadyExistsError)
+ROUTES = Endpoint(
+    "admin/routes", Routes, RouteNotFoundError, RouteAlreadyExistsError, items="routes"
+)
+QUERY = Endpoint("query/{name}", QueryResponse, RouteNotFoundError, RouteAlreadyExistsError)
+SECRET = Endpoint(
+    "admin/providers/{provider}/secrets/{name}", Secret, SecretNotFoundError, SecretAlreadyExistsError
+)
+SECRETS = Endpoint(
+    "admin/providers/secrets/keys",
+    Secrets,
+    SecretNotFoundError,
+    SecretAlreadyExistsError,
+    items="secrets",
+)
+PROVIDER_SECRETS = Endpoint(
+    "admin/providers/{provider}/secrets/keys",
+    Secrets,
+    SecretNotFoundError,
+    SecretAlreadyExistsError,
+    items="secrets",
+)
+TEMPLATE = Endpoint(
+    "admin/processors/dp/templates/{name}", Template, TemplateNotFoundError, TemplateAlreadyExistsError
+)
+TEMPLATES = Endpoint(
+    "admin/processors/dp/templates",
+    Templates,
+    TemplateNotFoundError,
+    TemplateAlreadyExistsError,
+    items="templates",
+)
+
+ENDPOINTS = (
+    GATEWAY,
+    GATEWAYS,
+    PROVIDER,
+    PROVIDERS,
+    ROUTE,
+    ROUTES,
+    QUERY,
+    SECRET,
+    SECRETS,
+    PROVIDER_SECRETS,
+    TEMPLATE,
+    TEMPLATES,
+)
@@ -2,6 +2,8 @@ from typing import Any, Dict, Optional
 
 from httpx import Response
 
+from javelin_sdk.retry import RETRY_STATS_EXTENSION
+
 
 class JavelinClientError(Exception):
     """
@@ -13,6 +15,10 @@ class JavelinClientError(Exception):
         The error message associated with the JavelinClient error.
     response_data : Optional[dict]
         The response data associated with the JavelinClient error.
+    retry_count : int
+        The number of retries made before the error was raised.
+    retry_sleep : float
+        The total number of seconds slept between retries.
 
     Parameters
     ----------
@@ -26,6 +32,11 @@ class JavelinClientError(Exception):
         super().__init__(message)
         self.message = message
         self.response_data = self._extract_response_data(response)
+        self.retry_count, self.retry_sleep = (
+            response.extensions.get(RETRY_STATS_EXTENSION, (0, 0.0))
+            if response is not None
+            else (0, 0.0)
+        )
 
     def _extract_response_data(
         self, response: Optional[Response]
@@ -162,3 +173,23 @@ class ValidationError(JavelinClientError):
         self, response: Optional[Response] = None, message: str = "Validation error"
     ) -> None:
         super().__init__(message=message, response=response)
+
+class CircuitOpenError(JavelinClientError):
+    def __init__(
+        self, response: Optional[Response] = None, message: str = "Circuit breaker is open"
+    ) -> None:
+        super().__init__(message=message, response=response)
+
+
+class DeadlineExceededError(JavelinClientError):
+    def __init__(
+        self, response: Optional[Response] = None, message: str = "Deadline exceeded"
+    ) -> None:
+        super().__init__(message=message, response=response)
+
+
+class ConcurrencyLimitExceededError(JavelinClientError):
+    def __init__(
+        self, response: Optional[Response] = None, message: str = "Concurrency limit exceeded"
+    ) -> None:
+        super().__init__(message=message, response=response)
@@ -0,0 +1,129 @@
+import threading
+from typing import Dict, Mapping, Optional
+
+from javelin_sdk.latency import LatencyWindow
+
+
+class HedgingStats:
+    """
+    Counters of a HedgingPolicy.
+
+    `hedge_wins` counts hedged calls answered first by the duplicate request,
+    `hedge_losses` those answered first by the original request, and
+    `hedges_suppressed` the hedges skipped because of the extra-load cap.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+        self.hedge_losses = 0
+        self.hedges_suppressed = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"HedgingStats(calls={self.calls}, hedges_sent={self.hedges_sent}, "
+            f"hedge_wins={self.hedge_wins}, hedge_losses={self.hedge_losses}, "
+            f"hedges_suppressed={self.hedges_suppressed})"
+        )
+
+
+class HedgingPolicy:
+    """
+    Policy sending a duplicate query when the first one is slow to answer.
+
+    The duplicate is sent after a fixed `delay`, or, when no delay is given,
+    after the `percentile` of the latencies recently observed on the route
+    once `min_samples` were observed. The extra load is capped by a token
+    bucket: every call earns `max_extra_load` tokens and every hedge spends
+    one, so at most that fraction of calls is duplicated.
+
+    Only queries carrying an idempotency key are hedged, so that the gateway
+    can tell the duplicate from a new query.
+    """
+
+    def __init__(
+        self,
+        delay: Optional[float] = None,
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        window_size: int = 1000,
+        max_extra_load: float = 0.1,
+        max_burst: float = 10.0,
+        idempotency_header: str = "Idempotency-Key",
+    ) -> None:
+        """
+        Initialize the HedgingPolicy.
+
+        :param delay: Seconds to wait before hedging, None to derive it from
+            the observed latencies.
+        :param percentile: Percentile of the recent latencies of the route
+            after which a call is hedged.
+        :param min_samples: Latencies to observe on a route before hedging
+            with a derived delay.
+        :param window_size: Number of recent latencies kept per route.
+        :param max_extra_load: Maximum fraction of calls that are hedged.
+        :param max_burst: Maximum number of hedges that can be saved up.
+        :param idempotency_header: Header marking a query as safe to send
+            twice.
+        """
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self.max_extra_load = max_extra_load
+        self.max_burst = max_burst
+        self.idempotency_header = idempotency_header.lower()
+        self.stats = HedgingStats()
+        self._latencies: Dict[str, LatencyWindow] = {}
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def _window(self, route_name: str) -> LatencyWindow:
+        with self._lock:
+            window = self._latencies.get(route_name)
+            if window is None:
+                window = self._latencies[route_name] = LatencyWindow(self.window_size)
+            return window
+
+    def is_idempotent(self, headers: Optional[Mapping[str, str]]) -> bool:
+        return any(name.lower() == self.idempotency_header for name in headers or {})
+
+    def observe(self, route_name: str, latency: float) -> None:
+        self._window(route_name).observe(latency)
+
+    def hedge_delay(self, route_name: str) -> Optional[float]:
+        """
+        Start a call and compute after how long it should be hedged.
+
+        :param route_name: Name of the queried route.
+        :return: Seconds to wait before hedging, or None to not hedge.
+        """
+        with self._lock:
+            self.stats.calls += 1
+            self._tokens = min(self.max_burst, self._tokens + self.max_extra_load)
+        if self.delay is not None:
+            return self.delay
+        window = self._window(route_name)
+        if len(window) < self.min_samples:
+            return None
+        return window.percentile(self.percentile)
+
+    def try_hedge(self) -> bool:
+        """
+        Ask to send a hedge, within the extra-load cap.
+        """
+        with self._lock:
+            if self._tokens < 1.0:
+                self.stats.hedges_suppressed += 1
+                return False
+            self._tokens -= 1.0
+            self.stats.hedges_sent += 1
+            return True
+
+    def record_winner(self, hedge_won: bool) -> None:
+        with self._lock:
+            if hedge_won:
+                self.stats.hedge_wins += 1
+            else:
+                self.stats.hedge_losses += 1
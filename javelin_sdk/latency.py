@@ -0,0 +1,110 @@
+import math
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class LatencyWindow:
+    """
+    Latencies of the most recent calls, used to estimate percentiles.
+    """
+
+    def __init__(self, size: int = 1000) -> None:
+        """
+        Initialize the LatencyWindow.
+
+        :param size: Number of recent latencies kept.
+        """
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def observe(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate a percentile of the recent latencies.
+
+        :param q: Percentile to estimate, between 0 and 1.
+        :return: Latency in seconds, or None if no latency was observed.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(q * (len(samples) - 1)))))
+        return samples[index]
+
+
+class LatencyHistogram:
+    """
+    Streaming latency sketch, estimating percentiles in constant memory and
+    time, like an HDR histogram.
+
+    Latencies are counted in logarithmic buckets, so that estimates are within
+    `precision` relative error, and rounded up to the bucket bound. Counts of
+    the current and previous windows of `window_size` observations are kept,
+    so that estimates follow changes in latency.
+    """
+
+    def __init__(
+        self, precision: float = 0.02, window_size: int = 1000, min_latency: float = 1e-4
+    ) -> None:
+        """
+        Initialize the LatencyHistogram.
+
+        :param precision: Relative error of the estimates.
+        :param window_size: Observations per window.
+        :param min_latency: Lower bound of the estimates, in seconds.
+        """
+        self.window_size = window_size
+        self.min_latency = min_latency
+        self._log_growth = math.log1p(2 * precision / (1 - precision))
+        self._current: Dict[int, int] = {}
+        self._previous: Dict[int, int] = {}
+        self._count = 0
+        self._previous_count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count + self._previous_count
+
+    def _bucket(self, latency: float) -> int:
+        if latency <= self.min_latency:
+            return 0
+        return math.ceil(math.log(latency / self.min_latency) / self._log_growth)
+
+    def observe(self, latency: float) -> None:
+        bucket = self._bucket(latency)
+        with self._lock:
+            if self._count >= self.window_size:
+                self._previous, self._current = self._current, {}
+                self._previous_count, self._count = self._count, 0
+            self._current[bucket] = self._current.get(bucket, 0) + 1
+            self._count += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate a percentile of the recent latencies.
+
+        :param q: Percentile to estimate, between 0 and 1.
+        :return: Latency in seconds, or None if no latency was observed.
+        """
+        with self._lock:
+            counts = dict(self._previous)
+            for bucket, count in self._current.items():
+                counts[bucket] = counts.get(bucket, 0) + count
+            total = self._count + self._previous_count
+        if not total:
+            return None
+        rank = max(1, math.ceil(q * total))
+        seen = 0
+        for bucket in sorted(counts):
+            seen += counts[bucket]
+            if seen >= rank:
+                break
+        return self.min_latency * math.exp(bucket * self._log_growth)
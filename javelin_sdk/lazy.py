@@ -0,0 +1,141 @@
+import copy
+import json
+from typing import Any, Callable, Dict, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+from javelin_sdk.models import QueryResponse
+
+
+# Per model: nested model (if any), whether required and default of each field
+_FIELD_INFO: Dict[Type[BaseModel], Dict[str, Tuple[Optional[Type[BaseModel]], bool, Any]]] = {}
+
+
+def _field_info(model: Type[BaseModel]) -> Dict[str, Tuple[Optional[Type[BaseModel]], bool, Any]]:
+    info = _FIELD_INFO.get(model)
+    if info is None:
+        info = {}
+        for name, field in model.__fields__.items():
+            nested = field.type_
+            if not (isinstance(nested, type) and issubclass(nested, BaseModel)):
+                nested = None
+            info[name] = (nested, bool(field.required), field.default)
+        _FIELD_INFO[model] = info
+    return info
+
+
+def _wrap(nested: Type[BaseModel], value: Any) -> Any:
+    """
+    Wrap the raw value of a field in views of its nested model.
+    """
+    if isinstance(value, dict):
+        return LazyModel(nested, value)
+    if isinstance(value, list):
+        return [LazyModel(nested, item) if isinstance(item, dict) else item for item in value]
+    return value
+
+
+class LazyModel:
+    """
+    Read-only view over the raw JSON of a pydantic model.
+
+    Fields are read from the decoded JSON when accessed, without validation
+    or conversion, and nested models are returned as views as well. Fields
+    missing from the JSON take the default of the model, or raise an
+    AttributeError when they are required. `validate()` builds the validated
+    model.
+    """
+
+    __slots__ = ("_model", "_data", "_content", "_loads")
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        data: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        loads: Callable[[Union[bytes, str]], Any] = json.loads,
+    ) -> None:
+        """
+        Initialize the LazyModel from either decoded JSON or raw bytes.
+
+        :param model: Model of the JSON.
+        :param data: Decoded JSON object.
+        :param content: Raw JSON, only decoded on the first access.
+        :param loads: Function decoding `content`.
+        """
+        if data is None and content is None:
+            raise ValueError("Either data or content is required.")
+        self._model = model
+        self._data = data
+        self._content = content
+        self._loads = loads
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        """
+        The decoded JSON. It is shared with the view and must not be modified.
+        """
+        if self._data is None:
+            self._data = self._loads(self._content)
+        return self._data
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            nested, required, default = _field_info(self._model)[name]
+        except KeyError:
+            raise AttributeError(f"{self._model.__name__} has no field {name!r}")
+        data = self._data if self._data is not None else self.raw
+        if name not in data:
+            if required:
+                raise AttributeError(f"{self._model.__name__} response has no {name!r}")
+            return copy.deepcopy(default)
+        value = data[name]
+        return value if nested is None else _wrap(nested, value)
+
+    def validate(self) -> BaseModel:
+        """
+        Validate the JSON into the model.
+
+        :raises pydantic.ValidationError: If the JSON does not match the model.
+        """
+        return self._model.parse_obj(self.raw)
+
+    def dict(self) -> Dict[str, Any]:
+        """
+        Return the decoded JSON, as sent by the gateway. Unlike
+        BaseModel.dict(), it is not a copy.
+        """
+        return self.raw
+
+    def json(self, **kwargs: Any) -> str:
+        return json.dumps(self.raw, **kwargs)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, LazyModel):
+            return self._model is other._model and self.raw == other.raw
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Lazy{self._model.__name__}({self.raw!r})"
+
+
+class LazyQueryResponse(LazyModel):
+    """
+    Unvalidated view over a QueryResponse, returned by the queries of a
+    JavelinClient created with `lazy_responses=True`.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        data: Optional[Dict[str, Any]] = None,
+        content: Optional[bytes] = None,
+        loads: Callable[[Union[bytes, str]], Any] = json.loads,
+    ) -> None:
+        super().__init__(QueryResponse, data, content, loads)
+
+    def validate(self) -> QueryResponse:
+        return super().validate()
@@ -0,0 +1,269 @@
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+from javelin_sdk.batch import amap_bounded, map_bounded
+from javelin_sdk.endpoints import GATEWAYS, PROVIDERS, ROUTES, SECRETS, TEMPLATES, Endpoint
+from javelin_sdk.models import Gateway, Provider, Route, Secret, Template
+
+if TYPE_CHECKING:
+    from javelin_sdk.client import JavelinClient
+
+# Resources are applied level by level, so that a secret is applied after its
+# provider and a route after the providers, secrets and templates it uses
+SYNC_LEVELS = (("gateway", "provider", "template"), ("secret",), ("route",))
+
+# List endpoint of each kind, read to diff the manifest against the gateway
+LIST_ENDPOINTS: Dict[str, Endpoint] = {
+    "gateway": GATEWAYS,
+    "provider": PROVIDERS,
+    "template": TEMPLATES,
+    "secret": SECRETS,
+    "route": ROUTES,
+}
+
+# Fields the gateway masks when listing, which cannot be compared
+MASKED_FIELDS: Dict[str, Set[str]] = {
+    "secret": {"api_key_secret_key", "api_key_secret_key_javelin"},
+}
+
+CREATE = "create"
+UPDATE = "update"
+UNCHANGED = "unchanged"
+
+
+class Manifest(BaseModel):
+    gateways: List[Gateway] = Field(default=[], description="Desired gateways")
+    providers: List[Provider] = Field(default=[], description="Desired providers")
+    templates: List[Template] = Field(default=[], description="Desired templates")
+    secrets: List[Secret] = Field(default=[], description="Desired secrets")
+    routes: List[Route] = Field(default=[], description="Desired routes")
+
+    @classmethod
+    def from_file(cls, path: str) -> "Manifest":
+        """
+        Load a manifest from a YAML or JSON file. YAML requires the `pyyaml`
+        package.
+
+        :param path: Path of the manifest, JSON if it ends with .json.
+        """
+        with open(path, "r") as f:
+            if path.endswith(".json"):
+                return cls(**json.load(f))
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(
+                    "Loading YAML manifests requires pyyaml (`pip install javelin_sdk[yaml]`)."
+                )
+            return cls(**(yaml.safe_load(f) or {}))
+
+    def resources(self, kind: str) -> List[BaseModel]:
+        return getattr(self, f"{kind}s")
+
+
+class SyncChange:
+    """
+    Change needed to bring a resource to the state of the manifest.
+    """
+
+    __slots__ = ("kind", "name", "action", "model", "error", "applied")
+
+    def __init__(self, kind: str, name: str, action: str, model: BaseModel) -> None:
+        self.kind = kind
+        self.name = name
+        self.action = action
+        self.model = model
+        self.error: Optional[Exception] = None
+        self.applied = False
+
+    def __repr__(self) -> str:
+        status = f"error={self.error!r}" if self.error is not None else f"applied={self.applied}"
+        return f"SyncChange({self.action} {self.kind} {self.name}, {status})"
+
+
+class SyncResult:
+    """
+    Outcome of a sync: one SyncChange per resource of the manifest.
+    """
+
+    def __init__(self, changes: List[SyncChange]) -> None:
+        self.changes = changes
+
+    def _with_action(self, action: str) -> List[SyncChange]:
+        return [change for change in self.changes if change.action == action]
+
+    @property
+    def created(self) -> List[SyncChange]:
+        return [change for change in self._with_action(CREATE) if change.applied]
+
+    @property
+    def updated(self) -> List[SyncChange]:
+        return [change for change in self._with_action(UPDATE) if change.applied]
+
+    @property
+    def unchanged(self) -> List[SyncChange]:
+        return self._with_action(UNCHANGED)
+
+    @property
+    def failed(self) -> List[SyncChange]:
+        return [change for change in self.changes if change.error is not None]
+
+    @property
+    def skipped(self) -> List[SyncChange]:
+        """
+        Changes not applied, because of a dry run or of a failure in an
+        earlier dependency level.
+        """
+        return [
+            change
+            for change in self.changes
+            if change.action != UNCHANGED and not change.applied and change.error is None
+        ]
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def __repr__(self) -> str:
+        return (
+            f"SyncResult(created={len(self.created)}, updated={len(self.updated)}, "
+            f"unchanged={len(self.unchanged)}, failed={len(self.failed)})"
+        )
+
+
+def resource_name(kind: str, model: Any) -> str:
+    if kind == "secret":
+        return f"{model.provider_name}/{model.api_key}"
+    return model.name
+
+
+def _is_subset(desired: Any, current: Any) -> bool:
+    """
+    Whether every value set in the desired state has the same value in the
+    current state. Values only set on the gateway are ignored.
+    """
+    if isinstance(desired, dict):
+        return isinstance(current, dict) and all(
+            _is_subset(value, current.get(key)) for key, value in desired.items()
+        )
+    if isinstance(desired, list):
+        return (
+            isinstance(current, list)
+            and len(desired) == len(current)
+            and all(_is_subset(d, c) for d, c in zip(desired, current))
+        )
+    return desired == current
+
+
+def plan(manifest: Manifest, current: Dict[str, Dict[str, BaseModel]]) -> List[List[SyncChange]]:
+    """
+    Diff a manifest against the current state of the gateway.
+
+    :param manifest: Desired state.
+    :param current: Current resources, keyed by kind and then by name.
+    :return: Changes, grouped by dependency level.
+    """
+    levels = []
+    for kinds in SYNC_LEVELS:
+        changes = []
+        for kind in kinds:
+            existing = current.get(kind, {})
+            for model in manifest.resources(kind):
+                name = resource_name(kind, model)
+                if name not in existing:
+                    action = CREATE
+                elif _is_subset(
+                    model.dict(exclude_unset=True, exclude=MASKED_FIELDS.get(kind)),
+                    existing[name].dict(),
+                ):
+                    action = UNCHANGED
+                else:
+                    action = UPDATE
+                changes.append(SyncChange(kind, name, action, model))
+        levels.append(changes)
+    return levels
+
+
+def _kinds(manifest: Manifest) -> List[str]:
+    return [kind for kinds in SYNC_LEVELS for kind in kinds if manifest.resources(kind)]
+
+
+def _index(kind: str, listing: BaseModel) -> Dict[str, BaseModel]:
+    return {resource_name(kind, model): model for model in getattr(listing, f"{kind}s")}
+
+
+def _pending(changes: List[SyncChange]) -> List[SyncChange]:
+    return [change for change in changes if change.action != UNCHANGED]
+
+
+def apply_manifest(
+    client: "JavelinClient", manifest: Manifest, concurrency: int = 16, dry_run: bool = False
+) -> SyncResult:
+    """
+    Bring the gateway to the state of a manifest. See JavelinClient.apply_manifest.
+
+    :raises JavelinClientError: If the current state could not be read.
+    """
+    kinds = _kinds(manifest)
+    current = {}
+    for result in map_bounded(
+        lambda kind: client._list_strict_sync(LIST_ENDPOINTS[kind]),
+        kinds,
+        concurrency=len(kinds) or 1,
+    ):
+        current[kinds[result.index]] = _index(kinds[result.index], result.result())
+
+    levels = plan(manifest, current)
+    skip = dry_run
+
+    def apply(change: SyncChange) -> None:
+        getattr(client, f"{change.action}_{change.kind}")(change.model)
+
+    for changes in levels:
+        pending = _pending(changes)
+        if skip or not pending:
+            continue
+        for result in map_bounded(apply, pending, concurrency):
+            change = pending[result.index]
+            change.error = result.error
+            change.applied = result.ok
+            skip = skip or not result.ok
+    return SyncResult([change for changes in levels for change in changes])
+
+
+async def aapply_manifest(
+    client: "JavelinClient", manifest: Manifest, concurrency: int = 16, dry_run: bool = False
+) -> SyncResult:
+    """
+    Asynchronously bring the gateway to the state of a manifest. See
+    JavelinClient.apply_manifest.
+
+    :raises JavelinClientError: If the current state could not be read.
+    """
+    kinds = _kinds(manifest)
+    current = {}
+
+    async def fetch(kind: str) -> BaseModel:
+        return await client._alist_strict(LIST_ENDPOINTS[kind])
+
+    async for result in amap_bounded(fetch, kinds, concurrency=len(kinds) or 1):
+        current[kinds[result.index]] = _index(kinds[result.index], result.result())
+
+    levels = plan(manifest, current)
+    skip = dry_run
+
+    async def apply(change: SyncChange) -> None:
+        await getattr(client, f"a{change.action}_{change.kind}")(change.model)
+
+    for changes in levels:
+        pending = _pending(changes)
+        if skip or not pending:
+            continue
+        async for result in amap_bounded(apply, pending, concurrency):
+            change = pending[result.index]
+            change.error = result.error
+            change.applied = result.ok
+            skip = skip or not result.ok
+    return SyncResult([change for changes in levels for change in changes])
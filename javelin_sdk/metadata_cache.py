@@ -0,0 +1,228 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+
+from javelin_sdk.exceptions import (
+    GatewayNotFoundError,
+    ProviderNotFoundError,
+    RouteNotFoundError,
+    TemplateNotFoundError,
+)
+
+# Resource kind and name, None for the list of all the resources of a kind
+MetadataKey = Tuple[str, Optional[str]]
+
+NOT_FOUND_ERRORS = (
+    GatewayNotFoundError,
+    ProviderNotFoundError,
+    RouteNotFoundError,
+    TemplateNotFoundError,
+)
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+class MetadataCacheStats:
+    """
+    Counters of a MetadataCache.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.stale_hits = 0
+        self.not_modified = 0
+        self.misses = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"MetadataCacheStats(hits={self.hits}, stale_hits={self.stale_hits}, "
+            f"not_modified={self.not_modified}, misses={self.misses})"
+        )
+
+
+class MetadataEntry:
+    """
+    Cached result of an admin GET: either a parsed model, or a not-found
+    error when the resource does not exist.
+    """
+
+    __slots__ = ("value", "error", "etag", "fetched_at", "revalidating")
+
+    def __init__(
+        self,
+        value: Any = None,
+        error: Optional[Exception] = None,
+        etag: Optional[str] = None,
+    ) -> None:
+        self.value = value
+        self.error = error
+        self.etag = etag
+        self.fetched_at = time.monotonic()
+        self.revalidating = False
+
+    def result(self) -> Any:
+        if self.error is not None:
+            raise self.error.with_traceback(None)
+        return self.value
+
+
+class MetadataCache:
+    """
+    Cache of the gateways, providers, routes and templates read through a
+    JavelinClient.
+
+    Entries are served without contacting the gateway for `ttl` seconds.
+    For `stale_ttl` more seconds they are still served, while a background
+    request revalidates them. Past that, the next read waits for the
+    gateway. Revalidations send the ETag of the entry in If-None-Match, so an
+    unchanged resource costs a 304 response and no parsing. Not-found errors
+    are cached for `negative_ttl` seconds.
+
+    Cached models are shared between callers and must not be modified.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 30.0,
+        stale_ttl: float = 300.0,
+        negative_ttl: float = 5.0,
+    ) -> None:
+        """
+        Initialize the MetadataCache.
+
+        :param ttl: Seconds an entry is served without revalidation.
+        :param stale_ttl: Seconds an entry is still served after its TTL, while
+            it is revalidated in the background.
+        :param negative_ttl: Seconds a not-found error is cached.
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.stats = MetadataCacheStats()
+        self._entries: Dict[MetadataKey, MetadataEntry] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """
+        Counter bumped by every invalidation, so that a response requested
+        before a write is not stored after it.
+        """
+        return self._generation
+
+    def lookup(self, key: MetadataKey) -> Tuple[Optional[MetadataEntry], str]:
+        """
+        Look up a resource.
+
+        :param key: Kind and name of the resource.
+        :return: The entry, if any, and whether it is fresh, stale or missing.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None, MISS
+            age = time.monotonic() - entry.fetched_at
+            if entry.error is not None:
+                if age < self.negative_ttl:
+                    self.stats.hits += 1
+                    return entry, FRESH
+            elif age < self.ttl:
+                self.stats.hits += 1
+                return entry, FRESH
+            elif age < self.ttl + self.stale_ttl:
+                self.stats.stale_hits += 1
+                return entry, STALE
+            self.stats.misses += 1
+            return entry, MISS
+
+    def start_revalidation(self, entry: MetadataEntry) -> bool:
+        """
+        Claim the background revalidation of a stale entry.
+
+        :return: False if another revalidation of the entry is in flight.
+        """
+        with self._lock:
+            if entry.revalidating:
+                return False
+            entry.revalidating = True
+            return True
+
+    def finish_revalidation(self, entry: Optional[MetadataEntry]) -> None:
+        """
+        Release the revalidation of an entry claimed with start_revalidation,
+        once its request completed or failed.
+        """
+        if entry is not None:
+            with self._lock:
+                entry.revalidating = False
+
+    def conditional_headers(self, entry: Optional[MetadataEntry]) -> Optional[Dict[str, str]]:
+        if entry is None or entry.etag is None or entry.error is not None:
+            return None
+        return {"If-None-Match": entry.etag}
+
+    def store(
+        self,
+        key: MetadataKey,
+        generation: int,
+        entry: Optional[MetadataEntry],
+        response: httpx.Response,
+        parse: Callable[[httpx.Response], Any],
+    ) -> Any:
+        """
+        Update the cache with the response to a (conditional) GET.
+
+        :param key: Kind and name of the resource.
+        :param generation: Value of `generation` when the request was sent.
+        :param entry: Entry being revalidated, if any.
+        :param response: Response of the gateway.
+        :param parse: Parse a 200 response into a model, raising on errors.
+        :return: The model, either parsed or reused on a 304 response.
+        :raises: Whatever `parse` raises, e.g. RouteNotFoundError.
+        """
+        self.finish_revalidation(entry)
+
+        if response.status_code == 304 and entry is not None and entry.error is None:
+            with self._lock:
+                if generation == self._generation and self._entries.get(key) is entry:
+                    entry.fetched_at = time.monotonic()
+                self.stats.not_modified += 1
+            return entry.value
+
+        try:
+            value = parse(response)
+        except NOT_FOUND_ERRORS as e:
+            if self.negative_ttl > 0:
+                self._put(key, generation, MetadataEntry(error=e))
+            raise
+        if response.status_code == 200:
+            self._put(key, generation, MetadataEntry(value, etag=response.headers.get("ETag")))
+        return value
+
+    def _put(self, key: MetadataKey, generation: int, entry: MetadataEntry) -> None:
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = entry
+
+    def invalidate(self, kind: str, name: Optional[str] = None) -> None:
+        """
+        Drop a resource and the list of its kind after a write.
+
+        :param kind: Kind of the resource, e.g. "route".
+        :param name: Name of the resource, None to drop only the list.
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.pop((kind, name), None)
+            self._entries.pop((kind, None), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
@@ -155,3 +155,26 @@ class QueryResponse(BaseModel):
     object: str = Field(..., description="Object type")
     system_fingerprint: Optional[str] = Field(None, description="System fingerprint if available")
     usage: Usage = Field(..., description="Usage details")
+
+class StreamedQueryResponse(QueryResponse):
+    usage: Optional[Usage] = Field(
+        None, description="Usage details, None if the gateway reported no usage on the stream"
+    )
+
+class Delta(BaseModel):
+    content: Optional[str] = Field(default=None, description="Content fragment of the message")
+    role: Optional[str] = Field(default=None, description="Role in the message")
+
+class ChunkChoice(BaseModel):
+    delta: Delta = Field(default_factory=Delta, description="Incremental message details")
+    finish_reason: Optional[str] = Field(None, description="Reason for the completion finish, set on the last chunk")
+    index: int = Field(0, description="Index of the choice")
+
+class QueryChunk(BaseModel):
+    choices: List[ChunkChoice] = Field(default=[], description="List of incremental choices")
+    created: Optional[int] = Field(None, description="Creation timestamp")
+    id: Optional[str] = Field(None, description="Unique identifier of the response")
+    model: Optional[str] = Field(None, description="Model identifier")
+    object: Optional[str] = Field(None, description="Object type")
+    system_fingerprint: Optional[str] = Field(None, description="System fingerprint if available")
+    usage: Optional[Usage] = Field(None, description="Usage details, usually only on the last chunk")
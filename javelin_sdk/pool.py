@@ -0,0 +1,237 @@
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Tuple
+
+import httpx
+from pydantic import BaseModel, Field
+
+from javelin_sdk.dns import DNSCache, use_dns_cache
+from javelin_sdk.transport import AIOHTTP, HTTPX, AiohttpTransport
+
+HostKey = Tuple[str, str, Optional[int]]
+
+
+class PoolConfig(BaseModel):
+    max_connections: Optional[int] = Field(default=100, description="Maximum number of open connections, None for no limit")
+    max_keepalive_connections: Optional[int] = Field(default=20, description="Maximum number of idle connections kept alive, None for no limit")
+    keepalive_expiry: Optional[float] = Field(default=5.0, description="Seconds an idle connection is kept alive, None to keep it forever")
+    max_connections_per_host: Optional[int] = Field(default=None, description="Maximum number of concurrent requests to a single host, None for no limit")
+    dns_ttl: Optional[float] = Field(default=None, description="Seconds the resolved address of a host is reused by new connections, None to resolve it for every connection")
+
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+def _host_key(request: httpx.Request) -> HostKey:
+    return (request.url.scheme, request.url.host, request.url.port)
+
+
+def _pool_timeout(request: httpx.Request) -> Optional[float]:
+    return request.extensions.get("timeout", {}).get("pool")
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release: Optional[Callable[[], None]] = release
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class _AsyncReleasingStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]) -> None:
+        self._stream = stream
+        self._release: Optional[Callable[[], None]] = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class _PoolTransport(httpx.BaseTransport):
+    """
+    Transport handed to the httpx.Client of each JavelinClient using a pool.
+
+    Closing it is a no-op, the connections belong to the ConnectionPool.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, max_per_host: Optional[int]) -> None:
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: Dict[HostKey, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, key: HostKey) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(key)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self._max_per_host)
+                self._semaphores[key] = semaphore
+            return semaphore
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self._max_per_host is None:
+            return self._transport.handle_request(request)
+
+        semaphore = self._semaphore(_host_key(request))
+        if not semaphore.acquire(timeout=_pool_timeout(request)):
+            raise httpx.PoolTimeout("Timed out waiting for a per-host slot", request=request)
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, semaphore.release)
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class _AsyncPoolTransport(httpx.AsyncBaseTransport):
+    """
+    Transport handed to the httpx.AsyncClient of each JavelinClient using a
+    pool. Closing it is a no-op, the connections belong to the ConnectionPool.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: Optional[int]) -> None:
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: Dict[HostKey, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._max_per_host is None:
+            return await self._transport.handle_async_request(request)
+
+        key = _host_key(request)
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(self._max_per_host)
+        try:
+            await asyncio.wait_for(semaphore.acquire(), _pool_timeout(request))
+        except asyncio.TimeoutError:
+            raise httpx.PoolTimeout("Timed out waiting for a per-host slot", request=request)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        response.stream = _AsyncReleasingStream(response.stream, semaphore.release)
+        return response
+
+    async def aclose(self) -> None:
+        pass
+
+
+class ConnectionPool:
+    """
+    Connection pool that can be shared by several JavelinClient instances, so
+    that they reuse the same keep-alive connections to the gateway.
+
+    Clients do not close a pool they were given; call `close()` / `aclose()`
+    once all the clients sharing it are done.
+    """
+
+    def __init__(self, config: Optional[PoolConfig] = None) -> None:
+        """
+        Initialize the ConnectionPool.
+
+        :param config: Connection limits and keep-alive policy of the pool.
+        """
+        self.config = config or PoolConfig()
+        self._transports: Dict[Tuple[Tuple[str, Any], ...], _PoolTransport] = {}
+        self._atransports: Dict[Tuple[Tuple[str, Any], ...], _AsyncPoolTransport] = {}
+        self.dns_cache = DNSCache(self.config.dns_ttl) if self.config.dns_ttl else None
+        self._lock = threading.Lock()
+
+    def transport(self, **kwargs: Any) -> httpx.BaseTransport:
+        """
+        Return the synchronous transport of the pool.
+
+        :param kwargs: Extra httpx.HTTPTransport arguments, e.g. http2. Clients
+            passing the same arguments share the same connections.
+        :return: Transport to pass to httpx.Client.
+        """
+        key = tuple(sorted(kwargs.items()))
+        with self._lock:
+            transport = self._transports.get(key)
+            if transport is None:
+                inner = httpx.HTTPTransport(limits=self.config.limits, **kwargs)
+                if self.dns_cache is not None and not kwargs.get("uds"):
+                    use_dns_cache(inner, self.dns_cache)
+                transport = _PoolTransport(inner, self.config.max_connections_per_host)
+                self._transports[key] = transport
+            return transport
+
+    def atransport(self, backend: str = HTTPX, **kwargs: Any) -> httpx.AsyncBaseTransport:
+        """
+        Return the asynchronous transport of the pool.
+
+        :param backend: "httpx" or "aiohttp", sending requests with an
+            AiohttpTransport.
+        :param kwargs: Extra httpx.AsyncHTTPTransport arguments, e.g. http2.
+            Clients passing the same arguments share the same connections.
+        :return: Transport to pass to httpx.AsyncClient.
+        """
+        key = tuple(sorted({**kwargs, "backend": backend}.items()))
+        with self._lock:
+            transport = self._atransports.get(key)
+            if transport is None:
+                inner: httpx.AsyncBaseTransport
+                if backend == AIOHTTP:
+                    inner = AiohttpTransport(
+                        limits=self.config.limits, dns_ttl=self.config.dns_ttl, **kwargs
+                    )
+                else:
+                    inner = httpx.AsyncHTTPTransport(limits=self.config.limits, **kwargs)
+                    if self.dns_cache is not None and not kwargs.get("uds"):
+                        use_dns_cache(inner, self.dns_cache)
+                transport = _AsyncPoolTransport(inner, self.config.max_connections_per_host)
+                self._atransports[key] = transport
+            return transport
+
+    def close(self) -> None:
+        with self._lock:
+            transports, self._transports = self._transports, {}
+        for transport in transports.values():
+            transport._transport.close()
+
+    async def aclose(self) -> None:
+        with self._lock:
+            transports, self._atransports = self._atransports, {}
+        for transport in transports.values():
+            await transport._transport.aclose()
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "ConnectionPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
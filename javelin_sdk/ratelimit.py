@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from typing import Mapping, Optional
+
+# Headers announcing the quota and window of a rate limit, as in the IETF
+# httpapi RateLimit header fields draft, e.g. `RateLimit-Policy: 100;w=60`
+RATE_LIMIT_POLICY_HEADERS = ("RateLimit-Policy", "X-RateLimit-Policy")
+
+
+def parse_rate_limit_period(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Read the window of the rate limit announced by a response.
+
+    :param headers: Headers of the response.
+    :return: Seconds, from the `w` parameter of the first policy with one,
+        e.g. 60 for `100;w=60` or `"default";q=100;w=60`, or None.
+    """
+    for name in RATE_LIMIT_POLICY_HEADERS:
+        value = headers.get(name)
+        if not value:
+            continue
+        for policy in value.split(","):
+            for param in policy.split(";")[1:]:
+                key, _, window = param.partition("=")
+                if key.strip() != "w":
+                    continue
+                try:
+                    seconds = float(window)
+                except ValueError:
+                    continue
+                if seconds > 0:
+                    return seconds
+    return None
+
+
+class RateLimiter:
+    """
+    Token bucket delaying calls so that a rate limit is not exceeded.
+
+    Calls reserve a token and wait until it is available, so concurrent
+    callers are served in order. The bucket refills at `headroom` times the
+    limit and holds at most `burst` tokens, which keeps the number of calls in
+    any window of `period` seconds under `rate` while still allowing short
+    bursts. The same limiter can be used from threads and coroutines.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        period: float,
+        burst: Optional[float] = None,
+        headroom: float = 0.9,
+    ) -> None:
+        """
+        Initialize the RateLimiter.
+
+        :param rate: Maximum number of calls per period.
+        :param period: Length of the period, in seconds, as counted by the
+            gateway.
+        :param burst: Maximum number of calls made back to back. Defaults to
+            the part of the limit left unused by the headroom.
+        :param headroom: Fraction of the limit the sustained rate targets.
+        """
+        if rate <= 0:
+            raise ValueError("Rate limit must be positive.")
+        if period <= 0:
+            raise ValueError("Rate limit period must be positive.")
+        self.rate = rate
+        self.period = period
+        self.burst = burst if burst is not None else max(1.0, rate * (1 - headroom))
+        self._tokens_per_second = rate * headroom / period
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        Take a token, possibly in advance.
+
+        :return: Seconds to wait before the reserved token is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self._tokens_per_second
+            )
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._tokens_per_second
+
+    def acquire(self) -> float:
+        """
+        Block until a call is allowed.
+
+        :return: Seconds spent waiting.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self) -> float:
+        """
+        Asynchronously wait until a call is allowed.
+
+        :return: Seconds spent waiting.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
@@ -0,0 +1,209 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Collection, Mapping, Optional
+
+import httpx
+
+# Key of the httpx.Response extension recording (retry_count, retry_sleep)
+RETRY_STATS_EXTENSION = "javelin.retry_stats"
+# Key of the httpx.Request extension set once a 429 response to it is retried
+THROTTLED_EXTENSION = "javelin.throttled"
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header value.
+
+    :param value: Header value, either a number of seconds or an HTTP date.
+    :return: Seconds to wait, or None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """
+    Token bucket capping retries to a fraction of the requests sent.
+
+    Every request deposits `ratio` tokens and every retry withdraws one, so
+    that during an outage retries add at most `ratio` extra load. The bucket
+    is also refilled with `min_retries_per_second` tokens per second so that
+    low-traffic clients can still retry.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_retries_per_second: float = 1.0,
+        max_tokens: float = 100.0,
+    ) -> None:
+        """
+        Initialize the RetryBudget.
+
+        :param ratio: Retries allowed per request sent.
+        :param min_retries_per_second: Retries allowed per second regardless
+            of the traffic.
+        :param max_tokens: Maximum number of retries that can be saved up.
+        """
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.max_tokens,
+            self._tokens + (now - self._updated) * self.min_retries_per_second,
+        )
+        self._updated = now
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+
+class RetryPolicy:
+    """
+    Decide whether and when a failed request is retried.
+
+    Delays use exponential backoff with full jitter, unless the gateway sent
+    a Retry-After header. Only requests that are safe to repeat are retried:
+    idempotent methods, requests carrying an idempotency key, requests that
+    never reached the gateway (connection errors) and requests rejected with
+    429 Too Many Requests.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_status_codes: Collection[int] = RETRYABLE_STATUS_CODES,
+        retry_on_network_errors: bool = True,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 60.0,
+        idempotency_header: str = "Idempotency-Key",
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        """
+        Initialize the RetryPolicy.
+
+        :param max_retries: Maximum number of retries per call.
+        :param backoff_base: Backoff ceiling of the first retry, in seconds.
+        :param backoff_max: Maximum backoff ceiling, in seconds.
+        :param retry_status_codes: Response status codes that are retried.
+        :param retry_on_network_errors: Whether transport errors are retried.
+        :param respect_retry_after: Whether to wait as long as the Retry-After
+            header asks instead of backing off.
+        :param max_retry_after: Give up instead of retrying when Retry-After
+            asks for a longer wait, in seconds.
+        :param idempotency_header: Header marking a POST as safe to retry.
+        :param budget: RetryBudget shared by all the calls using this policy.
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_status_codes = frozenset(retry_status_codes)
+        self.retry_on_network_errors = retry_on_network_errors
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.idempotency_header = idempotency_header.lower()
+        self.budget = budget
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full-jitter exponential backoff for the given retry attempt.
+
+        :param attempt: Number of retries already made.
+        :return: Seconds to wait before the next attempt.
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return random.uniform(0, ceiling)
+
+    def is_idempotent(self, method: str, headers: Mapping[str, str]) -> bool:
+        if method in IDEMPOTENT_METHODS:
+            return True
+        return any(name.lower() == self.idempotency_header for name in headers)
+
+    def on_request(self) -> None:
+        """
+        Record a new call, crediting the retry budget.
+        """
+        if self.budget is not None:
+            self.budget.deposit()
+
+    def next_delay(
+        self,
+        method: str,
+        headers: Mapping[str, str],
+        attempt: int,
+        response: Optional[httpx.Response] = None,
+        error: Optional[Exception] = None,
+    ) -> Optional[float]:
+        """
+        Compute the delay before retrying a failed attempt.
+
+        :param method: HTTP method of the request.
+        :param headers: Headers of the request.
+        :param attempt: Number of retries already made.
+        :param response: Response of the attempt, if one was received.
+        :param error: Transport error raised by the attempt, if any.
+        :return: Seconds to wait before retrying, or None to give up.
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if error is not None:
+            if not self.retry_on_network_errors:
+                return None
+            never_sent = isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+            if not (never_sent or self.is_idempotent(method, headers)):
+                return None
+            delay = self.backoff(attempt)
+        elif response is not None:
+            if response.status_code not in self.retry_status_codes:
+                return None
+            if response.status_code != 429 and not self.is_idempotent(method, headers):
+                return None
+            delay = self.backoff(attempt)
+            if self.respect_retry_after:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    if retry_after > self.max_retry_after:
+                        return None
+                    delay = retry_after
+        else:
+            return None
+
+        if self.budget is not None and not self.budget.try_withdraw():
+            return None
+        return delay
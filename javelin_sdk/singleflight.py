@@ -0,0 +1,170 @@
+import asyncio
+import hashlib
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, TypeVar
+
+from javelin_sdk.deadline import Deadline
+from javelin_sdk.exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+CREDENTIAL_HEADERS = frozenset({"x-api-key", "x-javelin-virtualapikey", "authorization"})
+
+
+def query_key(
+    route_name: str,
+    query_body: Mapping[str, Any],
+    headers: Optional[Mapping[str, str]] = None,
+    scope: str = "",
+) -> str:
+    """
+    Canonical key of a query: identical queries get the same key regardless
+    of the order of the keys of the body and of the headers.
+
+    :param route_name: Name of the queried route.
+    :param query_body: Body of the query.
+    :param headers: Additional headers sent with the query.
+    :param scope: Digest of the credentials the query is sent with, see
+        credentials_scope, so that queries of different tenants never get
+        the same key.
+    :return: Hex digest identifying the query.
+    """
+    canonical = json.dumps(
+        [
+            scope,
+            route_name,
+            query_body,
+            sorted((name.lower(), value) for name, value in (headers or {}).items()),
+        ],
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def credentials_scope(headers: Mapping[str, str]) -> str:
+    """
+    Digest of the credential headers among `headers`: the Javelin API key,
+    the virtual API key and the Authorization header of the LLM provider.
+
+    :param headers: Headers sent with every request of a client.
+    :return: Hex digest, equal for clients sending the same credentials.
+    """
+    credentials = sorted(
+        (name.lower(), value)
+        for name, value in headers.items()
+        if name.lower() in CREDENTIAL_HEADERS
+    )
+    return hashlib.sha256(json.dumps(credentials).encode()).hexdigest()
+
+
+def _fresh(error: BaseException) -> BaseException:
+    """
+    Copy of an exception raised by a shared call, so that each caller raises
+    its own object with its own traceback. The copy is made without calling
+    __init__, whose signature differs between exception classes.
+    """
+    cls = type(error)
+    copy = cls.__new__(cls, *error.args)
+    copy.args = error.args
+    copy.__dict__.update(error.__dict__)
+    return copy
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Let concurrent identical calls made from threads share a single execution.
+
+    The first caller for a key runs the function, the callers arriving while
+    it runs wait for it and receive the same result, or a copy of the same
+    exception.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable[[], T], deadline: Optional[Deadline] = None) -> T:
+        """
+        Run `fn`, or wait for the identical call already running.
+
+        :param key: Key of the call, e.g. from query_key.
+        :param fn: Function to run.
+        :param deadline: Deadline of the caller. A caller waiting for a running
+            call gives up with a DeadlineExceededError when it passes, without
+            interrupting the call.
+        :return: Result of the call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(None if deadline is None else deadline.remaining()):
+                raise DeadlineExceededError()
+            if call.error is not None:
+                raise _fresh(call.error) from call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """
+    Let concurrent identical calls made from tasks share a single execution.
+
+    The first caller for a key starts the coroutine in a task, the callers
+    arriving while it runs await the same task and receive its result or a
+    copy of its exception. Cancelling one caller does not cancel the shared
+    task.
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[str, "asyncio.Future[Any]"] = {}
+
+    async def do(
+        self, key: str, fn: Callable[[], Awaitable[T]], deadline: Optional[Deadline] = None
+    ) -> T:
+        """
+        Run `fn`, or await the identical call already running.
+
+        :param key: Key of the call, e.g. from query_key.
+        :param fn: Coroutine function to run.
+        :param deadline: Deadline of the caller, who gives up with a
+            DeadlineExceededError when it passes. The shared task is not
+            cancelled.
+        :return: Result of the call.
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        timeout = None if deadline is None else deadline.remaining()
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except Exception as e:
+            if not task.done():
+                raise DeadlineExceededError() from None
+            raise _fresh(e) from e
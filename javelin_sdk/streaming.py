@@ -0,0 +1,416 @@
+import codecs
+import json
+import sys
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+
+from javelin_sdk.deadline import Deadline
+from javelin_sdk.exceptions import DeadlineExceededError
+from javelin_sdk.models import (
+    Choice,
+    Message,
+    QueryChunk,
+    StreamedQueryResponse,
+    Usage,
+)
+
+SSE_DONE = "[DONE]"
+
+
+def _parse_sse_line(line: str, buffer: List[str]) -> Optional[str]:
+    """
+    Feed a single line of a server-sent event stream into `buffer`.
+
+    :param line: Line of the stream, without the trailing newline.
+    :param buffer: Data lines of the event that is currently being read.
+    :return: The data of a completed event, or None if the event is not
+        complete yet.
+    """
+    if not line:
+        if not buffer:
+            return None
+        data = "\n".join(buffer)
+        buffer.clear()
+        return data
+
+    if line.startswith(":"):
+        # Comment line, used by servers as a keep-alive
+        return None
+
+    field, _, value = line.partition(":")
+    if value.startswith(" "):
+        value = value[1:]
+    if field == "data":
+        buffer.append(value)
+    return None
+
+
+def iter_sse_data(lines: Iterator[str]) -> Iterator[str]:
+    """
+    Yield the data of each event of a server-sent event stream.
+
+    :param lines: Lines of the stream.
+    :return: Iterator over the event data strings.
+    """
+    buffer: List[str] = []
+    for line in lines:
+        data = _parse_sse_line(line, buffer)
+        if data is not None:
+            yield data
+    if buffer:
+        yield "\n".join(buffer)
+
+
+async def aiter_sse_data(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Asynchronously yield the data of each event of a server-sent event stream.
+
+    :param lines: Lines of the stream.
+    :return: Async iterator over the event data strings.
+    """
+    buffer: List[str] = []
+    async for line in lines:
+        data = _parse_sse_line(line, buffer)
+        if data is not None:
+            yield data
+    if buffer:
+        yield "\n".join(buffer)
+
+
+class JSONArrayParser:
+    """
+    Incremental parser of a JSON array, returning its elements as soon as
+    they are complete so that large list responses are never held in memory
+    as a whole.
+
+    A body that is not an array, e.g. an error object, yields no elements,
+    like the list_* methods return empty lists for it.
+    """
+
+    _WHITESPACE = " \t\r\n"
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._started = False
+        self._done = False
+
+    def feed(self, data: bytes) -> List[Any]:
+        """
+        Feed the next bytes of the body.
+
+        :return: Elements completed by these bytes.
+        """
+        if self._done:
+            return []
+        self._buffer += self._utf8.decode(data)
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """
+        Signal the end of the body.
+
+        :return: Elements completed by the end of the body.
+        :raises ValueError: If the body ends in the middle of an element.
+        """
+        if self._done:
+            return []
+        self._buffer += self._utf8.decode(b"", final=True)
+        elements = self._parse(final=True)
+        if not self._done and self._buffer.strip(self._WHITESPACE):
+            raise ValueError("Truncated JSON array")
+        return elements
+
+    def _parse(self, final: bool) -> List[Any]:
+        buffer = self._buffer
+        pos = 0
+        elements = []
+        while True:
+            while pos < len(buffer) and buffer[pos] in self._WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not self._started:
+                if buffer[pos] != "[":
+                    self._done = True
+                    break
+                self._started = True
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                self._done = True
+                break
+            if buffer[pos] == ",":
+                pos += 1
+                continue
+            try:
+                element, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise ValueError("Invalid JSON array")
+                break
+            # A number at the end of the buffer may continue in the next bytes
+            if end == len(buffer) and not final:
+                break
+            elements.append(element)
+            pos = end
+        self._buffer = "" if self._done else buffer[pos:]
+        return elements
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Iterate over the elements of a JSON array received in chunks.
+    """
+    parser = JSONArrayParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def aiter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """
+    Iterate over the elements of a JSON array received in chunks.
+    """
+    parser = JSONArrayParser()
+    async for chunk in chunks:
+        for element in parser.feed(chunk):
+            yield element
+    for element in parser.close():
+        yield element
+
+
+class ChunkAggregator:
+    """
+    Accumulate streamed chunks into a single StreamedQueryResponse.
+
+    Message contents are joined per choice index. Usage is the one reported
+    on the stream by the gateway, None if it did not report any.
+    """
+
+    def __init__(self) -> None:
+        self._contents: Dict[int, List[str]] = {}
+        self._roles: Dict[int, str] = {}
+        self._finish_reasons: Dict[int, str] = {}
+        self._meta: Dict[str, object] = {}
+        self._usage: Optional[Usage] = None
+
+    def add(self, chunk: QueryChunk) -> None:
+        for field in ("id", "created", "model", "object", "system_fingerprint"):
+            value = getattr(chunk, field)
+            if value is not None:
+                self._meta[field] = value
+
+        if chunk.usage is not None:
+            self._usage = chunk.usage
+
+        for choice in chunk.choices:
+            contents = self._contents.setdefault(choice.index, [])
+            if choice.delta.role:
+                self._roles[choice.index] = choice.delta.role
+            if choice.delta.content:
+                contents.append(choice.delta.content)
+            if choice.finish_reason:
+                self._finish_reasons[choice.index] = choice.finish_reason
+
+    def result(self) -> StreamedQueryResponse:
+        choices = [
+            Choice(
+                finish_reason=self._finish_reasons.get(index, "stop"),
+                index=index,
+                message=Message(
+                    content="".join(contents),
+                    role=self._roles.get(index, "assistant"),
+                ),
+            )
+            for index, contents in sorted(self._contents.items())
+        ]
+
+        object_type = str(self._meta.get("object", "chat.completion"))
+        if object_type.endswith(".chunk"):
+            object_type = object_type[: -len(".chunk")]
+
+        return StreamedQueryResponse(
+            choices=choices,
+            created=self._meta.get("created", 0),
+            id=self._meta.get("id", ""),
+            model=self._meta.get("model", ""),
+            object=object_type,
+            system_fingerprint=self._meta.get("system_fingerprint"),
+            usage=self._usage,
+        )
+
+
+def _check_deadline(deadline: Optional[Deadline]) -> None:
+    if deadline is not None and deadline.expired:
+        raise DeadlineExceededError()
+
+
+def _finish(stream: Any, error: Optional[BaseException]) -> None:
+    on_finish, stream._on_finish = stream._on_finish, None
+    if on_finish is not None:
+        on_finish(error)
+
+
+def _parse_chunk(data: str, loads: Callable[[str], Any] = json.loads) -> QueryChunk:
+    return QueryChunk(**loads(data))
+
+
+class QueryStream:
+    """
+    Iterator over the chunks of a streamed query.
+
+    The aggregated StreamedQueryResponse is available through `response` once
+    the stream has been consumed. The underlying connection is released when
+    the stream ends or when `close()` is called. With a deadline, the stream
+    raises DeadlineExceededError once it passes, checked between chunks.
+    `on_finish` is then called once, with the exception that ended the
+    stream or None.
+    """
+
+    def __init__(
+        self,
+        response: httpx.Response,
+        loads: Callable[[str], Any] = json.loads,
+        deadline: Optional[Deadline] = None,
+        on_finish: Optional[Callable[[Optional[BaseException]], None]] = None,
+    ) -> None:
+        self._response = response
+        self._loads = loads
+        self._deadline = deadline
+        self._on_finish = on_finish
+        self._aggregator = ChunkAggregator()
+        self._chunks: Optional[Iterator[QueryChunk]] = None
+        self.response: Optional[StreamedQueryResponse] = None
+
+    def __iter__(self) -> "QueryStream":
+        return self
+
+    def __next__(self) -> QueryChunk:
+        if self._chunks is None:
+            self._chunks = self._iter_chunks()
+        return next(self._chunks)
+
+    def __enter__(self) -> "QueryStream":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _iter_chunks(self) -> Iterator[QueryChunk]:
+        try:
+            for data in iter_sse_data(self._response.iter_lines()):
+                if data == SSE_DONE:
+                    break
+                _check_deadline(self._deadline)
+                chunk = _parse_chunk(data, self._loads)
+                self._aggregator.add(chunk)
+                yield chunk
+            self.response = self._aggregator.result()
+        except httpx.TimeoutException:
+            _check_deadline(self._deadline)
+            raise
+        finally:
+            self._close(sys.exc_info()[1])
+
+    def get_final_response(self) -> StreamedQueryResponse:
+        """
+        Consume the rest of the stream and return the aggregated response.
+
+        :return: StreamedQueryResponse built from all the chunks of the stream.
+        """
+        for _ in self:
+            pass
+        if self.response is None:
+            self.response = self._aggregator.result()
+        return self.response
+
+    def _close(self, error: Optional[BaseException]) -> None:
+        try:
+            self._response.close()
+        finally:
+            _finish(self, error)
+
+    def close(self) -> None:
+        self._close(None)
+
+
+class AsyncQueryStream:
+    """
+    Async iterator over the chunks of a streamed query.
+
+    The aggregated StreamedQueryResponse is available through `response` once
+    the stream has been consumed. The underlying connection is released when
+    the stream ends or when `aclose()` is called. With a deadline, the stream
+    raises DeadlineExceededError once it passes, checked between chunks.
+    `on_finish` is then called once, with the exception that ended the
+    stream or None.
+    """
+
+    def __init__(
+        self,
+        response: httpx.Response,
+        loads: Callable[[str], Any] = json.loads,
+        deadline: Optional[Deadline] = None,
+        on_finish: Optional[Callable[[Optional[BaseException]], None]] = None,
+    ) -> None:
+        self._response = response
+        self._loads = loads
+        self._deadline = deadline
+        self._on_finish = on_finish
+        self._aggregator = ChunkAggregator()
+        self._chunks: Optional[AsyncIterator[QueryChunk]] = None
+        self.response: Optional[StreamedQueryResponse] = None
+
+    def __aiter__(self) -> "AsyncQueryStream":
+        return self
+
+    async def __anext__(self) -> QueryChunk:
+        if self._chunks is None:
+            self._chunks = self._aiter_chunks()
+        return await self._chunks.__anext__()
+
+    async def __aenter__(self) -> "AsyncQueryStream":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.aclose()
+
+    async def _aiter_chunks(self) -> AsyncIterator[QueryChunk]:
+        try:
+            async for data in aiter_sse_data(self._response.aiter_lines()):
+                if data == SSE_DONE:
+                    break
+                _check_deadline(self._deadline)
+                chunk = _parse_chunk(data, self._loads)
+                self._aggregator.add(chunk)
+                yield chunk
+            self.response = self._aggregator.result()
+        except httpx.TimeoutException:
+            _check_deadline(self._deadline)
+            raise
+        finally:
+            await self._aclose(sys.exc_info()[1])
+
+    async def get_final_response(self) -> StreamedQueryResponse:
+        """
+        Consume the rest of the stream and return the aggregated response.
+
+        :return: StreamedQueryResponse built from all the chunks of the stream.
+        """
+        async for _ in self:
+            pass
+        if self.response is None:
+            self.response = self._aggregator.result()
+        return self.response
+
+    async def _aclose(self, error: Optional[BaseException]) -> None:
+        try:
+            await self._response.aclose()
+        finally:
+            _finish(self, error)
+
+    async def aclose(self) -> None:
+        await self._aclose(None)
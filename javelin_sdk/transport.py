@@ -0,0 +1,377 @@
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Callable, Optional, Tuple, Type
+
+import httpx
+
+try:
+    import aiohttp
+    import yarl
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+AUTO = "auto"
+HTTPX = "httpx"
+AIOHTTP = "aiohttp"
+ASYNC_BACKENDS = (AUTO, HTTPX, AIOHTTP)
+
+UDS_SCHEME = "unix://"
+# Base URL of the requests sent over a Unix domain socket, for the Host header
+UDS_BASE_URL = "http://localhost"
+
+
+def split_uds_url(base_url: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a `unix:///path/to/socket` base URL.
+
+    :return: The base URL of the requests and the path of the socket, None
+        for other URLs, which are returned unchanged.
+    """
+    if not base_url.startswith(UDS_SCHEME):
+        return base_url, None
+    return UDS_BASE_URL, base_url[len(UDS_SCHEME):]
+
+
+def running_uvloop() -> bool:
+    """
+    Whether the running event loop is a uvloop loop.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return type(loop).__module__.startswith("uvloop")
+
+
+def check_async_backend(backend: str, http2: bool = False) -> None:
+    """
+    Validate the async_backend setting of a JavelinClient.
+
+    :raises ValueError: If the backend is unknown or does not support HTTP/2.
+    :raises ImportError: If the aiohttp backend is requested without aiohttp.
+    """
+    if backend not in ASYNC_BACKENDS:
+        raise ValueError(f"Unknown async backend: {backend}")
+    if backend == AIOHTTP:
+        if aiohttp is None:
+            raise ImportError(
+                "The aiohttp backend requires aiohttp (`pip install javelin_sdk[aiohttp]`)."
+            )
+        if http2:
+            raise ValueError("The aiohttp backend does not support HTTP/2.")
+
+
+def resolve_async_backend(backend: str, http2: bool = False) -> str:
+    """
+    Resolve the async_backend setting of a JavelinClient, from within the
+    event loop. "auto" selects aiohttp when it is installed and the loop is a
+    uvloop loop, where it has the lowest per-request overhead, and httpx
+    otherwise.
+
+    :param backend: "auto", "httpx" or "aiohttp".
+    :param http2: Whether the client speaks HTTP/2, only supported by httpx.
+    :return: "httpx" or "aiohttp".
+    """
+    check_async_backend(backend, http2)
+    if backend == AUTO:
+        return AIOHTTP if aiohttp is not None and not http2 and running_uvloop() else HTTPX
+    return backend
+
+
+# Phases of a request, telling which timeout of an httpx.Timeout expired
+POOL = "pool"
+CONNECT = "connect"
+WRITE = "write"
+READ = "read"
+
+_TIMEOUT_ERRORS = {
+    POOL: httpx.PoolTimeout,
+    CONNECT: httpx.ConnectTimeout,
+    WRITE: httpx.WriteTimeout,
+    READ: httpx.ReadTimeout,
+}
+
+
+# Size of the chunks the body of a request is written in
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+class _RequestProgress:
+    """
+    Phase of a request sent with aiohttp, followed through aiohttp tracing and
+    the writes of its body.
+    """
+
+    def __init__(self) -> None:
+        self.phase = POOL
+        self.acquired = asyncio.Event()
+        self.connected = asyncio.Event()
+        self.written = asyncio.Event()
+
+    def on_acquired(self) -> None:
+        self.phase = CONNECT
+        self.acquired.set()
+
+    def on_connected(self) -> None:
+        self.phase = READ if self.written.is_set() else WRITE
+        self.acquired.set()
+        self.connected.set()
+
+    def on_written(self) -> None:
+        self.phase = READ
+        self.written.set()
+
+    async def body(self, content: bytes) -> AsyncIterator[bytes]:
+        """
+        Body of the request, written by aiohttp chunk by chunk: the next chunk
+        is only requested once the previous one was written.
+        """
+        for start in range(0, len(content), WRITE_CHUNK_SIZE):
+            yield content[start : start + WRITE_CHUNK_SIZE]
+        self.on_written()
+
+
+def _trace_config() -> "aiohttp.TraceConfig":
+    """
+    aiohttp TraceConfig updating the _RequestProgress passed as the
+    `trace_request_ctx` of a request.
+    """
+
+    def callback(update: Callable[[_RequestProgress], None]) -> Any:
+        async def on_signal(session: Any, context: Any, params: Any) -> None:
+            progress = context.trace_request_ctx
+            if isinstance(progress, _RequestProgress):
+                update(progress)
+
+        return on_signal
+
+    config = aiohttp.TraceConfig()
+    config.on_connection_create_start.append(callback(_RequestProgress.on_acquired))
+    config.on_connection_create_end.append(callback(_RequestProgress.on_connected))
+    config.on_connection_reuseconn.append(callback(_RequestProgress.on_connected))
+    config.on_request_end.append(callback(_RequestProgress.on_written))
+    return config
+
+
+def _httpx_error(
+    error: Exception, progress: Optional[_RequestProgress] = None
+) -> Type[httpx.TransportError]:
+    """
+    httpx exception matching an aiohttp exception, so that the retry policy
+    and the client see the same errors whatever the backend. Timeouts are
+    told apart by the phase the request was in.
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        if progress is not None:
+            return _TIMEOUT_ERRORS[progress.phase]
+        connection_timeout = getattr(aiohttp, "ConnectionTimeoutError", None)
+        if connection_timeout is not None and isinstance(error, connection_timeout):
+            return httpx.ConnectTimeout
+        return httpx.ReadTimeout
+    if isinstance(error, aiohttp.ClientConnectorError):
+        return httpx.ConnectError
+    if isinstance(
+        error,
+        (aiohttp.ServerDisconnectedError, aiohttp.ClientPayloadError, aiohttp.ClientResponseError),
+    ):
+        return httpx.RemoteProtocolError
+    if isinstance(error, aiohttp.ClientConnectionError):
+        return httpx.ReadError
+    return httpx.TransportError
+
+
+_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError) if aiohttp is not None else ()
+
+
+class _AiohttpResponseStream(httpx.AsyncByteStream):
+    def __init__(self, response: "aiohttp.ClientResponse", request: httpx.Request) -> None:
+        self._response = response
+        self._request = request
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self._response.content.iter_any():
+                yield chunk
+        except _ERRORS as e:
+            raise _httpx_error(e)(str(e), request=self._request) from e
+
+    async def aclose(self) -> None:
+        # Returns the connection to the pool once the body was read, closes it
+        # otherwise
+        self._response.release()
+
+
+class AiohttpTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport sending requests with aiohttp, for use with
+    httpx.AsyncClient. aiohttp has a lower per-request overhead than the
+    default httpx transport, in particular on uvloop. Only HTTP/1.1 is
+    supported. Requires the `aiohttp` package.
+
+    Responses are not decompressed by aiohttp but by httpx, and aiohttp
+    exceptions are raised as the matching httpx exceptions. The pool, connect,
+    write and read timeouts of the requests are honored.
+
+    aiohttp sessions are bound to an event loop: when the transport is used
+    from another loop, the session of the previous one is closed and a new
+    one is opened.
+    """
+
+    def __init__(
+        self,
+        limits: httpx.Limits = httpx.Limits(),
+        uds: Optional[str] = None,
+        dns_ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the AiohttpTransport.
+
+        :param limits: Connection limits. aiohttp has no limit on idle
+            connections, only `max_keepalive_connections=0` is honored, by
+            closing every connection after use.
+        :param uds: Path of a Unix domain socket to connect to instead of the
+            host of the request URLs.
+        :param dns_ttl: Seconds the resolved address of a host is reused by
+            new connections, None to resolve it for every connection.
+        """
+        if aiohttp is None:
+            raise ImportError(
+                "AiohttpTransport requires aiohttp (`pip install javelin_sdk[aiohttp]`)."
+            )
+        self._limits = limits
+        self._uds = uds
+        self._dns_ttl = dns_ttl
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _open_session(self) -> "aiohttp.ClientSession":
+        force_close = self._limits.max_keepalive_connections == 0
+        connector_kwargs = dict(
+            limit=self._limits.max_connections or 0,
+            force_close=force_close,
+            keepalive_timeout=None if force_close else self._limits.keepalive_expiry,
+        )
+        if self._uds:
+            connector = aiohttp.UnixConnector(path=self._uds, **connector_kwargs)
+        else:
+            if self._dns_ttl:
+                connector_kwargs["ttl_dns_cache"] = self._dns_ttl
+            connector = aiohttp.TCPConnector(**connector_kwargs)
+        return aiohttp.ClientSession(
+            connector=connector,
+            auto_decompress=False,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            trace_configs=[_trace_config()],
+        )
+
+    async def _get_session(self) -> "aiohttp.ClientSession":
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            previous, previous_loop = self._session, self._loop
+            self._session, self._loop = self._open_session(), loop
+            if previous is not None and previous_loop is not loop:
+                await self._close_session(previous, previous_loop)
+        return self._session
+
+    @staticmethod
+    async def _close_session(
+        session: "aiohttp.ClientSession", loop: Optional[asyncio.AbstractEventLoop]
+    ) -> None:
+        """
+        Close a session opened in another event loop, and its connections.
+        """
+        if session.closed or loop is None:
+            return
+        if loop.is_running():
+            # The loop runs in another thread
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        elif not loop.is_closed():
+            threading.Thread(
+                target=loop.run_until_complete, args=(session.close(),), daemon=True
+            ).start()
+        else:
+            # The connections can no longer be closed gracefully: drop them
+            connector = session.connector
+            session.detach()
+            if connector is not None:
+                await connector.close()
+
+    @staticmethod
+    def _timeout(request: httpx.Request) -> "aiohttp.ClientTimeout":
+        """
+        aiohttp timeouts of a request. aiohttp has no pool and write timeouts,
+        which are enforced by handle_async_request.
+        """
+        timeout = request.extensions.get("timeout", {})
+        return aiohttp.ClientTimeout(
+            total=None, sock_connect=timeout.get("connect"), sock_read=timeout.get("read")
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        session = await self._get_session()
+        content = await request.aread()
+        progress = _RequestProgress()
+        if not content:
+            progress.written.set()
+        sending = asyncio.ensure_future(
+            session.request(
+                request.method,
+                yarl.URL(str(request.url), encoded=True),
+                headers=request.headers.multi_items(),
+                data=progress.body(content) if content else None,
+                allow_redirects=False,
+                timeout=self._timeout(request),
+                trace_request_ctx=progress,
+            )
+        )
+        try:
+            timeout = request.extensions.get("timeout", {})
+            await self._until(progress.acquired, sending, timeout.get("pool"))
+            await self._until(progress.connected, sending, None)
+            await self._until(progress.written, sending, timeout.get("write"))
+            response = await sending
+        except _ERRORS as e:
+            raise _httpx_error(e, progress)(str(e), request=request) from e
+        finally:
+            if not sending.done():
+                sending.cancel()
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.raw_headers,
+            stream=_AiohttpResponseStream(response, request),
+            extensions={
+                "http_version": f"HTTP/{response.version.major}.{response.version.minor}".encode(),
+                "reason_phrase": (response.reason or "").encode(),
+            },
+        )
+
+    @staticmethod
+    async def _until(
+        event: asyncio.Event, sending: "asyncio.Future[Any]", timeout: Optional[float]
+    ) -> None:
+        """
+        Wait until a request reaches a phase, or completes.
+
+        :raises asyncio.TimeoutError: If neither happens within `timeout`.
+        """
+        if event.is_set() or sending.done():
+            return
+        reached = asyncio.ensure_future(event.wait())
+        try:
+            done, _ = await asyncio.wait(
+                {sending, reached}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            reached.cancel()
+        if not done:
+            raise asyncio.TimeoutError()
+
+    async def aclose(self) -> None:
+        session, loop = self._session, self._loop
+        self._session = self._loop = None
+        if session is None:
+            return
+        if loop is asyncio.get_running_loop():
+            await session.close()
+        else:
+            await self._close_session(session, loop)
@@ -0,0 +1,50 @@
+from typing import Any, Callable, Dict
+
+import httpx
+import pytest
+
+from javelin_sdk import JavelinClient
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture
+def query_body() -> Dict[str, Any]:
+    return {"model": "gpt-3.5-turbo", "messages": [{"role": "user", "content": "hi"}]}
+
+
+@pytest.fixture
+def query_response() -> Dict[str, Any]:
+    return {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 1,
+        "model": "gpt-3.5-turbo",
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": "hi"},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {"completion_tokens": 1, "prompt_tokens": 1, "total_tokens": 2},
+    }
+
+
+@pytest.fixture
+def make_client() -> Callable[..., JavelinClient]:
+    """
+    Factory of clients whose requests, sync and async, are answered by
+    `handler` instead of a gateway.
+    """
+
+    def make(handler: Handler, **kwargs: Any) -> JavelinClient:
+        kwargs.setdefault("javelin_api_key", "key")
+        kwargs.setdefault("base_url", "http://gateway")
+        return JavelinClient(
+            transport=httpx.MockTransport(handler),
+            async_transport=httpx.MockTransport(handler),
+            **kwargs,
+        )
+
+    return make
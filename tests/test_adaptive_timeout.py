@@ -0,0 +1,75 @@
+import json
+import time
+
+import httpx
+
+from javelin_sdk import AdaptiveTimeoutPolicy, JavelinClient
+
+class Body(httpx.SyncByteStream):
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+    def __iter__(self):
+        yield self.content
+
+
+class SlowGateway(httpx.BaseTransport):
+    """
+    Gateway answering `response` after `latency` seconds, timing out requests
+    whose read timeout is shorter.
+    """
+
+    def __init__(self, latency: float, response: dict) -> None:
+        self.latency = latency
+        self.response = response
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        read = request.extensions["timeout"]["read"]
+        if read is not None and read < self.latency:
+            time.sleep(read)
+            raise httpx.ReadTimeout("timed out", request=request)
+        time.sleep(self.latency)
+        body = json.dumps(self.response).encode()
+        return httpx.Response(
+            200, headers={"content-type": "application/json"}, stream=Body(body)
+        )
+
+
+def test_timeout_derived_from_percentile():
+    policy = AdaptiveTimeoutPolicy(min_samples=5, multiplier=2.0, min_timeout=0.1)
+    assert policy.timeout("route") is None
+    for _ in range(5):
+        policy.observe("route", 1.0)
+    assert 2.0 <= policy.timeout("route") <= 2.1
+    assert policy.timeout("other") is None
+
+
+def test_timeout_recovers_when_latency_rises(query_body, query_response):
+    policy = AdaptiveTimeoutPolicy(
+        min_samples=5, window_size=50, multiplier=2.0, min_timeout=0.01, max_timeout=5.0
+    )
+    gateway = SlowGateway(latency=0.01, response=query_response)
+    client = JavelinClient(
+        javelin_api_key="key",
+        base_url="http://gateway",
+        adaptive_timeouts=policy,
+        transport=gateway,
+    )
+
+    for _ in range(10):
+        client.query_route("route", query_body)
+    learned = policy.timeout("route")
+    assert learned < 0.2
+
+    gateway.latency = 0.2
+    timeouts = 0
+    for _ in range(10):
+        try:
+            client.query_route("route", query_body)
+            break
+        except httpx.ReadTimeout:
+            timeouts += 1
+    else:
+        raise AssertionError("the timeout never grew back above the route latency")
+    assert timeouts >= 1
+    assert policy.timeout("route") > learned
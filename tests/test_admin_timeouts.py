@@ -0,0 +1,46 @@
+import asyncio
+
+import httpx
+import pytest
+
+from javelin_sdk import Deadline, DeadlineExceededError
+from javelin_sdk.deadline import DEADLINE_HEADER
+from javelin_sdk.models import Route
+
+
+def gateway(requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.method == "GET" and request.url.path.endswith("/routes"):
+            return httpx.Response(200, json=[{"name": "route", "type": "chat"}])
+        if request.method == "GET":
+            return httpx.Response(200, json={"name": "route", "type": "chat"})
+        return httpx.Response(200, text="OK")
+
+    return handler
+
+
+def test_admin_calls_send_timeout_and_deadline(make_client):
+    requests = []
+    client = make_client(gateway(requests))
+    route = Route(name="route", type="chat")
+
+    client.get_route("route", timeout=3.0, deadline=10.0)
+    client.list_routes(timeout=3.0, deadline=10.0)
+    client.create_route(route, timeout=3.0, deadline=10.0)
+    client.update_route(route, timeout=3.0, deadline=10.0)
+    client.delete_route("route", timeout=3.0, deadline=10.0)
+    asyncio.run(client.aget_route("route", timeout=3.0, deadline=10.0))
+
+    assert [request.method for request in requests] == ["GET", "GET", "POST", "PUT", "DELETE", "GET"]
+    for request in requests:
+        assert request.extensions["timeout"]["read"] == 3.0
+        assert 0 < int(request.headers[DEADLINE_HEADER]) <= 10000
+
+
+def test_admin_call_past_its_deadline_is_not_sent(make_client):
+    requests = []
+    client = make_client(gateway(requests))
+    with pytest.raises(DeadlineExceededError):
+        client.delete_route("route", deadline=Deadline(0))
+    assert requests == []
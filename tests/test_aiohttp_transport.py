@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+web = pytest.importorskip("aiohttp.web")
+
+from javelin_sdk.transport import AiohttpTransport  # noqa: E402
+
+
+async def ok(request):
+    return web.json_response({"ok": True})
+
+
+async def slow(request):
+    await asyncio.sleep(1.0)
+    return web.json_response({"ok": True})
+
+
+async def unread(request):
+    # Never reads the body, so that the client blocks writing it
+    await asyncio.sleep(2.0)
+    return web.json_response({"ok": True})
+
+
+@pytest.fixture(scope="module")
+def server():
+    loop = asyncio.new_event_loop()
+    app = web.Application(client_max_size=1024**3)
+    app.router.add_get("/ok", ok)
+    app.router.add_get("/slow", slow)
+    app.router.add_post("/unread", unread)
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    port = site._server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{port}"
+    asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def request(transport, method, url, timeout, close=True, **kwargs):
+    async def send():
+        client = httpx.AsyncClient(transport=transport, timeout=timeout)
+        try:
+            return (await client.request(method, url, **kwargs)).json()
+        finally:
+            if close:
+                await client.aclose()
+
+    return asyncio.run(send())
+
+
+def test_session_of_previous_loop_is_closed(server):
+    transport = AiohttpTransport()
+    assert request(transport, "GET", f"{server}/ok", 5.0, close=False) == {"ok": True}
+    first = transport._session
+    assert request(transport, "GET", f"{server}/ok", 5.0, close=False) == {"ok": True}
+    second = transport._session
+    assert first.closed
+    assert second is not first and not second.closed
+    asyncio.run(transport.aclose())
+
+
+def test_read_timeout(server):
+    with pytest.raises(httpx.ReadTimeout):
+        request(AiohttpTransport(), "GET", f"{server}/slow", httpx.Timeout(5.0, read=0.1))
+
+
+def test_write_timeout(server):
+    body = b"x" * (32 * 1024 * 1024)
+    with pytest.raises(httpx.WriteTimeout):
+        request(
+            AiohttpTransport(),
+            "POST",
+            f"{server}/unread",
+            httpx.Timeout(5.0, write=0.2),
+            content=body,
+        )
+
+
+def test_pool_timeout(server):
+    transport = AiohttpTransport(limits=httpx.Limits(max_connections=1))
+
+    async def main():
+        async with httpx.AsyncClient(transport=transport) as client:
+            busy = asyncio.ensure_future(client.get(f"{server}/slow"))
+            await asyncio.sleep(0.1)
+            with pytest.raises(httpx.PoolTimeout):
+                await client.get(f"{server}/ok", timeout=httpx.Timeout(5.0, pool=0.1))
+            await busy
+
+    asyncio.run(main())
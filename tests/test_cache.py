@@ -0,0 +1,90 @@
+import sqlite3
+
+import httpx
+import pytest
+
+from javelin_sdk import MemoryCache, ResponseCache, SQLiteCache
+
+PAYLOAD = {"id": "chatcmpl-1", "choices": []}
+
+
+def accessed_at(path: str, key: str) -> float:
+    with sqlite3.connect(path) as conn:
+        (value,) = conn.execute(
+            "SELECT accessed_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+    return value
+
+
+def test_hits_only_write_stale_access_times(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.db")
+    clock = [1000.0]
+    monkeypatch.setattr("javelin_sdk.cache.time.time", lambda: clock[0])
+    cache = SQLiteCache(path, touch_interval=60.0)
+    cache.set("key", "route", PAYLOAD)
+
+    clock[0] += 30
+    assert cache.get("key") == PAYLOAD
+    assert accessed_at(path, "key") == 1000.0
+
+    clock[0] += 60
+    assert cache.get("key") == PAYLOAD
+    assert accessed_at(path, "key") == 1090.0
+    assert cache.stats.hits == 2
+
+
+def test_expired_entry_is_a_miss(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("javelin_sdk.cache.time.time", lambda: clock[0])
+    cache = SQLiteCache(str(tmp_path / "cache.db"), ttl=10.0)
+    cache.set("key", "route", PAYLOAD)
+    clock[0] += 11
+    assert cache.get("key") is None
+    assert cache.stats.expirations == 1
+
+
+def test_response_cache_is_abstract():
+    class Incomplete(ResponseCache):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def tenant_gateway(query_response):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.headers["x-api-key"])
+        return httpx.Response(200, json=query_response)
+
+    return handler, requests
+
+
+def test_clients_with_different_credentials_do_not_share_entries(
+    make_client, query_body, query_response
+):
+    cache = MemoryCache()
+    handler, requests = tenant_gateway(query_response)
+    tenant_a = make_client(handler, javelin_api_key="key-a", response_cache=cache)
+    tenant_b = make_client(handler, javelin_api_key="key-b", response_cache=cache)
+
+    for client in (tenant_a, tenant_b, tenant_a, tenant_b):
+        client.query_route("route", query_body, cache=True)
+    assert requests == ["key-a", "key-b"]
+
+
+def test_sqlite_rows_are_keyed_by_credentials(tmp_path, make_client, query_body, query_response):
+    path = str(tmp_path / "cache.db")
+    handler, requests = tenant_gateway(query_response)
+    tenant_a = make_client(handler, javelin_api_key="key-a", response_cache=SQLiteCache(path))
+    tenant_b = make_client(
+        handler, javelin_api_key="key-a", llm_api_key="sk-b", response_cache=SQLiteCache(path)
+    )
+
+    for client in (tenant_a, tenant_b, tenant_a, tenant_b):
+        client.query_route("route", query_body, cache=True)
+    assert len(requests) == 2
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM responses").fetchone() == (2,)
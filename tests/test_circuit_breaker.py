@@ -0,0 +1,91 @@
+import asyncio
+
+import httpx
+import pytest
+
+from javelin_sdk import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    CircuitState,
+    ConcurrencyLimiterRegistry,
+    DeadlineExceededError,
+)
+from javelin_sdk.circuit_breaker import is_breaker_failure
+from javelin_sdk.exceptions import BadRequest, RateLimitExceededError
+
+
+def test_breaker_failures():
+    assert is_breaker_failure(DeadlineExceededError())
+    assert not is_breaker_failure(BadRequest())
+    assert not is_breaker_failure(RateLimitExceededError())
+
+
+def test_circuit_opens_on_deadline_exceeded():
+    breaker = CircuitBreaker("route", minimum_calls=2, window_size=2)
+    for _ in range(2):
+        with pytest.raises(DeadlineExceededError):
+            with breaker.guard():
+                raise DeadlineExceededError()
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError):
+        with breaker.guard():
+            pass
+
+
+CHUNK = (
+    b'data: {"id": "chatcmpl-1", "object": "chat.completion.chunk", "created": 1, '
+    b'"model": "gpt-3.5-turbo", "choices": [{"index": 0, "delta": {"content": "Hi"}}]}\n\n'
+)
+
+
+def test_stream_outcome_is_recorded_when_the_stream_ends(make_client, query_body):
+    def body():
+        yield CHUNK
+        raise httpx.ReadTimeout("upstream stalled")
+
+    async def abody():
+        yield CHUNK
+        raise httpx.ReadTimeout("upstream stalled")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        content = body() if isinstance(request.stream, httpx.SyncByteStream) else abody()
+        return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, content=content)
+
+    breakers = CircuitBreakerRegistry(minimum_calls=1, window_size=1)
+    limiters = ConcurrencyLimiterRegistry(initial_limit=8)
+    client = make_client(handler, circuit_breakers=breakers, concurrency_limiters=limiters)
+    limiter = limiters.get("route")
+
+    stream = client.query_route("route", query_body, stream=True)
+    assert breakers.get("route").state is CircuitState.CLOSED
+    assert limiter.metrics().in_flight == 1
+    with pytest.raises(httpx.ReadTimeout):
+        list(stream)
+    assert breakers.get("route").state is CircuitState.OPEN
+    assert limiter.metrics().in_flight == 0
+    assert limiter.metrics().limit == 4
+
+    async def astream():
+        with pytest.raises(CircuitOpenError):
+            await client.aquery_route("route", query_body, stream=True)
+        assert limiter.metrics().in_flight == 0
+
+    asyncio.run(astream())
+
+
+def test_async_stream_holds_its_slot_until_closed(make_client, query_body):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, content=CHUNK)
+
+    limiters = ConcurrencyLimiterRegistry(initial_limit=8)
+    client = make_client(handler, concurrency_limiters=limiters)
+    limiter = limiters.get("route")
+
+    async def main():
+        stream = await client.aquery_route("route", query_body, stream=True)
+        assert limiter.metrics().in_flight == 1
+        await stream.aclose()
+        assert limiter.metrics().in_flight == 0
+
+    asyncio.run(main())
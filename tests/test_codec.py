@@ -0,0 +1,20 @@
+import pytest
+
+from javelin_sdk import JSONCodec, StdlibJSONCodec
+from javelin_sdk.codec import get_codec
+
+
+def test_codec_round_trip():
+    codec = get_codec("json")
+    assert isinstance(codec, StdlibJSONCodec)
+    assert codec.dumps({"a": "é"}) == '{"a":"é"}'.encode()
+    assert codec.loads(b'{"a": 1}') == {"a": 1}
+
+
+def test_json_codec_is_abstract():
+    class Incomplete(JSONCodec):
+        def dumps(self, obj):
+            return b"null"
+
+    with pytest.raises(TypeError):
+        Incomplete()
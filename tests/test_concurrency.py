@@ -0,0 +1,44 @@
+import httpx
+
+from javelin_sdk import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimiterRegistry,
+    DeadlineExceededError,
+    RetryPolicy,
+)
+from javelin_sdk.concurrency import is_overload
+
+def test_deadline_exceeded_is_overload():
+    assert is_overload(DeadlineExceededError())
+    assert not is_overload(ValueError())
+
+
+def test_failed_call_cuts_limit():
+    limiter = AdaptiveConcurrencyLimiter("route", initial_limit=8)
+    try:
+        with limiter.guard():
+            raise DeadlineExceededError()
+    except DeadlineExceededError:
+        pass
+    assert limiter.metrics().limit == 4
+
+
+def test_retried_429_cuts_limit(make_client, query_body, query_response):
+    statuses = [429, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses.pop(0)
+        if status == 429:
+            return httpx.Response(429, headers={"Retry-After": "0"}, json={"error": "slow down"})
+        return httpx.Response(200, json=query_response)
+
+    limiters = ConcurrencyLimiterRegistry(initial_limit=8)
+    client = make_client(
+        handler, retry_policy=RetryPolicy(backoff_base=0.0), concurrency_limiters=limiters
+    )
+
+    client.query_route("route", query_body)
+    assert statuses == []
+    metrics = limiters.metrics()["route"]
+    assert metrics.limit == 4
+    assert metrics.drops == 1
@@ -0,0 +1,127 @@
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpcore
+import httpx
+import pytest
+
+from javelin_sdk.dns import AsyncDNSCachingBackend, DNSCache, DNSCachingBackend, use_dns_cache
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    """
+    Resolve the hosts of the returned dict to their addresses, and record
+    their lookups.
+    """
+    hosts = {}
+    lookups = []
+    system_getaddrinfo = socket.getaddrinfo
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        if host not in hosts:
+            return system_getaddrinfo(host, port, *args, **kwargs)
+        lookups.append(host)
+        return [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))
+            for address in hosts[host]
+        ]
+
+    async def agetaddrinfo(self, host, port, *args, **kwargs):
+        return getaddrinfo(host, port)
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    monkeypatch.setattr(asyncio.BaseEventLoop, "getaddrinfo", agetaddrinfo)
+    return hosts, lookups
+
+
+class Backend(httpcore.NetworkBackend):
+    def __init__(self, reachable):
+        self.reachable = reachable
+        self.attempts = []
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.attempts.append(host)
+        if host not in self.reachable:
+            raise httpcore.ConnectError(f"{host} unreachable")
+        return object()
+
+
+class AsyncBackend(httpcore.AsyncNetworkBackend):
+    def __init__(self, reachable):
+        self.backend = Backend(reachable)
+
+    async def connect_tcp(self, *args, **kwargs):
+        return self.backend.connect_tcp(*args, **kwargs)
+
+
+def test_falls_back_to_the_next_address(resolver):
+    hosts, lookups = resolver
+    hosts["gateway"] = ["10.0.0.1", "10.0.0.2"]
+    backend = Backend(reachable={"10.0.0.2"})
+    dns = DNSCachingBackend(backend, DNSCache(ttl=60))
+
+    dns.connect_tcp("gateway", 443)
+    dns.connect_tcp("gateway", 443)
+    assert backend.attempts == ["10.0.0.1", "10.0.0.2", "10.0.0.1", "10.0.0.2"]
+    assert lookups == ["gateway"]
+
+    abackend = AsyncBackend(reachable={"10.0.0.2"})
+    asyncio.run(AsyncDNSCachingBackend(abackend, DNSCache(ttl=60)).connect_tcp("gateway", 443))
+    assert abackend.backend.attempts == ["10.0.0.1", "10.0.0.2"]
+
+
+def test_unreachable_host_is_resolved_again(resolver):
+    hosts, lookups = resolver
+    hosts["gateway"] = ["10.0.0.1"]
+    dns = DNSCachingBackend(Backend(reachable=set()), DNSCache(ttl=60))
+    for _ in range(2):
+        with pytest.raises(httpcore.ConnectError):
+            dns.connect_tcp("gateway", 443)
+    assert lookups == ["gateway", "gateway"]
+
+
+class EchoHost(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = self.headers["Host"].encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), EchoHost)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_connections_are_pooled_per_host(resolver, server):
+    hosts, lookups = resolver
+    hosts["a.example"] = hosts["b.example"] = ["127.0.0.1"]
+    transport = httpx.HTTPTransport()
+    use_dns_cache(transport, DNSCache(ttl=60))
+
+    with httpx.Client(transport=transport) as client:
+        for host in ("a.example", "b.example", "a.example"):
+            response = client.get(f"http://{host}:{server}/")
+            assert response.text == f"{host}:{server}"
+            assert response.request.url.host == host
+        origins = [
+            host
+            for host in ("a.example", "b.example")
+            for connection in transport._pool.connections
+            if connection.can_handle_request(httpcore.Origin(b"http", host.encode(), server))
+        ]
+    assert sorted(origins) == ["a.example", "b.example"]
@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+
+from javelin_sdk import HedgingPolicy
+
+IDEMPOTENT = {"Idempotency-Key": "query-1"}
+
+
+def slow_first_gateway(query_response, latency: float = 5.0):
+    """
+    Gateway answering the first request after `latency` seconds and the
+    others at once, recording whether the first one was cancelled.
+    """
+    state = {"requests": 0, "cancelled": False}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"] += 1
+        if state["requests"] == 1:
+            try:
+                await asyncio.sleep(latency)
+            except asyncio.CancelledError:
+                state["cancelled"] = True
+                raise
+        return httpx.Response(200, json=query_response)
+
+    return handler, state
+
+
+def test_losing_request_is_cancelled(make_client, query_body, query_response):
+    handler, state = slow_first_gateway(query_response)
+    policy = HedgingPolicy(delay=0.01, max_extra_load=1.0)
+    client = make_client(handler, hedging_policy=policy)
+
+    result = asyncio.run(
+        asyncio.wait_for(client.aquery_route("route", query_body, headers=IDEMPOTENT), 2.0)
+    )
+    assert result.id == query_response["id"]
+    assert state == {"requests": 2, "cancelled": True}
+    assert (policy.stats.hedges_sent, policy.stats.hedge_wins) == (1, 1)
+
+
+def test_query_without_idempotency_key_is_not_hedged(make_client, query_body, query_response):
+    handler, state = slow_first_gateway(query_response, latency=0.05)
+    policy = HedgingPolicy(delay=0.01, max_extra_load=1.0)
+    client = make_client(handler, hedging_policy=policy)
+
+    asyncio.run(client.aquery_route("route", query_body))
+    assert state == {"requests": 1, "cancelled": False}
+    assert policy.stats.calls == 0
@@ -0,0 +1,59 @@
+import asyncio
+
+import httpx
+import pytest
+
+from javelin_sdk import Manifest
+from javelin_sdk.exceptions import InternalServerError, UnauthorizedError
+
+MANIFEST = Manifest(routes=[{"name": "existing", "type": "chat"}, {"name": "new", "type": "chat"}])
+
+
+def gateway(status: int, **list_response):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.method)
+        if request.method == "GET":
+            return httpx.Response(status, **list_response)
+        return httpx.Response(200, json={})
+
+    return handler, requests
+
+
+def test_sync_creates_missing_resources(make_client):
+    handler, requests = gateway(200, json=[{"name": "existing", "type": "chat"}])
+    result = make_client(handler).apply_manifest(MANIFEST)
+    assert [change.name for change in result.created] == ["new"]
+    assert [change.name for change in result.unchanged] == ["existing"]
+    assert requests == ["GET", "POST"]
+
+
+@pytest.mark.parametrize(
+    "status, list_response, error",
+    [
+        (401, {"json": {"error": "unauthorized"}}, UnauthorizedError),
+        (503, {"json": {"error": "unavailable"}}, InternalServerError),
+        (200, {"text": "<html>maintenance</html>"}, InternalServerError),
+    ],
+)
+def test_sync_aborts_when_current_state_cannot_be_listed(
+    make_client, status, list_response, error
+):
+    handler, requests = gateway(status, **list_response)
+    client = make_client(handler)
+    with pytest.raises(error):
+        client.apply_manifest(MANIFEST)
+    with pytest.raises(error):
+        asyncio.run(client.aapply_manifest(MANIFEST))
+    assert set(requests) == {"GET"}
+
+
+def test_masked_secret_values_are_not_diffed(make_client):
+    secret = {"api_key": "openai_key", "provider_name": "openai", "api_key_secret_name": "key"}
+    listed = {**secret, "api_key_secret_key": "sk-***", "api_key_secret_key_javelin": "***"}
+    handler, requests = gateway(200, json=[listed])
+    manifest = Manifest(secrets=[{**secret, "api_key_secret_key": "sk-real"}])
+    result = make_client(handler).apply_manifest(manifest)
+    assert [change.name for change in result.unchanged] == ["openai/openai_key"]
+    assert requests == ["GET"]
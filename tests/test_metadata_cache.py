@@ -0,0 +1,111 @@
+import threading
+import time
+
+import httpx
+import pytest
+
+from javelin_sdk import MetadataCache
+from javelin_sdk.exceptions import RouteNotFoundError
+
+
+class RouteGateway:
+    """
+    Gateway serving one route, tagged with its version as ETag.
+    """
+
+    def __init__(self) -> None:
+        self.version = 1
+        self.status = 200
+        self.requests = []
+        self.on_request = None
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.on_request is not None:
+            self.on_request()
+        if self.status != 200:
+            return httpx.Response(self.status, json={"error": "failed"})
+        etag = f'"v{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        route = {"name": "route", "type": "chat", "config": {"owner": f"v{self.version}"}}
+        return httpx.Response(200, headers={"ETag": etag}, json=route)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("javelin_sdk.metadata_cache.time.monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def gateway():
+    return RouteGateway()
+
+
+@pytest.fixture
+def cache():
+    return MetadataCache(ttl=10.0, stale_ttl=100.0, negative_ttl=5.0)
+
+
+@pytest.fixture
+def client(make_client, gateway, cache):
+    return make_client(gateway, metadata_cache=cache)
+
+
+def wait_for(condition, timeout: float = 2.0) -> None:
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out"
+        time.sleep(0.001)
+
+
+def test_stale_entry_is_served_while_revalidated(client, gateway, cache, clock):
+    assert client.get_route("route").config.owner == "v1"
+    gateway.version = 2
+    clock[0] += 20
+    threads = threading.active_count()
+
+    assert client.get_route("route").config.owner == "v1"
+    assert cache.stats.stale_hits == 1
+    # The revalidation runs in a background thread
+    wait_for(lambda: threading.active_count() == threads)
+    assert len(gateway.requests) == 2
+    assert gateway.requests[1].headers["If-None-Match"] == '"v1"'
+    assert client.get_route("route").config.owner == "v2"
+
+
+def test_not_modified_reuses_the_cached_model(client, gateway, cache, clock):
+    route = client.get_route("route")
+    clock[0] += 200
+
+    assert client.get_route("route") is route
+    assert gateway.requests[1].headers["If-None-Match"] == '"v1"'
+    assert cache.stats.not_modified == 1
+    clock[0] += 5
+    assert client.get_route("route") is route
+    assert len(gateway.requests) == 2
+
+
+def test_not_found_is_cached_for_negative_ttl(client, gateway, clock):
+    gateway.status = 404
+    for _ in range(2):
+        with pytest.raises(RouteNotFoundError):
+            client.get_route("route")
+    assert len(gateway.requests) == 1
+
+    clock[0] += 6
+    gateway.status = 200
+    assert client.get_route("route").config.owner == "v1"
+    assert len(gateway.requests) == 2
+
+
+def test_response_requested_before_invalidation_is_not_stored(client, gateway, cache):
+    gateway.on_request = lambda: cache.invalidate("route", "route")
+    assert client.get_route("route").config.owner == "v1"
+    gateway.on_request = None
+
+    gateway.version = 2
+    assert client.get_route("route").config.owner == "v2"
+    assert len(gateway.requests) == 2
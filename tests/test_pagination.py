@@ -0,0 +1,64 @@
+import asyncio
+
+import httpx
+import pytest
+
+from javelin_sdk.exceptions import (
+    InternalServerError,
+    RouteNotFoundError,
+    UnauthorizedError,
+)
+
+ROUTES = [{"name": f"route-{i}", "type": "chat"} for i in range(5)]
+NAMES = [route["name"] for route in ROUTES]
+
+
+def gateway(ignore_limit: bool = False):
+    def handler(request: httpx.Request) -> httpx.Response:
+        limit = int(request.url.params.get("limit", len(ROUTES)))
+        offset = int(request.url.params.get("offset", 0))
+        end = len(ROUTES) if ignore_limit else offset + limit
+        return httpx.Response(200, json=ROUTES[offset:end])
+
+    return handler
+
+
+def names(routes):
+    return [route.name for route in routes]
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_pages_follow_offset(make_client):
+    client = make_client(gateway())
+    assert names(client.iter_routes(page_size=2)) == NAMES
+    assert names(asyncio.run(collect(client.aiter_routes(page_size=2)))) == NAMES
+
+
+def test_pages_stop_when_gateway_ignores_limit(make_client):
+    client = make_client(gateway(ignore_limit=True))
+    assert names(client.iter_routes(page_size=1)) == NAMES
+    assert names(asyncio.run(collect(client.aiter_routes(page_size=1)))) == NAMES
+
+
+@pytest.mark.parametrize(
+    "status, error",
+    [(401, UnauthorizedError), (404, RouteNotFoundError), (503, InternalServerError)],
+)
+def test_unsuccessful_page_raises(make_client, status, error):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.params.get("offset") == "2":
+            return httpx.Response(status, json={"error": "failed"})
+        return gateway()(request)
+
+    client = make_client(handler)
+    routes = client.iter_routes(page_size=2)
+    assert names([next(routes), next(routes)]) == NAMES[:2]
+    with pytest.raises(error) as excinfo:
+        next(routes)
+    assert excinfo.value.response_data["response_text"] == '{"error": "failed"}'
+
+    with pytest.raises(error):
+        asyncio.run(collect(client.aiter_routes(page_size=2)))
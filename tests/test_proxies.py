@@ -0,0 +1,54 @@
+import asyncio
+
+import httpcore
+import httpx
+
+from javelin_sdk import JavelinClient
+
+BASE_URL = "https://gateway.example.com"
+
+
+def transport_for(client: httpx.Client, url: str):
+    return client._transport_for_url(httpx.URL(url))
+
+
+def test_environment_proxy_is_used(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example.com:3128")
+    monkeypatch.delenv("NO_PROXY", raising=False)
+    client = JavelinClient(javelin_api_key="key", base_url=BASE_URL)
+
+    transport = transport_for(client.client, BASE_URL)
+    assert transport is not client.client._transport
+    assert isinstance(transport._pool, httpcore.HTTPProxy)
+    assert transport._pool._proxy_url.host == b"proxy.example.com"
+
+    async def atransport():
+        return transport_for(client.aclient, BASE_URL)
+
+    assert isinstance(asyncio.run(atransport())._pool, httpcore.AsyncHTTPProxy)
+
+
+def test_no_proxy_keeps_pooled_transport(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example.com:3128")
+    monkeypatch.setenv("NO_PROXY", "gateway.example.com")
+    client = JavelinClient(javelin_api_key="key", base_url=BASE_URL)
+    assert transport_for(client.client, BASE_URL) is client.client._transport
+
+
+def test_explicit_proxies_override_environment(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example.com:3128")
+    client = JavelinClient(javelin_api_key="key", base_url=BASE_URL, proxies={})
+    assert transport_for(client.client, BASE_URL) is client.client._transport
+
+
+def test_lowercase_environment_variables(monkeypatch):
+    for name in ("HTTPS_PROXY", "NO_PROXY", "ALL_PROXY", "all_proxy"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("https_proxy", "proxy.example.com:3128")
+    monkeypatch.setenv("no_proxy", "10.0.0.1,::1")
+    client = JavelinClient(javelin_api_key="key", base_url=BASE_URL)
+
+    transport = transport_for(client.client, BASE_URL)
+    assert transport._pool._proxy_url.host == b"proxy.example.com"
+    assert transport_for(client.client, "https://10.0.0.1") is client.client._transport
+    assert transport_for(client.client, "https://[::1]") is client.client._transport
@@ -0,0 +1,69 @@
+import httpx
+import pytest
+
+from javelin_sdk import RateLimiter
+from javelin_sdk.models import Route, RouteConfig
+from javelin_sdk.ratelimit import parse_rate_limit_period
+
+@pytest.mark.parametrize(
+    "headers, period",
+    [
+        ({"RateLimit-Policy": "100;w=60"}, 60.0),
+        ({"RateLimit-Policy": '"default";q=100;w=3600'}, 3600.0),
+        ({"X-RateLimit-Policy": "10, 100;w=1"}, 1.0),
+        ({"RateLimit-Policy": "100;w=soon"}, None),
+        ({}, None),
+    ],
+)
+def test_parse_rate_limit_period(headers, period):
+    assert parse_rate_limit_period(httpx.Headers(headers)) == period
+
+
+def test_rate_limiter_requires_period():
+    with pytest.raises(TypeError):
+        RateLimiter(100)
+    with pytest.raises(ValueError):
+        RateLimiter(100, period=0)
+
+
+@pytest.fixture
+def make_limited_client(make_client, query_response):
+    def make(response_headers=None, **kwargs):
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(200, headers=response_headers or {}, json=query_response)
+
+        return make_client(handler, rate_limit_routes=True, **kwargs)
+
+    return make
+
+
+def test_route_without_period_is_not_paced(make_limited_client):
+    client = make_limited_client()
+    client._seed_rate_limiter(Route(name="route", config=RouteConfig(rate_limit=100)))
+    assert "route" not in client._rate_limiters
+
+
+def test_period_from_client(make_limited_client):
+    client = make_limited_client(rate_limit_period=60.0)
+    route = Route(name="route", config=RouteConfig(rate_limit=100))
+    client._seed_rate_limiter(route)
+    assert client._rate_limiters["route"].period == 60.0
+    assert "rate_limit_period" not in route.dict()["config"]
+
+
+def test_period_from_response_headers(make_limited_client, query_body):
+    client = make_limited_client({"RateLimit-Policy": "100;w=10"})
+    client._seed_rate_limiter(Route(name="route", config=RouteConfig(rate_limit=100)))
+    assert "route" not in client._rate_limiters
+
+    client.query_route("route", query_body)
+    limiter = client._rate_limiters["route"]
+    assert (limiter.rate, limiter.period) == (100, 10.0)
+
+
+def test_explicit_rate_limit_requires_period(make_limited_client):
+    client = make_limited_client()
+    with pytest.raises(ValueError):
+        client.set_rate_limit("route", 100)
+    client.set_rate_limit("route", 100, period=60)
+    assert client._rate_limiters["route"].period == 60
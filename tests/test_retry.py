@@ -0,0 +1,88 @@
+import httpx
+import pytest
+
+from javelin_sdk import RetryBudget, RetryPolicy
+from javelin_sdk.exceptions import InternalServerError, RateLimitExceededError
+
+
+def scripted_gateway(statuses, query_response, headers=None):
+    """
+    Gateway answering with `statuses` in turn, then with a query response.
+    """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if statuses:
+            return httpx.Response(statuses.pop(0), headers=headers, json={"error": "failed"})
+        return httpx.Response(200, json=query_response)
+
+    return handler, requests
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr("javelin_sdk.client.time.sleep", slept.append)
+    return slept
+
+
+def test_429_waits_for_retry_after(make_client, query_body, query_response, sleeps):
+    handler, requests = scripted_gateway([429, 429], query_response, {"Retry-After": "2"})
+    client = make_client(handler, retry_policy=RetryPolicy(backoff_base=0.0))
+
+    client.query_route("route", query_body)
+    assert len(requests) == 3
+    assert sleeps == [2.0, 2.0]
+
+
+def test_429_past_max_retry_after_is_not_retried(make_client, query_body, query_response, sleeps):
+    handler, requests = scripted_gateway([429], query_response, {"Retry-After": "120"})
+    client = make_client(handler, retry_policy=RetryPolicy(max_retry_after=60.0))
+
+    with pytest.raises(RateLimitExceededError):
+        client.query_route("route", query_body)
+    assert len(requests) == 1
+    assert sleeps == []
+
+
+def test_post_without_idempotency_key_is_not_retried(
+    make_client, query_body, query_response, sleeps
+):
+    handler, requests = scripted_gateway([503], query_response)
+    client = make_client(handler, retry_policy=RetryPolicy(backoff_base=0.0))
+
+    with pytest.raises(InternalServerError):
+        client.query_route("route", query_body)
+    assert len(requests) == 1
+
+    handler, requests = scripted_gateway([503], query_response)
+    client = make_client(handler, retry_policy=RetryPolicy(backoff_base=0.0))
+    client.query_route("route", query_body, headers={"Idempotency-Key": "query-1"})
+    assert len(requests) == 2
+
+
+def test_exhausted_budget_stops_retries(make_client, query_response, sleeps):
+    budget = RetryBudget(ratio=0.0, min_retries_per_second=0.0, max_tokens=1.0)
+    handler, requests = scripted_gateway([503] * 10, query_response)
+    client = make_client(handler, retry_policy=RetryPolicy(backoff_base=0.1, budget=budget))
+
+    with pytest.raises(InternalServerError) as first:
+        client.get_route("route")
+    assert len(requests) == 2
+    with pytest.raises(InternalServerError) as second:
+        client.get_route("route")
+    assert len(requests) == 3
+    assert (first.value.retry_count, second.value.retry_count) == (1, 0)
+
+
+def test_errors_record_retries(make_client, query_response, sleeps):
+    handler, requests = scripted_gateway([503] * 10, query_response)
+    client = make_client(handler, retry_policy=RetryPolicy(max_retries=2, backoff_base=0.1))
+
+    with pytest.raises(InternalServerError) as excinfo:
+        client.get_route("route")
+    assert len(requests) == 3
+    assert excinfo.value.retry_count == 2
+    assert excinfo.value.retry_sleep == pytest.approx(sum(sleeps))
+    assert 0 <= excinfo.value.retry_sleep <= 0.1 + 0.2
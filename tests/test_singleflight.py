@@ -0,0 +1,103 @@
+import asyncio
+import threading
+
+import pytest
+
+from javelin_sdk import Deadline, DeadlineExceededError
+from javelin_sdk.exceptions import BadRequest
+from javelin_sdk.singleflight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    credentials_scope,
+    query_key,
+)
+
+BODY = {"messages": [{"role": "user", "content": "hi"}]}
+
+
+def test_key_depends_on_credentials():
+    tenant_a = credentials_scope({"x-api-key": "key-a", "Accept": "*/*"})
+    tenant_b = credentials_scope({"x-api-key": "key-b", "Accept": "*/*"})
+    assert tenant_a == credentials_scope({"X-API-Key": "key-a"})
+    assert query_key("route", BODY, scope=tenant_a) != query_key("route", BODY, scope=tenant_b)
+
+
+def start_calls(flight: SingleFlight, fn, count: int, deadline=None):
+    errors = []
+
+    def call() -> None:
+        try:
+            flight.do("key", fn, deadline)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, errors
+
+
+def test_followers_raise_their_own_exception():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fail():
+        started.set()
+        release.wait()
+        raise BadRequest(response=None, message="bad")
+
+    leader, leader_errors = start_calls(flight, fail, 1)
+    started.wait()
+    followers, errors = start_calls(flight, fail, 2)
+    release.set()
+    for thread in leader + followers:
+        thread.join()
+
+    errors += leader_errors
+    assert len(errors) == 3
+    assert all(isinstance(e, BadRequest) and e.message == "bad" for e in errors)
+    assert len({id(e) for e in errors}) == 3
+
+
+def test_follower_stops_waiting_at_its_deadline():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait()
+        return "done"
+
+    leader, leader_errors = start_calls(flight, slow, 1)
+    started.wait()
+    with pytest.raises(DeadlineExceededError):
+        flight.do("key", slow, Deadline(0.01))
+    release.set()
+    leader[0].join()
+    assert leader_errors == []
+
+
+def test_async_followers_raise_their_own_exception():
+    async def main():
+        flight = AsyncSingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise BadRequest(response=None, message="bad")
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        errors = await asyncio.gather(
+            *(flight.do("key", fail) for _ in range(3)), return_exceptions=True
+        )
+        assert all(isinstance(e, BadRequest) for e in errors)
+        assert len({id(e) for e in errors}) == 3
+
+        shared = asyncio.ensure_future(flight.do("slow", slow))
+        with pytest.raises(DeadlineExceededError):
+            await flight.do("slow", slow, Deadline(0.001))
+        assert await shared == "done"
+
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+import pytest
+from pydantic import ValidationError
+
+from javelin_sdk.models import QueryChunk, QueryResponse, StreamedQueryResponse
+from javelin_sdk.streaming import ChunkAggregator
+
+
+def chunk(content=None, finish_reason=None, usage=None) -> QueryChunk:
+    return QueryChunk(
+        id="chatcmpl-1",
+        object="chat.completion.chunk",
+        created=1,
+        model="gpt-3.5-turbo",
+        choices=[
+            {"index": 0, "delta": {"content": content}, "finish_reason": finish_reason}
+        ],
+        usage=usage,
+    )
+
+
+def test_aggregated_usage_is_reported_by_the_stream():
+    aggregator = ChunkAggregator()
+    aggregator.add(chunk("Hello"))
+    aggregator.add(chunk(" world", finish_reason="stop"))
+    aggregator.add(chunk(usage={"completion_tokens": 2, "prompt_tokens": 9, "total_tokens": 11}))
+
+    response = aggregator.result()
+    assert response.object == "chat.completion"
+    assert response.choices[0].message.content == "Hello world"
+    assert response.usage.prompt_tokens == 9
+    assert response.usage.total_tokens == 11
+
+
+def test_aggregated_usage_is_none_without_usage_on_the_stream():
+    aggregator = ChunkAggregator()
+    aggregator.add(chunk("Hello"))
+    aggregator.add(chunk(" world", finish_reason="stop"))
+
+    response = aggregator.result()
+    assert response.choices[0].message.content == "Hello world"
+    assert response.usage is None
+
+
+def test_usage_is_only_optional_on_streamed_responses():
+    response = ChunkAggregator().result()
+    assert isinstance(response, StreamedQueryResponse)
+    assert isinstance(response, QueryResponse)
+    with pytest.raises(ValidationError):
+        QueryResponse(**response.dict(exclude={"usage"}))